@@ -0,0 +1,120 @@
+"""Apply the provider's view of a payment to the local Payment and its Order."""
+
+import logging
+from dataclasses import dataclass
+
+from app.contexts.store.orders.domain.order_repository import OrderRepository
+from app.contexts.store.orders.domain.payment import Payment, PaymentStatus
+from app.contexts.store.orders.domain.payment_gateway import PaymentGateway, ProviderPayment
+from app.contexts.store.orders.domain.payment_review import PaymentReview
+from app.contexts.store.orders.domain.state_machine import (
+    ORDER_STATE_MACHINE,
+    PAYMENT_STATE_MACHINE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Mercado Pago payment statuses and the local status each one settles on.
+PROVIDER_PAYMENT_STATUS: dict[str, PaymentStatus] = {
+    "pending": "pending",
+    "authorized": "pending",
+    "in_process": "pending",
+    "in_mediation": "pending",
+    "approved": "approved",
+    "rejected": "rejected",
+    "cancelled": "cancelled",
+    "refunded": "refunded",
+    "charged_back": "refunded",
+}
+
+
+class PaymentVerificationError(Exception):
+    """Raised when a provider payment does not match the local payment it refers to."""
+
+
+def verified_status(payment: Payment, provider_payment: ProviderPayment) -> PaymentStatus:
+    """Local status `provider_payment` settles `payment` on, once amount and currency match."""
+
+    status = PROVIDER_PAYMENT_STATUS.get(provider_payment.status)
+    if status is None:
+        raise PaymentVerificationError(f"unknown provider status {provider_payment.status!r}")
+    if (
+        payment.amount_cents != provider_payment.amount_cents
+        or payment.currency != provider_payment.currency.upper()
+    ):
+        raise PaymentVerificationError(
+            f"provider payment {provider_payment.provider_payment_id} amount does not match"
+        )
+    return status
+
+
+@dataclass(frozen=True, slots=True)
+class AppliedProviderPayment:
+    payment: Payment
+    changed: bool
+    needs_review: bool = False
+
+
+class ApplyProviderPaymentUseCase:
+    """Application service that verifies a provider payment and moves local statuses.
+
+    Only the provider API is trusted: the payment is matched by its
+    `external_reference` (the order number) and must carry the expected amount
+    and currency. Transitions outside the business rules are ignored, so
+    replays and out-of-order notifications are harmless. An approval for an
+    order that was cancelled or expired meanwhile is recorded as a
+    PaymentReview in the same transaction, for a refund or a manual decision.
+    """
+
+    def __init__(self, repository: OrderRepository, payment_gateway: PaymentGateway) -> None:
+        self._repository = repository
+        self._payment_gateway = payment_gateway
+
+    def execute(self, provider_payment_id: str) -> AppliedProviderPayment:
+        # The provider is queried before any transaction is opened.
+        return self.apply(self._payment_gateway.get_payment(provider_payment_id))
+
+    def apply(self, provider_payment: ProviderPayment) -> AppliedProviderPayment:
+        if not provider_payment.external_reference:
+            raise PaymentVerificationError("provider payment has no external_reference")
+
+        self._repository.begin()
+        try:
+            payment = self._repository.get_payment_by_order_number(provider_payment.external_reference)
+            if payment is None:
+                raise PaymentVerificationError(
+                    f"no payment for external_reference {provider_payment.external_reference!r}"
+                )
+            status = verified_status(payment, provider_payment)
+            changed = payment.can_transition_to(status) and self._repository.transition_payment(
+                PAYMENT_STATE_MACHINE.transition(payment.id, payment.status, status)
+            )
+            needs_review = False
+            if changed:
+                payment.status = status
+                if status == "approved":
+                    needs_review = not self._repository.transition_order(
+                        ORDER_STATE_MACHINE.transition(payment.order_id, "pending_payment", "paid")
+                    )
+            if needs_review:
+                self._repository.add_payment_reviews(
+                    [
+                        PaymentReview(
+                            payment_id=payment.id,
+                            order_id=payment.order_id,
+                            reason="approved_for_closed_order",
+                        )
+                    ]
+                )
+            self._repository.commit()
+        except Exception:
+            self._repository.rollback()
+            raise
+
+        if needs_review:
+            logger.error(
+                "payment %s was approved but order %s can no longer be paid; recorded for review",
+                provider_payment.provider_payment_id,
+                provider_payment.external_reference,
+            )
+        return AppliedProviderPayment(payment=payment, changed=changed, needs_review=needs_review)
@@ -1,18 +1,26 @@
 """Create order use case."""
 
 from dataclasses import dataclass
-from datetime import UTC, datetime
 from typing import Literal
-from uuid import UUID, uuid4
+from uuid import UUID
 
+from app.contexts.store.orders.domain.idempotency_store import IdempotencyClaim
 from app.contexts.store.orders.domain.order import Order
 from app.contexts.store.orders.domain.order_item import OrderItem
-from app.contexts.store.orders.domain.payment_gateway import PaymentGateway
+from app.contexts.store.orders.domain.payment_gateway import (
+    PaymentGateway,
+    PaymentGatewayUnavailableError,
+)
 from app.contexts.store.orders.domain.order_repository import (
     ActiveProductSnapshot,
     OrderRepository,
 )
 from app.contexts.store.orders.domain.payment import Payment
+from app.contexts.store.orders.domain.payment_outbox import PaymentOutboxMessage
+from app.shared.domain.ids import new_id, uuid7_datetime
+
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ORDER_ID_LOW_BITS = 40
 
 
 class CreateOrderError(Exception):
@@ -27,8 +35,32 @@ class InvalidOrderError(CreateOrderError):
     """Raised for invalid order input."""
 
 
+class InsufficientStockError(CreateOrderError):
+    """Raised when a requested quantity exceeds the available stock."""
+
+
+class IdempotencyClaimLostError(CreateOrderError):
+    """Raised when another request took the idempotency key over before the order committed."""
+
+
 class PaymentGatewayError(CreateOrderError):
-    """Raised when preference creation with provider fails."""
+    """Raised when preference creation with provider fails.
+
+    The order and its stock reservation are already committed by then; `order`
+    is that order, left in `pending_payment` without a payment URL.
+    """
+
+    def __init__(self, message: str, order: Order | None = None) -> None:
+        super().__init__(message)
+        self.order = order
+
+
+class PaymentProviderUnavailableError(PaymentGatewayError):
+    """Raised when the provider is skipped because it is known to be failing."""
+
+    def __init__(self, message: str, retry_after_seconds: float, order: Order | None = None) -> None:
+        super().__init__(message, order)
+        self.retry_after_seconds = retry_after_seconds
 
 
 @dataclass(frozen=True, slots=True)
@@ -51,20 +83,45 @@ class CreateOrderResult:
     payment_url: str | None
 
 
-def _generate_order_number() -> str:
-    timestamp = datetime.now(UTC).strftime("%Y%m%d%H%M%S")
-    suffix = str(uuid4()).split("-")[0].upper()
-    return f"ORD-{timestamp}-{suffix}"
+def _generate_order_number(order_id: UUID) -> str:
+    """Derive the order number from the time-ordered order id.
+
+    The suffix packs the millisecond and the low 40 bits of the id (where the
+    per-millisecond counter lives), so ids unique in the process never share a
+    number, even for bursts within the same second.
+    """
+
+    unix_ms = order_id.int >> 80
+    tail = ((unix_ms % 1000) << _ORDER_ID_LOW_BITS) | (order_id.int & ((1 << _ORDER_ID_LOW_BITS) - 1))
+    suffix = "".join(_CROCKFORD_BASE32[(tail >> shift) & 31] for shift in range(45, -1, -5))
+    return f"ORD-{uuid7_datetime(order_id):%Y%m%d%H%M%S}-{suffix}"
 
 
 class CreateOrderUseCase:
-    """Application service that creates an order and a base payment."""
+    """Application service that creates an order and a base payment.
 
-    def __init__(self, repository: OrderRepository, payment_gateway: PaymentGateway) -> None:
+    With `defer_payment_preference` the Mercado Pago preference is not created
+    inline: an outbox message is written in the order transaction and the
+    payment URL becomes available once the outbox worker has processed it.
+    With `idempotency_claim` the order is tied to that claim in the same
+    transaction, and rolled back if another request took the key over.
+    """
+
+    def __init__(
+        self,
+        repository: OrderRepository,
+        payment_gateway: PaymentGateway,
+        defer_payment_preference: bool = False,
+    ) -> None:
         self._repository = repository
         self._payment_gateway = payment_gateway
+        self._defer_payment_preference = defer_payment_preference
 
-    def execute(self, command: CreateOrderCommand) -> CreateOrderResult:
+    def execute(
+        self,
+        command: CreateOrderCommand,
+        idempotency_claim: IdempotencyClaim | None = None,
+    ) -> CreateOrderResult:
         if len(command.items) == 0:
             raise InvalidOrderError("order must include at least one item")
 
@@ -82,8 +139,13 @@ class CreateOrderUseCase:
             currency = self._resolve_currency(products)
             order_items = self._build_items(command.items, products)
 
+            if not self._repository.reserve_stock(self._requested_quantities(order_items)):
+                raise InsufficientStockError("insufficient stock for one or more products")
+
+            order_id = new_id()
             order = Order(
-                order_number=_generate_order_number(),
+                id=order_id,
+                order_number=_generate_order_number(order_id),
                 customer_name=command.customer_name,
                 customer_phone=command.customer_phone,
                 items=order_items,
@@ -98,26 +160,42 @@ class CreateOrderUseCase:
 
             self._repository.add_order(order)
             self._repository.add_payment(payment)
+            if command.payment_method == "mercadopago" and self._defer_payment_preference:
+                self._repository.add_payment_outbox_message(
+                    PaymentOutboxMessage(order_id=order.id, payment_id=payment.id)
+                )
+            if idempotency_claim is not None and not self._repository.record_idempotent_order(
+                idempotency_claim, order.id
+            ):
+                raise IdempotencyClaimLostError("idempotency key was taken over by another request")
             self._repository.commit()
         except Exception:
             self._repository.rollback()
             raise
 
         payment_url: str | None = None
-        if command.payment_method == "mercadopago":
+        if command.payment_method == "mercadopago" and not self._defer_payment_preference:
             try:
                 provider_response = self._payment_gateway.create_preference(order)
+            except PaymentGatewayUnavailableError as exc:
+                raise PaymentProviderUnavailableError(
+                    "Mercado Pago is temporarily unavailable",
+                    exc.retry_after_seconds,
+                    order,
+                ) from exc
             except Exception as exc:
-                raise PaymentGatewayError("failed to create Mercado Pago preference") from exc
+                raise PaymentGatewayError("failed to create Mercado Pago preference", order) from exc
 
-            payment.status = "pending"
-            payment.external_payment_id = provider_response.provider_payment_id
-            payment.init_point = provider_response.init_point
-            payment.sandbox_init_point = provider_response.sandbox_init_point
+            payment.attach_preference(
+                provider_response.provider_payment_id,
+                provider_response.init_point,
+                provider_response.sandbox_init_point,
+            )
 
             self._repository.begin()
             try:
-                self._repository.update_payment(payment)
+                # The payment was created above and is unknown to anyone else yet.
+                self._repository.attach_payment_preference(payment)
                 self._repository.commit()
             except Exception:
                 self._repository.rollback()
@@ -150,6 +228,12 @@ class CreateOrderUseCase:
 
         return items
 
+    def _requested_quantities(self, items: list[OrderItem]) -> dict[UUID, int]:
+        quantities: dict[UUID, int] = {}
+        for item in items:
+            quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+        return quantities
+
     def _resolve_currency(self, products: dict[UUID, ActiveProductSnapshot]) -> str:
         currencies = {product.currency.upper() for product in products.values()}
         if len(currencies) != 1:
@@ -0,0 +1,63 @@
+"""Create the provider preference of an order whose payment was deferred to the outbox."""
+
+from uuid import UUID
+
+from app.contexts.store.orders.domain.order_repository import OrderRepository
+from app.contexts.store.orders.domain.payment import Payment
+from app.contexts.store.orders.domain.payment_gateway import PaymentGateway
+
+
+class PaymentPreferenceError(Exception):
+    """Raised when the order or payment behind an outbox message cannot be processed."""
+
+
+class CreatePaymentPreferenceUseCase:
+    """Application service run by the outbox worker for one order."""
+
+    def __init__(self, repository: OrderRepository, payment_gateway: PaymentGateway) -> None:
+        self._repository = repository
+        self._payment_gateway = payment_gateway
+
+    def execute(self, order_id: UUID) -> Payment:
+        # Short read transaction: nothing stays open while the provider is called.
+        self._repository.begin()
+        try:
+            order = self._repository.get_order(order_id)
+            payment = (
+                self._repository.get_payment_by_order_number(order.order_number)
+                if order is not None
+                else None
+            )
+            self._repository.commit()
+        except Exception:
+            self._repository.rollback()
+            raise
+
+        if order is None:
+            raise PaymentPreferenceError(f"order {order_id} not found")
+        if payment is None:
+            raise PaymentPreferenceError(f"payment for order {order.order_number} not found")
+
+        # Redelivered messages must not create a second preference.
+        if payment.init_point is not None:
+            return payment
+
+        provider_response = self._payment_gateway.create_preference(order)
+        payment.attach_preference(
+            provider_response.provider_payment_id,
+            provider_response.init_point,
+            provider_response.sandbox_init_point,
+        )
+
+        self._repository.begin()
+        try:
+            if not self._repository.attach_payment_preference(payment):
+                raise PaymentPreferenceError(
+                    f"payment for order {order.order_number} changed while its preference was created"
+                )
+            self._repository.commit()
+        except Exception:
+            self._repository.rollback()
+            raise
+
+        return payment
@@ -0,0 +1,61 @@
+"""Expire unpaid orders and give their reserved stock back."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from app.contexts.store.orders.domain.order_repository import OrderRepository
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+@dataclass(frozen=True, slots=True)
+class OrderExpirationResult:
+    expired: int
+    batches: int
+
+
+class ExpireOrdersUseCase:
+    """Application service moving stale `pending_payment` orders to `expired`.
+
+    Each batch is its own short transaction: expire up to `batch_size` orders
+    and release their stock, then commit, so row locks never pile up on
+    `orders` or `products` however large the backlog is.
+    """
+
+    def __init__(
+        self,
+        repository: OrderRepository,
+        batch_size: int = 500,
+        clock: Callable[[], datetime] = _utc_now,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than zero")
+        self._repository = repository
+        self._batch_size = batch_size
+        self._clock = clock
+
+    def execute(self, max_age: timedelta) -> OrderExpirationResult:
+        cutoff = self._clock() - max_age
+        expired = 0
+        batches = 0
+        while True:
+            self._repository.begin()
+            try:
+                order_ids = self._repository.expire_orders(cutoff, limit=self._batch_size)
+                self._repository.release_stock(order_ids)
+                self._repository.commit()
+            except Exception:
+                self._repository.rollback()
+                raise
+
+            if not order_ids:
+                break
+            expired += len(order_ids)
+            batches += 1
+            if len(order_ids) < self._batch_size:
+                break
+
+        return OrderExpirationResult(expired=expired, batches=batches)
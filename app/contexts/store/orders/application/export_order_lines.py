@@ -0,0 +1,28 @@
+"""Export order lines use case for accounting reconciliation."""
+
+from collections.abc import Iterator
+
+from app.contexts.store.orders.application.list_orders import normalize_order_filters
+from app.contexts.store.orders.domain.order_repository import (
+    OrderLineExportRow,
+    OrderListFilter,
+    OrderRepository,
+)
+
+ORDER_LINE_EXPORT_COLUMNS = tuple(OrderLineExportRow.__dataclass_fields__)
+
+
+class ExportOrderLinesUseCase:
+    """Application service that streams every order line with its payment, oldest first."""
+
+    def __init__(self, repository: OrderRepository) -> None:
+        self._repository = repository
+
+    def stream(
+        self,
+        filters: OrderListFilter,
+        chunk_size: int = 1000,
+    ) -> Iterator[list[OrderLineExportRow]]:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be greater than zero")
+        return self._repository.iter_order_lines(normalize_order_filters(filters), chunk_size)
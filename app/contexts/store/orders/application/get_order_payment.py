@@ -0,0 +1,21 @@
+"""Get order payment status use case."""
+
+from app.contexts.store.orders.domain.order_repository import OrderRepository
+from app.contexts.store.orders.domain.payment import Payment
+
+
+class OrderPaymentNotFoundError(Exception):
+    """Raised when no payment exists for the given order number."""
+
+
+class GetOrderPaymentUseCase:
+    """Application service that returns the current payment of an order, for polling."""
+
+    def __init__(self, repository: OrderRepository) -> None:
+        self._repository = repository
+
+    def execute(self, order_number: str) -> Payment:
+        payment = self._repository.get_payment_by_order_number(order_number.strip())
+        if payment is None:
+            raise OrderPaymentNotFoundError(f"order not found: {order_number}")
+        return payment
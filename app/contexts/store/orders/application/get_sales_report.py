@@ -0,0 +1,56 @@
+"""Sales report use case for the back-office dashboard."""
+
+from collections.abc import Collection
+from dataclasses import dataclass
+from datetime import date
+
+from app.contexts.store.orders.domain.order import OrderStatus
+from app.contexts.store.orders.domain.order_repository import (
+    DailyStatusTotal,
+    OrderRepository,
+    ProductSalesTotal,
+)
+
+# Orders that count as sold for the product ranking.
+SALES_ORDER_STATUSES: tuple[OrderStatus, ...] = ("paid", "ready_for_pickup", "picked_up")
+MAX_SALES_REPORT_DAYS = 366
+
+
+@dataclass(frozen=True, slots=True)
+class SalesReport:
+    from_day: date
+    to_day: date
+    statuses: tuple[str, ...]
+    daily: list[DailyStatusTotal]
+    products: list[ProductSalesTotal]
+
+
+class GetSalesReportUseCase:
+    """Application service that reads the daily sales rollups, never the orders themselves.
+
+    Its cost grows with the number of days (and products sold) in the range,
+    not with the number of orders placed in it.
+    """
+
+    def __init__(self, repository: OrderRepository) -> None:
+        self._repository = repository
+
+    def execute(
+        self,
+        from_day: date,
+        to_day: date,
+        statuses: Collection[str] | None = None,
+    ) -> SalesReport:
+        if from_day > to_day:
+            raise ValueError("from must not be later than to")
+        if (to_day - from_day).days >= MAX_SALES_REPORT_DAYS:
+            raise ValueError(f"a sales report spans at most {MAX_SALES_REPORT_DAYS} days")
+
+        sold = tuple(sorted(set(statuses))) if statuses else SALES_ORDER_STATUSES
+        return SalesReport(
+            from_day=from_day,
+            to_day=to_day,
+            statuses=sold,
+            daily=self._repository.daily_status_totals(from_day, to_day),
+            products=self._repository.product_sales_totals(from_day, to_day, sold),
+        )
@@ -0,0 +1,176 @@
+"""Create order use case guarded by a client-supplied idempotency key."""
+
+import hashlib
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from app.contexts.store.orders.application.create_order import (
+    CreateOrderCommand,
+    CreateOrderError,
+    CreateOrderUseCase,
+    IdempotencyClaimLostError,
+    InsufficientStockError,
+    InvalidOrderError,
+    PaymentGatewayError,
+    ProductNotFoundError,
+)
+from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.idempotency_store import (
+    IdempotencyClaim,
+    IdempotencyRecord,
+    IdempotencyStore,
+    OrderReceipt,
+)
+from app.shared.domain.ids import new_id
+
+DEFAULT_IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_IDEMPOTENCY_LEASE_SECONDS = 120
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+class InvalidIdempotencyKeyError(CreateOrderError):
+    """Raised when the supplied key is blank or too long."""
+
+
+class IdempotencyKeyInProgressError(CreateOrderError):
+    """Raised when another request with the same key has not finished yet."""
+
+
+class IdempotencyKeyReusedError(CreateOrderError):
+    """Raised when a key is replayed with a different request body."""
+
+
+@dataclass(frozen=True, slots=True)
+class IdempotentCreateOrderResult:
+    receipt: OrderReceipt
+    replayed: bool
+
+
+def request_fingerprint(command: CreateOrderCommand) -> str:
+    """Stable digest of the order request, used to detect reuse of a key for another order."""
+
+    canonical = {
+        "customer_name": command.customer_name,
+        "customer_phone": command.customer_phone,
+        "payment_method": command.payment_method,
+        "items": [[str(item.product_id), item.quantity] for item in command.items],
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+def _to_receipt(order: Order, payment_url: str | None) -> OrderReceipt:
+    return OrderReceipt(
+        order_number=order.order_number,
+        status=order.status,
+        total_cents=order.total_cents,
+        payment_url=payment_url,
+    )
+
+
+def _is_abandoned(record: IdempotencyRecord, now: datetime) -> bool:
+    return (
+        record.status == "in_progress"
+        and record.lease_expires_at is not None
+        and record.lease_expires_at <= now
+    )
+
+
+def _can_take_over(record: IdempotencyRecord, fingerprint: str, now: datetime) -> bool:
+    return (
+        record.request_fingerprint == fingerprint
+        and _is_abandoned(record, now)
+        and record.order_id is None
+    )
+
+
+class IdempotentCreateOrderUseCase:
+    """Application service that runs CreateOrder at most once per idempotency key.
+
+    A claim holds the key for `lease_seconds` while the order is created; a claim
+    whose request died before its order committed can be taken over once its
+    lease lapses, instead of blocking the key for the whole TTL. The order is
+    tied to the claim in its own transaction, so a request that died after the
+    commit is replayed rather than ordered again.
+    """
+
+    def __init__(
+        self,
+        store: IdempotencyStore,
+        create_order: CreateOrderUseCase,
+        ttl_seconds: int = DEFAULT_IDEMPOTENCY_TTL_SECONDS,
+        clock: Callable[[], datetime] = _utc_now,
+        lease_seconds: int = DEFAULT_IDEMPOTENCY_LEASE_SECONDS,
+    ) -> None:
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be greater than zero")
+        if lease_seconds <= 0:
+            raise ValueError("lease_seconds must be greater than zero")
+        self._store = store
+        self._create_order = create_order
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._lease = min(timedelta(seconds=lease_seconds), self._ttl)
+        self._clock = clock
+
+    def execute(self, key: str, command: CreateOrderCommand) -> IdempotentCreateOrderResult:
+        key = key.strip()
+        if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise InvalidIdempotencyKeyError(
+                f"idempotency key must have between 1 and {MAX_IDEMPOTENCY_KEY_LENGTH} characters"
+            )
+
+        fingerprint = request_fingerprint(command)
+        now = self._clock()
+
+        # Retries are answered from a single primary-key lookup.
+        record = self._store.get(key)
+        if record is not None and record.expires_at > now and not _can_take_over(record, fingerprint, now):
+            return self._replay(record, fingerprint, now)
+
+        claim = IdempotencyClaim(key=key, token=new_id())
+        if not self._store.claim(claim, fingerprint, now, now + self._ttl, now + self._lease):
+            record = self._store.get(key)
+            if record is None:
+                raise IdempotencyKeyInProgressError("a request with this idempotency key is in progress")
+            return self._replay(record, fingerprint, now)
+
+        # Other failures may come after the commit, so they keep the claim until its lease lapses;
+        # by then the claim carries the order id and retries replay it.
+        try:
+            result = self._create_order.execute(command, idempotency_claim=claim)
+        except IdempotencyClaimLostError as exc:
+            raise IdempotencyKeyInProgressError("a request with this idempotency key is in progress") from exc
+        except (InvalidOrderError, ProductNotFoundError, InsufficientStockError):
+            # Rejected before the order transaction committed: nothing to replay, so free the key.
+            self._store.release(claim)
+            raise
+        except PaymentGatewayError as exc:
+            # The order and its reservation are committed: retries replay it, without a payment
+            # URL, instead of ordering (and reserving stock) again.
+            if exc.order is not None:
+                self._store.complete(claim, _to_receipt(exc.order, payment_url=None))
+            raise
+
+        receipt = _to_receipt(result.order, result.payment_url)
+        self._store.complete(claim, receipt)
+        return IdempotentCreateOrderResult(receipt=receipt, replayed=False)
+
+    def _replay(
+        self,
+        record: IdempotencyRecord,
+        fingerprint: str,
+        now: datetime,
+    ) -> IdempotentCreateOrderResult:
+        if record.request_fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError("idempotency key was already used for a different request")
+        # An abandoned claim whose order committed is replayed from that order.
+        settled = record.status == "completed" or _is_abandoned(record, now)
+        if not settled or record.receipt is None:
+            raise IdempotencyKeyInProgressError("a request with this idempotency key is in progress")
+        return IdempotentCreateOrderResult(receipt=record.receipt, replayed=True)
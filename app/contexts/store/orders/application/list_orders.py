@@ -0,0 +1,54 @@
+"""List orders use case for back-office staff."""
+
+from dataclasses import replace
+from datetime import UTC, datetime
+
+from app.contexts.store.orders.domain.order_repository import (
+    OrderCursor,
+    OrderListFilter,
+    OrderPage,
+    OrderRepository,
+)
+
+DEFAULT_ORDER_PAGE_SIZE = 20
+MAX_ORDER_PAGE_SIZE = 100
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    return value.astimezone(UTC) if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+def normalize_order_filters(filters: OrderListFilter) -> OrderListFilter:
+    """Validate the date range and bring filter values to their stored form (UTC, trimmed)."""
+
+    created_from = _as_utc(filters.created_from)
+    created_to = _as_utc(filters.created_to)
+    if created_from is not None and created_to is not None and created_from >= created_to:
+        raise ValueError("created_from must be earlier than created_to")
+
+    phone = filters.customer_phone.strip() if filters.customer_phone is not None else None
+    return replace(
+        filters,
+        created_from=created_from,
+        created_to=created_to,
+        customer_phone=phone or None,
+    )
+
+
+class ListOrdersUseCase:
+    """Application service that pages through orders with their items and payment."""
+
+    def __init__(self, repository: OrderRepository) -> None:
+        self._repository = repository
+
+    def execute(
+        self,
+        filters: OrderListFilter,
+        limit: int = DEFAULT_ORDER_PAGE_SIZE,
+        after: OrderCursor | None = None,
+    ) -> OrderPage:
+        if limit <= 0 or limit > MAX_ORDER_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_ORDER_PAGE_SIZE}")
+        return self._repository.list_orders(normalize_order_filters(filters), limit, after)
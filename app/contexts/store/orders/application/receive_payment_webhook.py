@@ -0,0 +1,47 @@
+"""Receive provider webhooks: validate minimally and queue them for verification."""
+
+import re
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Literal
+
+from app.contexts.store.orders.domain.webhook_inbox import WebhookInbox
+
+SUPPORTED_WEBHOOK_TOPICS = frozenset({"payment"})
+MAX_WEBHOOK_RESOURCE_ID_LENGTH = 64
+_RESOURCE_ID = re.compile(r"[A-Za-z0-9_-]+")
+
+WebhookReceipt = Literal["recorded", "duplicate", "ignored"]
+
+
+class InvalidWebhookError(Exception):
+    """Raised when a notification does not name a topic and a usable resource id."""
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+class ReceivePaymentWebhookUseCase:
+    """Application service behind the webhook endpoint.
+
+    It never calls the provider: the notification is recorded with one
+    insert-or-ignore and verified later by the webhook worker, so the endpoint
+    answers in milliseconds and provider retries collapse into one event.
+    """
+
+    def __init__(self, inbox: WebhookInbox, clock: Callable[[], datetime] = _utc_now) -> None:
+        self._inbox = inbox
+        self._clock = clock
+
+    def execute(self, topic: str | None, resource_id: str | None) -> WebhookReceipt:
+        topic = (topic or "").strip().lower()
+        resource_id = (resource_id or "").strip()
+        if not topic or not resource_id:
+            raise InvalidWebhookError("notification must include a topic and a resource id")
+        if topic not in SUPPORTED_WEBHOOK_TOPICS:
+            return "ignored"
+        if len(resource_id) > MAX_WEBHOOK_RESOURCE_ID_LENGTH or not _RESOURCE_ID.fullmatch(resource_id):
+            raise InvalidWebhookError("resource id is not valid")
+
+        return "recorded" if self._inbox.record(topic, resource_id, self._clock()) else "duplicate"
@@ -0,0 +1,217 @@
+"""Re-check unsettled payments against the provider in concurrent batches."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+from app.contexts.store.orders.application.apply_provider_payment import (
+    PaymentVerificationError,
+    verified_status,
+)
+from app.contexts.store.orders.domain.order_repository import (
+    OrderRepository,
+    PaymentCursor,
+    PaymentToReconcile,
+)
+from app.contexts.store.orders.domain.payment_gateway import PaymentLookup, ProviderPayment
+from app.contexts.store.orders.domain.payment_review import PaymentReview
+from app.contexts.store.orders.domain.state_machine import (
+    ORDER_STATE_MACHINE,
+    PAYMENT_STATE_MACHINE,
+    StatusTransition,
+)
+
+logger = logging.getLogger(__name__)
+
+RECONCILABLE_PAYMENT_STATUSES = frozenset({"created", "pending"})
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+@dataclass(slots=True)
+class ReconciliationStats:
+    """Counters of one reconciliation run; every scanned payment lands in exactly one bucket."""
+
+    scanned: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    not_found: int = 0
+    mismatched: int = 0
+    errors: int = 0
+    orders_paid: int = 0
+    # Approved payments whose order had expired or been cancelled; recorded for review.
+    orders_not_payable: int = 0
+    pages: int = 0
+    elapsed_seconds: float = 0.0
+    updated_by_status: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def payments_per_second(self) -> float:
+        return self.scanned / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class ReconcilePaymentsUseCase:
+    """Application service that settles `created`/`pending` payments from the provider's view.
+
+    Payments older than `min_age` are read oldest first, one keyset page at a
+    time. Each page is looked up by order number with at most `concurrency`
+    provider calls in flight, then written as one bulk compare-and-set, so
+    rows settled meanwhile by a webhook are left alone.
+    Lookup errors and mismatches are counted and retried on the next run.
+    Approvals for orders that can no longer be paid are recorded as
+    PaymentReview rows in the same transaction.
+    """
+
+    def __init__(
+        self,
+        repository: OrderRepository,
+        lookup: PaymentLookup,
+        concurrency: int = 16,
+        page_size: int = 200,
+        clock: Callable[[], datetime] = _utc_now,
+    ) -> None:
+        if concurrency <= 0:
+            raise ValueError("concurrency must be greater than zero")
+        if page_size <= 0:
+            raise ValueError("page_size must be greater than zero")
+        self._repository = repository
+        self._lookup = lookup
+        self._concurrency = concurrency
+        self._page_size = page_size
+        self._clock = clock
+
+    async def execute(self, min_age: timedelta) -> ReconciliationStats:
+        started = time.perf_counter()
+        stats = ReconciliationStats()
+        semaphore = asyncio.Semaphore(self._concurrency)
+        created_before = self._clock() - min_age
+        cursor: PaymentCursor | None = None
+
+        while page := self._read_page(created_before, cursor):
+            stats.pages += 1
+            stats.scanned += len(page)
+            results = await asyncio.gather(*(self._find(semaphore, item) for item in page))
+            self._apply(page, results, stats)
+
+            last = page[-1].payment
+            cursor = PaymentCursor(created_at=last.created_at, id=last.id)
+            if len(page) < self._page_size:
+                break
+
+        stats.elapsed_seconds = time.perf_counter() - started
+        return stats
+
+    def _read_page(
+        self,
+        created_before: datetime,
+        cursor: PaymentCursor | None,
+    ) -> list[PaymentToReconcile]:
+        # Short read transaction: nothing is held open while the provider answers.
+        self._repository.begin()
+        try:
+            page = self._repository.list_payments_by_status(
+                RECONCILABLE_PAYMENT_STATUSES,
+                created_before,
+                limit=self._page_size,
+                after=cursor,
+            )
+            self._repository.commit()
+        except Exception:
+            self._repository.rollback()
+            raise
+        return page
+
+    async def _find(
+        self,
+        semaphore: asyncio.Semaphore,
+        item: PaymentToReconcile,
+    ) -> ProviderPayment | Exception | None:
+        async with semaphore:
+            try:
+                return await self._lookup.find_by_external_reference(item.order_number)
+            except Exception as exc:
+                logger.warning("payment lookup for order %s failed: %s", item.order_number, exc)
+                return exc
+
+    def _apply(
+        self,
+        page: list[PaymentToReconcile],
+        results: list[ProviderPayment | Exception | None],
+        stats: ReconciliationStats,
+    ) -> None:
+        transitions: list[StatusTransition] = []
+        order_ids: dict[UUID, UUID] = {}
+        order_numbers: dict[UUID, str] = {}
+        for item, result in zip(page, results, strict=True):
+            if isinstance(result, Exception):
+                stats.errors += 1
+                continue
+            if result is None:
+                stats.not_found += 1
+                continue
+            try:
+                status = verified_status(item.payment, result)
+            except PaymentVerificationError as exc:
+                logger.warning("payment of order %s not reconciled: %s", item.order_number, exc)
+                stats.mismatched += 1
+                continue
+            if not item.payment.can_transition_to(status):
+                stats.unchanged += 1
+                continue
+            payment = item.payment
+            transitions.append(PAYMENT_STATE_MACHINE.transition(payment.id, payment.status, status))
+            order_ids[item.payment.id] = item.payment.order_id
+            order_numbers[item.payment.id] = item.order_number
+
+        if not transitions:
+            return
+
+        self._repository.begin()
+        try:
+            moved = self._repository.transition_payments(transitions)
+            approved = [
+                transition.id
+                for transition in transitions
+                if transition.id in moved and transition.target == "approved"
+            ]
+            paid = self._repository.transition_orders(
+                [
+                    ORDER_STATE_MACHINE.transition(order_ids[payment_id], "pending_payment", "paid")
+                    for payment_id in approved
+                ]
+            )
+            not_payable = [payment_id for payment_id in approved if order_ids[payment_id] not in paid]
+            self._repository.add_payment_reviews(
+                [
+                    PaymentReview(
+                        payment_id=payment_id,
+                        order_id=order_ids[payment_id],
+                        reason="approved_for_closed_order",
+                    )
+                    for payment_id in not_payable
+                ]
+            )
+            self._repository.commit()
+        except Exception:
+            self._repository.rollback()
+            raise
+
+        for payment_id in not_payable:
+            logger.error(
+                "payment of order %s was approved but the order can no longer be paid; recorded for review",
+                order_numbers[payment_id],
+            )
+        stats.unchanged += len(transitions) - len(moved)
+        stats.updated += len(moved)
+        stats.orders_paid += len(paid)
+        stats.orders_not_payable += len(not_payable)
+        for transition in transitions:
+            if transition.id in moved:
+                by_status = stats.updated_by_status
+                by_status[transition.target] = by_status.get(transition.target, 0) + 1
@@ -0,0 +1,70 @@
+"""Idempotency store port for retried order creation requests."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal, Protocol
+from uuid import UUID
+
+IdempotencyStatus = Literal["in_progress", "completed"]
+
+
+@dataclass(frozen=True, slots=True)
+class OrderReceipt:
+    """Outcome of a created order, replayed verbatim to retries of the same request."""
+
+    order_number: str
+    status: str
+    total_cents: int
+    payment_url: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class IdempotencyClaim:
+    """One request's hold on a key; `token` tells it apart from a later takeover."""
+
+    key: str
+    token: UUID
+
+
+@dataclass(frozen=True, slots=True)
+class IdempotencyRecord:
+    key: str
+    request_fingerprint: str
+    status: IdempotencyStatus
+    expires_at: datetime
+    receipt: OrderReceipt | None = None
+    lease_expires_at: datetime | None = None
+    # Set in the order transaction: an in-progress claim with an order replays it.
+    order_id: UUID | None = None
+
+
+class IdempotencyStore(Protocol):
+    """Port used by the application layer to claim and remember idempotency keys."""
+
+    def get(self, key: str) -> IdempotencyRecord | None:
+        ...
+
+    def claim(
+        self,
+        claim: IdempotencyClaim,
+        request_fingerprint: str,
+        now: datetime,
+        expires_at: datetime,
+        lease_expires_at: datetime,
+    ) -> bool:
+        """Atomically record the key as in progress; False if a live record already holds it.
+
+        An expired record, or an in-progress one whose lease lapsed before it
+        recorded an order, gives way to the claim.
+        """
+        ...
+
+    def complete(self, claim: IdempotencyClaim, receipt: OrderReceipt) -> bool:
+        """Store the receipt while `claim` still holds the key; False once it was taken over."""
+        ...
+
+    def release(self, claim: IdempotencyClaim) -> None:
+        ...
+
+    def purge_expired(self, now: datetime) -> int:
+        ...
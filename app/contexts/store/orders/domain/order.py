@@ -3,12 +3,27 @@
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Literal
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from app.contexts.store.orders.domain.order_item import OrderItem
-
-OrderStatus = Literal["pending_payment", "paid", "cancelled", "picked_up"]
-ALLOWED_ORDER_STATUS: set[str] = {"pending_payment", "paid", "cancelled", "picked_up"}
+from app.shared.domain.ids import new_id
+
+OrderStatus = Literal[
+    "pending_payment",
+    "paid",
+    "ready_for_pickup",
+    "picked_up",
+    "cancelled",
+    "expired",
+]
+ALLOWED_ORDER_STATUS: set[str] = {
+    "pending_payment",
+    "paid",
+    "ready_for_pickup",
+    "picked_up",
+    "cancelled",
+    "expired",
+}
 
 
 def _utc_now() -> datetime:
@@ -24,7 +39,7 @@ class Order:
     customer_phone: str
     items: list[OrderItem]
     status: OrderStatus = "pending_payment"
-    id: UUID = field(default_factory=uuid4)
+    id: UUID = field(default_factory=new_id)
     created_at: datetime = field(default_factory=_utc_now)
     total_cents: int = field(init=False)
 
@@ -1,7 +1,9 @@
 """Order item domain entity."""
 
 from dataclasses import dataclass, field
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from app.shared.domain.ids import new_id
 
 
 @dataclass(slots=True)
@@ -12,7 +14,7 @@ class OrderItem:
     quantity: int
     product_name_snapshot: str
     unit_price_cents_snapshot: int
-    id: UUID = field(default_factory=uuid4)
+    id: UUID = field(default_factory=new_id)
 
     def __post_init__(self) -> None:
         self.product_name_snapshot = self.product_name_snapshot.strip()
@@ -1,11 +1,17 @@
 """Order repository port."""
 
+from collections.abc import Collection, Iterator, Sequence
 from dataclasses import dataclass
+from datetime import date, datetime
 from typing import Protocol
 from uuid import UUID
 
-from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.idempotency_store import IdempotencyClaim
+from app.contexts.store.orders.domain.order import Order, OrderStatus
 from app.contexts.store.orders.domain.payment import Payment
+from app.contexts.store.orders.domain.payment_outbox import PaymentOutboxMessage
+from app.contexts.store.orders.domain.payment_review import PaymentReview
+from app.contexts.store.orders.domain.state_machine import StatusTransition
 
 
 @dataclass(frozen=True, slots=True)
@@ -18,6 +24,91 @@ class ActiveProductSnapshot:
     currency: str
 
 
+@dataclass(frozen=True, slots=True)
+class OrderListFilter:
+    """Admin listing filters; `created_from` is inclusive and `created_to` exclusive."""
+
+    status: OrderStatus | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    customer_phone: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class OrderCursor:
+    """Keyset position inside the order listing ordered by (created_at, id) DESC."""
+
+    created_at: datetime
+    id: UUID
+
+
+@dataclass(frozen=True, slots=True)
+class PaymentCursor:
+    """Keyset position inside a payment scan ordered by (created_at, id) ASC."""
+
+    created_at: datetime
+    id: UUID
+
+
+@dataclass(frozen=True, slots=True)
+class PaymentToReconcile:
+    """Payment with the order number the provider knows it by (`external_reference`)."""
+
+    payment: Payment
+    order_number: str
+
+
+@dataclass(frozen=True, slots=True)
+class OrderWithPayment:
+    order: Order
+    payment: Payment | None
+
+
+@dataclass(frozen=True, slots=True)
+class OrderPage:
+    items: list[OrderWithPayment]
+    next_cursor: OrderCursor | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class OrderLineExportRow:
+    """One order line with its order and payment, flattened for accounting exports."""
+
+    order_number: str
+    order_created_at: datetime
+    order_status: str
+    customer_name: str
+    customer_phone: str
+    order_total_cents: int
+    product_id: UUID
+    product_name: str
+    quantity: int
+    unit_price_cents: int
+    line_total_cents: int
+    payment_status: str | None
+    payment_amount_cents: int | None
+    payment_currency: str | None
+    external_payment_id: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class DailyStatusTotal:
+    """Orders created on a UTC day that are currently in `status`."""
+
+    day: date
+    status: str
+    order_count: int
+    total_cents: int
+
+
+@dataclass(frozen=True, slots=True)
+class ProductSalesTotal:
+    product_id: UUID
+    product_name: str
+    units: int
+    revenue_cents: int
+
+
 class OrderRepository(Protocol):
     """Port used by application layer."""
 
@@ -36,11 +127,100 @@ class OrderRepository(Protocol):
     ) -> dict[UUID, ActiveProductSnapshot]:
         ...
 
+    def reserve_stock(self, quantities: dict[UUID, int]) -> bool:
+        """Decrement stock for every product, or report False if any line is short.
+
+        A False result leaves earlier lines decremented; callers must roll back.
+        """
+        ...
+
     def add_order(self, order: Order) -> None:
         ...
 
     def add_payment(self, payment: Payment) -> None:
         ...
 
-    def update_payment(self, payment: Payment) -> None:
+    def attach_payment_preference(self, payment: Payment) -> bool:
+        """Write the payment's preference fields once, while it is still `created` without one."""
+        ...
+
+    def transition_payment(self, transition: StatusTransition) -> bool:
+        """Compare-and-set one payment status; False if the row was no longer in `expected`."""
+        ...
+
+    def transition_payments(self, transitions: Sequence[StatusTransition]) -> set[UUID]:
+        """Bulk `transition_payment`; returns the ids of the payments that moved."""
+        ...
+
+    def transition_order(self, transition: StatusTransition) -> bool:
+        """Compare-and-set one order status; False if the row was no longer in `expected`."""
+        ...
+
+    def transition_orders(self, transitions: Sequence[StatusTransition]) -> set[UUID]:
+        """Bulk `transition_order`; returns the ids of the orders that moved."""
+        ...
+
+    def expire_orders(self, created_before: datetime, limit: int) -> list[UUID]:
+        """Move up to `limit` `pending_payment` orders created before the cutoff to `expired`.
+
+        Oldest first; orders whose payment the provider reported in process are skipped.
+        Returns the ids of the orders that moved.
+        """
+        ...
+
+    def release_stock(self, order_ids: Collection[UUID]) -> None:
+        """Give the quantities reserved by these orders back to their products."""
+        ...
+
+    def list_payments_by_status(
+        self,
+        statuses: Collection[str],
+        created_before: datetime,
+        limit: int,
+        after: PaymentCursor | None = None,
+    ) -> list[PaymentToReconcile]:
+        ...
+
+    def add_payment_outbox_message(self, message: PaymentOutboxMessage) -> None:
+        ...
+
+    def add_payment_reviews(self, reviews: Sequence[PaymentReview]) -> None:
+        ...
+
+    def record_idempotent_order(self, claim: IdempotencyClaim, order_id: UUID) -> bool:
+        """Tie the order to `claim` in the order transaction; False once the claim was taken over."""
+        ...
+
+    def daily_status_totals(self, from_day: date, to_day: date) -> list[DailyStatusTotal]:
+        """Per-day, per-status totals for `from_day..to_day` (inclusive), read from the rollups."""
+        ...
+
+    def product_sales_totals(
+        self,
+        from_day: date,
+        to_day: date,
+        statuses: Collection[str],
+    ) -> list[ProductSalesTotal]:
+        """Units and revenue per product over the range for orders in `statuses`, top revenue first."""
+        ...
+
+    def get_order(self, order_id: UUID) -> Order | None:
+        ...
+
+    def get_payment_by_order_number(self, order_number: str) -> Payment | None:
+        ...
+
+    def list_orders(
+        self,
+        filters: OrderListFilter,
+        limit: int,
+        after: OrderCursor | None = None,
+    ) -> OrderPage:
+        ...
+
+    def iter_order_lines(
+        self,
+        filters: OrderListFilter,
+        chunk_size: int = 1000,
+    ) -> Iterator[list[OrderLineExportRow]]:
         ...
@@ -3,7 +3,13 @@
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Literal
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from app.contexts.store.orders.domain.state_machine import (
+    PAYMENT_STATE_MACHINE,
+    InvalidStatusTransitionError,
+)
+from app.shared.domain.ids import new_id
 
 PaymentStatus = Literal["created", "pending", "approved", "rejected", "cancelled", "refunded"]
 ALLOWED_PAYMENT_STATUS: set[str] = {
@@ -31,7 +37,7 @@ class Payment:
     external_payment_id: str | None = None
     init_point: str | None = None
     sandbox_init_point: str | None = None
-    id: UUID = field(default_factory=uuid4)
+    id: UUID = field(default_factory=new_id)
     created_at: datetime = field(default_factory=_utc_now)
 
     def __post_init__(self) -> None:
@@ -44,3 +50,26 @@ class Payment:
             raise ValueError("amount_cents must be greater than zero")
         if self.status not in ALLOWED_PAYMENT_STATUS:
             raise ValueError("invalid payment status")
+
+    def attach_preference(
+        self,
+        provider_payment_id: str,
+        init_point: str,
+        sandbox_init_point: str | None = None,
+    ) -> None:
+        """Record the provider checkout created for this payment; it now awaits the buyer.
+
+        The payment stays `created` (INITIATED): only the provider reporting a
+        payment in process moves it to `pending`.
+        """
+
+        if self.status != "created":
+            raise InvalidStatusTransitionError(f"cannot attach a preference to a {self.status} payment")
+        if self.init_point is not None:
+            raise InvalidStatusTransitionError("payment already has a preference")
+        self.external_payment_id = provider_payment_id
+        self.init_point = init_point
+        self.sandbox_init_point = sandbox_init_point
+
+    def can_transition_to(self, status: str) -> bool:
+        return PAYMENT_STATE_MACHINE.can_transition(self.status, status)
@@ -15,8 +15,37 @@ class PaymentProviderResponse:
     sandbox_init_point: str | None = None
 
 
+@dataclass(frozen=True, slots=True)
+class ProviderPayment:
+    """Payment as reported by the provider API, the only source trusted for status changes."""
+
+    provider_payment_id: str
+    status: str
+    external_reference: str | None
+    amount_cents: int
+    currency: str
+
+
+class PaymentGatewayUnavailableError(Exception):
+    """Raised without contacting the provider while it is considered unavailable."""
+
+    def __init__(self, message: str, retry_after_seconds: float) -> None:
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
 class PaymentGateway(Protocol):
     """Port for payment provider integrations."""
 
     def create_preference(self, order: Order) -> PaymentProviderResponse:
         ...
+
+    def get_payment(self, provider_payment_id: str) -> ProviderPayment:
+        ...
+
+
+class PaymentLookup(Protocol):
+    """Async port used by batch jobs to find the provider payment behind an order."""
+
+    async def find_by_external_reference(self, external_reference: str) -> ProviderPayment | None:
+        ...
@@ -0,0 +1,53 @@
+"""Transactional outbox port for deferred payment preference creation."""
+
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Literal, Protocol
+from uuid import UUID
+
+from app.shared.domain.ids import new_id
+
+PaymentOutboxStatus = Literal["pending", "processing", "sent", "failed"]
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+@dataclass(slots=True)
+class PaymentOutboxMessage:
+    """Request to create the provider preference of an order, written with the order."""
+
+    order_id: UUID
+    payment_id: UUID
+    status: PaymentOutboxStatus = "pending"
+    attempts: int = 0
+    available_at: datetime = field(default_factory=_utc_now)
+    last_error: str | None = None
+    id: UUID = field(default_factory=new_id)
+
+
+class PaymentOutbox(Protocol):
+    """Port used by the outbox worker to lease and settle messages."""
+
+    def claim_due(
+        self,
+        now: datetime,
+        limit: int,
+        lease_until: datetime,
+    ) -> list[PaymentOutboxMessage]:
+        """Lease up to `limit` due messages; expired leases are handed out again."""
+        ...
+
+    def mark_sent(self, message_id: UUID) -> None:
+        ...
+
+    def mark_retry(self, message_id: UUID, error: str, available_at: datetime) -> None:
+        ...
+
+    def mark_failed(self, message_id: UUID, error: str) -> None:
+        ...
+
+    def release(self, message_id: UUID, error: str, available_at: datetime) -> None:
+        """Return a leased message untouched, without counting the attempt."""
+        ...
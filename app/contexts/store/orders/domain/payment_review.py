@@ -0,0 +1,30 @@
+"""Payments that need a refund or a manual decision."""
+
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Literal
+from uuid import UUID
+
+from app.shared.domain.ids import new_id
+
+PaymentReviewReason = Literal["approved_for_closed_order"]
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+@dataclass(frozen=True, slots=True)
+class PaymentReview:
+    """Payment the provider settled on an order that can no longer follow it.
+
+    Typically an approval that arrives after the order expired and its stock was
+    released: the buyer was charged, so the payment must be refunded or the order
+    fulfilled by hand.
+    """
+
+    payment_id: UUID
+    order_id: UUID
+    reason: PaymentReviewReason
+    id: UUID = field(default_factory=new_id)
+    created_at: datetime = field(default_factory=_utc_now)
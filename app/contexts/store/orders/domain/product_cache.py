@@ -0,0 +1,12 @@
+"""Port through which order-side stock writes reach cached product reads."""
+
+from collections.abc import Collection
+from typing import Protocol
+from uuid import UUID
+
+
+class ProductCacheInvalidator(Protocol):
+    """Drops cached catalog and product entries whose stock an order write changed."""
+
+    def invalidate_products(self, product_ids: Collection[UUID]) -> None:
+        ...
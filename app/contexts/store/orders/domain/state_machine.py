@@ -0,0 +1,59 @@
+"""Order and payment state machines from the business rules transition table."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from uuid import UUID
+
+ORDER_TRANSITIONS: dict[str, frozenset[str]] = {
+    "pending_payment": frozenset({"paid", "cancelled", "expired"}),
+    "paid": frozenset({"ready_for_pickup", "cancelled"}),
+    "ready_for_pickup": frozenset({"picked_up", "cancelled"}),
+    "picked_up": frozenset(),
+    "cancelled": frozenset(),
+    "expired": frozenset(),
+}
+# Business rules: INITIATED is `created`; any other move is rejected.
+PAYMENT_TRANSITIONS: dict[str, frozenset[str]] = {
+    "created": frozenset({"pending", "approved", "rejected", "cancelled"}),
+    "pending": frozenset({"approved", "rejected", "cancelled"}),
+    "approved": frozenset({"refunded"}),
+    "rejected": frozenset(),
+    "cancelled": frozenset(),
+    "refunded": frozenset(),
+}
+
+
+class InvalidStatusTransitionError(ValueError):
+    """Raised when a move is not in the transition table."""
+
+
+@dataclass(frozen=True, slots=True)
+class StatusTransition:
+    """Move of one entity from the status it was read in (`expected`) to `target`.
+
+    Repositories persist it as a compare-and-set: it applies only while the
+    stored row is still in `expected`.
+    """
+
+    id: UUID
+    expected: str
+    target: str
+
+
+class StateMachine:
+    """Validates moves against one transition table."""
+
+    def __init__(self, transitions: Mapping[str, frozenset[str]]) -> None:
+        self._transitions = transitions
+
+    def can_transition(self, current: str, target: str) -> bool:
+        return target in self._transitions.get(current, frozenset())
+
+    def transition(self, entity_id: UUID, current: str, target: str) -> StatusTransition:
+        if not self.can_transition(current, target):
+            raise InvalidStatusTransitionError(f"cannot move from {current!r} to {target!r}")
+        return StatusTransition(id=entity_id, expected=current, target=target)
+
+
+ORDER_STATE_MACHINE = StateMachine(ORDER_TRANSITIONS)
+PAYMENT_STATE_MACHINE = StateMachine(PAYMENT_TRANSITIONS)
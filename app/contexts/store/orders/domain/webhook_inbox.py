@@ -0,0 +1,61 @@
+"""Inbox port for provider webhook notifications awaiting verification."""
+
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Literal, Protocol
+from uuid import UUID
+
+from app.shared.domain.ids import new_id
+
+WebhookEventStatus = Literal["pending", "processing", "processed", "failed"]
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+@dataclass(slots=True)
+class WebhookEvent:
+    """A provider notification reduced to what it points at; its payload is never trusted."""
+
+    topic: str
+    resource_id: str
+    status: WebhookEventStatus = "pending"
+    attempts: int = 0
+    available_at: datetime = field(default_factory=_utc_now)
+    last_error: str | None = None
+    id: UUID = field(default_factory=new_id)
+
+
+class WebhookInbox(Protocol):
+    """Port used to record notifications on receipt and to verify them in batches later."""
+
+    def record(self, topic: str, resource_id: str, received_at: datetime) -> bool:
+        """Store the event unless one for the same topic and resource is already queued.
+
+        Returns False for duplicates. An event that was already settled is queued
+        again, since the provider notifies every later change of the same resource.
+        """
+        ...
+
+    def claim_due(
+        self,
+        now: datetime,
+        limit: int,
+        lease_until: datetime,
+    ) -> list[WebhookEvent]:
+        """Lease up to `limit` due events; expired leases are handed out again."""
+        ...
+
+    def mark_processed(self, event_ids: list[UUID], processed_at: datetime) -> None:
+        ...
+
+    def mark_retry(self, event_id: UUID, error: str, available_at: datetime) -> None:
+        ...
+
+    def mark_failed(self, event_id: UUID, error: str) -> None:
+        ...
+
+    def release(self, event_id: UUID, error: str, available_at: datetime) -> None:
+        """Return a leased event untouched, without counting the attempt."""
+        ...
@@ -0,0 +1,194 @@
+"""Maintenance commands for the orders context.
+
+Usage: ``python -m app.contexts.store.orders.infrastructure.cli <command>``.
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from typing import BinaryIO
+
+from sqlalchemy.orm import Session
+
+from app.contexts.store.orders.application.export_order_lines import (
+    ORDER_LINE_EXPORT_COLUMNS,
+    ExportOrderLinesUseCase,
+)
+from app.contexts.store.orders.application.reconcile_payments import (
+    ReconcilePaymentsUseCase,
+    ReconciliationStats,
+)
+from app.contexts.store.orders.domain.order_repository import OrderListFilter
+from app.contexts.store.orders.infrastructure.mercadopago.mercadopago_gateway import (
+    close_shared_mercadopago_gateway,
+)
+from app.contexts.store.orders.infrastructure.mercadopago.payment_lookup import (
+    build_mercadopago_payment_lookup,
+)
+from app.contexts.store.orders.infrastructure.order_expiration_sweeper import (
+    build_order_expiration_sweeper,
+)
+from app.contexts.store.orders.infrastructure.payment_outbox_worker import (
+    build_payment_outbox_worker,
+)
+from app.contexts.store.orders.infrastructure.payment_webhook_worker import (
+    build_payment_webhook_worker,
+)
+from app.contexts.store.orders.infrastructure.sql_idempotency_store import SQLIdempotencyStore
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.shared.config.settings import Settings, get_settings
+from app.shared.infrastructure.db.session import SessionLocal
+from app.shared.infrastructure.http.streaming import iter_csv, iter_ndjson
+
+
+def purge_idempotency_keys(session: Session) -> int:
+    """Delete expired Idempotency-Key records and return how many were removed."""
+
+    return SQLIdempotencyStore(session).purge_expired(datetime.now(UTC))
+
+
+def export_order_lines(
+    session: Session,
+    output: BinaryIO,
+    output_format: str,
+    filters: OrderListFilter,
+    chunk_size: int,
+) -> None:
+    """Write every order line matching `filters` to `output`, one chunk at a time."""
+
+    chunks = ExportOrderLinesUseCase(SQLOrderRepository(session)).stream(filters, chunk_size)
+    encoded = (
+        iter_ndjson(chunks) if output_format == "ndjson" else iter_csv(chunks, ORDER_LINE_EXPORT_COLUMNS)
+    )
+    for block in encoded:
+        output.write(block)
+
+
+async def reconcile_payments(session: Session, settings: Settings, min_age: timedelta) -> ReconciliationStats:
+    """Settle unsettled payments older than `min_age` from Mercado Pago's records."""
+
+    lookup = build_mercadopago_payment_lookup(settings)
+    try:
+        return await ReconcilePaymentsUseCase(
+            SQLOrderRepository(session),
+            lookup,
+            concurrency=settings.payment_reconcile_concurrency,
+            page_size=settings.payment_reconcile_page_size,
+        ).execute(min_age)
+    finally:
+        await lookup.aclose()
+
+
+def format_reconciliation_stats(stats: ReconciliationStats) -> str:
+    updated = str(stats.updated)
+    if stats.updated_by_status:
+        by_status = ", ".join(f"{status}={count}" for status, count in sorted(stats.updated_by_status.items()))
+        updated = f"{updated} ({by_status})"
+    return (
+        f"reconciled {stats.scanned} payments in {stats.pages} pages, "
+        f"{stats.elapsed_seconds:.1f}s ({stats.payments_per_second:.1f}/s): "
+        f"updated {updated}, "
+        f"unchanged {stats.unchanged}, not found {stats.not_found}, "
+        f"mismatched {stats.mismatched}, errors {stats.errors}, orders paid {stats.orders_paid}, "
+        f"orders not payable {stats.orders_not_payable}"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="orders", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "purge-idempotency-keys",
+        help="delete expired Idempotency-Key records",
+    )
+    commands.add_parser(
+        "drain-payment-outbox",
+        help="create the pending Mercado Pago preferences and exit",
+    )
+    commands.add_parser(
+        "drain-payment-webhooks",
+        help="verify the queued Mercado Pago webhooks and exit",
+    )
+    commands.add_parser(
+        "expire-orders",
+        help="expire unpaid orders older than ORDER_EXPIRATION_SECONDS and release their stock",
+    )
+    reconcile = commands.add_parser(
+        "reconcile-payments",
+        help="re-check created/pending payments against Mercado Pago",
+    )
+    reconcile.add_argument(
+        "--min-age-seconds",
+        type=int,
+        help="skip payments younger than this; defaults to PAYMENT_RECONCILE_MIN_AGE_SECONDS",
+    )
+    export = commands.add_parser(
+        "export-order-lines",
+        help="stream order lines with their payment as CSV or NDJSON",
+    )
+    export.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+    export.add_argument("--output", help="file to write; defaults to stdout")
+    export.add_argument("--status")
+    export.add_argument("--from", dest="created_from", type=datetime.fromisoformat)
+    export.add_argument("--to", dest="created_to", type=datetime.fromisoformat)
+    export.add_argument("--customer-phone")
+    args = parser.parse_args(argv)
+
+    if args.command == "drain-payment-outbox":
+        worker = build_payment_outbox_worker(get_settings())
+        try:
+            processed = worker.drain()
+        finally:
+            worker.stop()
+            close_shared_mercadopago_gateway()
+        print(f"processed {processed} payment outbox messages")
+        return 0
+
+    if args.command == "drain-payment-webhooks":
+        webhook_worker = build_payment_webhook_worker(get_settings())
+        try:
+            processed = webhook_worker.drain()
+        finally:
+            webhook_worker.stop()
+            close_shared_mercadopago_gateway()
+        print(f"processed {processed} payment webhook events")
+        return 0
+
+    if args.command == "expire-orders":
+        result = build_order_expiration_sweeper(get_settings()).sweep()
+        print(f"expired {result.expired} orders in {result.batches} batches")
+        return 0
+
+    with SessionLocal() as session:
+        if args.command == "export-order-lines":
+            filters = OrderListFilter(
+                status=args.status,
+                created_from=args.created_from,
+                created_to=args.created_to,
+                customer_phone=args.customer_phone,
+            )
+            chunk_size = get_settings().order_export_chunk_size
+            if args.output is None:
+                export_order_lines(session, sys.stdout.buffer, args.format, filters, chunk_size)
+            else:
+                with open(args.output, "wb") as output:
+                    export_order_lines(session, output, args.format, filters, chunk_size)
+        elif args.command == "reconcile-payments":
+            settings = get_settings()
+            min_age_seconds = (
+                args.min_age_seconds
+                if args.min_age_seconds is not None
+                else settings.payment_reconcile_min_age_seconds
+            )
+            stats = asyncio.run(reconcile_payments(session, settings, timedelta(seconds=min_age_seconds)))
+            print(format_reconciliation_stats(stats))
+        elif args.command == "purge-idempotency-keys":
+            removed = purge_idempotency_keys(session)
+            print(f"purged {removed} expired idempotency keys")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
 """HTTP router for orders context."""
 
+import math
+from datetime import date, datetime
 from uuid import UUID
 from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 from sqlalchemy.orm import Session
 
@@ -12,19 +15,66 @@ from app.contexts.store.orders.application.create_order import (
     CreateOrderItemInput,
     CreateOrderResult,
     CreateOrderUseCase,
+    InsufficientStockError,
     InvalidOrderError,
     PaymentGatewayError,
+    PaymentProviderUnavailableError,
     ProductNotFoundError,
 )
-from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.application.get_order_payment import (
+    GetOrderPaymentUseCase,
+    OrderPaymentNotFoundError,
+)
+from app.contexts.store.orders.application.export_order_lines import (
+    ORDER_LINE_EXPORT_COLUMNS,
+    ExportOrderLinesUseCase,
+)
+from app.contexts.store.orders.application.get_sales_report import GetSalesReportUseCase
+from app.contexts.store.orders.application.list_orders import (
+    DEFAULT_ORDER_PAGE_SIZE,
+    MAX_ORDER_PAGE_SIZE,
+    ListOrdersUseCase,
+)
+from app.contexts.store.orders.application.idempotent_create_order import (
+    MAX_IDEMPOTENCY_KEY_LENGTH,
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyReusedError,
+    IdempotentCreateOrderUseCase,
+    InvalidIdempotencyKeyError,
+)
+from app.contexts.store.orders.domain.idempotency_store import IdempotencyStore, OrderReceipt
+from app.contexts.store.orders.domain.order import Order, OrderStatus
 from app.contexts.store.orders.domain.payment_gateway import PaymentGateway
-from app.contexts.store.orders.domain.order_repository import OrderRepository
-from app.contexts.store.orders.infrastructure.mercadopago.mercadopago_gateway import (
-    MercadoPagoGateway,
+from app.contexts.store.orders.domain.product_cache import ProductCacheInvalidator
+from app.contexts.store.orders.domain.order_repository import (
+    OrderCursor,
+    OrderListFilter,
+    OrderRepository,
+    OrderWithPayment,
 )
+from app.contexts.store.orders.infrastructure.mercadopago.circuit_breaking_gateway import (
+    get_guarded_mercadopago_gateway,
+    get_mercadopago_breaker,
+)
+from app.contexts.store.orders.infrastructure.sql_idempotency_store import SQLIdempotencyStore
 from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.contexts.store.products.infrastructure.cached_product_repository import (
+    get_product_cache_invalidation,
+)
 from app.shared.config.settings import Settings, get_settings
 from app.shared.infrastructure.db.session import get_db
+from app.shared.infrastructure.http.admin_auth import require_admin
+from app.shared.infrastructure.http.cursor import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+from app.shared.infrastructure.http.streaming import (
+    CSV_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    iter_csv,
+    iter_ndjson,
+)
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
@@ -64,18 +114,95 @@ class CreateOrderResponse(BaseModel):
     payment_url: str | None = None
 
 
-def get_order_repository(db: Session = Depends(get_db)) -> OrderRepository:
-    return SQLOrderRepository(db)
+class OrderPaymentResponse(BaseModel):
+    order_number: str
+    status: str
+    amount_cents: int
+    currency: str
+    payment_url: str | None = None
 
 
-def get_mercadopago_gateway(
-    settings: Settings = Depends(get_settings),
-) -> PaymentGateway:
-    return MercadoPagoGateway(
-        access_token=settings.mp_access_token,
-        webhook_url=settings.mp_webhook_url,
-        environment=settings.mp_environment,
-    )
+class OrderItemResponse(BaseModel):
+    product_id: UUID
+    product_name: str
+    quantity: int
+    unit_price_cents: int
+    line_total_cents: int
+
+
+class OrderPaymentSummaryResponse(BaseModel):
+    status: str
+    amount_cents: int
+    currency: str
+    external_payment_id: str | None = None
+
+
+class OrderDetailResponse(BaseModel):
+    id: UUID
+    order_number: str
+    customer_name: str
+    customer_phone: str
+    status: str
+    total_cents: int
+    created_at: datetime
+    items: list[OrderItemResponse]
+    payment: OrderPaymentSummaryResponse | None = None
+
+
+class OrderPageResponse(BaseModel):
+    items: list[OrderDetailResponse]
+    next_cursor: str | None = None
+
+
+class PaymentGatewayStatsResponse(BaseModel):
+    name: str
+    state: str
+    failure_rate: float
+    window_calls: int
+    in_flight: int
+    max_concurrent_calls: int
+    successful_calls: int
+    failed_calls: int
+    rejected_calls: int
+    times_opened: int
+    retry_after_seconds: float
+
+
+class DailyStatusTotalResponse(BaseModel):
+    day: date
+    status: str
+    order_count: int
+    total_cents: int
+
+
+class ProductSalesTotalResponse(BaseModel):
+    product_id: UUID
+    product_name: str
+    units: int
+    revenue_cents: int
+
+
+class SalesReportResponse(BaseModel):
+    from_day: date = Field(serialization_alias="from")
+    to_day: date = Field(serialization_alias="to")
+    statuses: list[str]
+    daily: list[DailyStatusTotalResponse]
+    products: list[ProductSalesTotalResponse]
+
+
+def get_order_repository(
+    db: Session = Depends(get_db),
+    product_cache: ProductCacheInvalidator = Depends(get_product_cache_invalidation),
+) -> OrderRepository:
+    return SQLOrderRepository(db, product_cache)
+
+
+def get_idempotency_store(db: Session = Depends(get_db)) -> IdempotencyStore:
+    return SQLIdempotencyStore(db)
+
+
+def get_mercadopago_gateway() -> PaymentGateway:
+    return get_guarded_mercadopago_gateway()
 
 
 def _to_response(result: CreateOrderResult) -> CreateOrderResponse:
@@ -88,31 +215,291 @@ def _to_response(result: CreateOrderResult) -> CreateOrderResponse:
     )
 
 
+def _to_order_detail_response(entry: OrderWithPayment) -> OrderDetailResponse:
+    order, payment = entry.order, entry.payment
+    return OrderDetailResponse(
+        id=order.id,
+        order_number=order.order_number,
+        customer_name=order.customer_name,
+        customer_phone=order.customer_phone,
+        status=order.status,
+        total_cents=order.total_cents,
+        created_at=order.created_at,
+        items=[
+            OrderItemResponse(
+                product_id=item.product_id,
+                product_name=item.product_name_snapshot,
+                quantity=item.quantity,
+                unit_price_cents=item.unit_price_cents_snapshot,
+                line_total_cents=item.line_total_cents,
+            )
+            for item in order.items
+        ],
+        payment=(
+            OrderPaymentSummaryResponse(
+                status=payment.status,
+                amount_cents=payment.amount_cents,
+                currency=payment.currency,
+                external_payment_id=payment.external_payment_id,
+            )
+            if payment is not None
+            else None
+        ),
+    )
+
+
+def _encode_order_cursor(cursor: OrderCursor) -> str:
+    return encode_cursor({"created_at": cursor.created_at.isoformat(), "id": str(cursor.id)})
+
+
+def _decode_order_cursor(token: str) -> OrderCursor:
+    values = decode_cursor(token)
+    try:
+        return OrderCursor(
+            created_at=datetime.fromisoformat(values["created_at"]),
+            id=UUID(values["id"]),
+        )
+    except (KeyError, ValueError) as exc:
+        raise InvalidCursorError("invalid cursor") from exc
+
+
+def _receipt_to_response(receipt: OrderReceipt) -> CreateOrderResponse:
+    return CreateOrderResponse(
+        order_number=receipt.order_number,
+        status=receipt.status,
+        total_cents=receipt.total_cents,
+        payment_url=receipt.payment_url,
+    )
+
+
 @router.post("", response_model=CreateOrderResponse, status_code=status.HTTP_201_CREATED)
 def create_order(
     payload: CreateOrderRequest,
+    response: Response,
+    idempotency_key: str | None = Header(
+        default=None,
+        alias="Idempotency-Key",
+        min_length=1,
+        max_length=MAX_IDEMPOTENCY_KEY_LENGTH,
+    ),
     repository: OrderRepository = Depends(get_order_repository),
+    idempotency_store: IdempotencyStore = Depends(get_idempotency_store),
     mp_gateway: PaymentGateway = Depends(get_mercadopago_gateway),
+    settings: Settings = Depends(get_settings),
 ) -> CreateOrderResponse:
-    use_case = CreateOrderUseCase(repository, payment_gateway=mp_gateway)
+    use_case = CreateOrderUseCase(
+        repository,
+        payment_gateway=mp_gateway,
+        defer_payment_preference=settings.payment_preference_mode == "outbox",
+    )
+    command = CreateOrderCommand(
+        customer_name=payload.customer_name,
+        customer_phone=payload.customer_phone,
+        items=[
+            CreateOrderItemInput(product_id=item.product_id, quantity=item.quantity)
+            for item in payload.items
+        ],
+        payment_method=payload.payment_method,
+    )
 
     try:
-        result = use_case.execute(
-            CreateOrderCommand(
-                customer_name=payload.customer_name,
-                customer_phone=payload.customer_phone,
-                items=[
-                    CreateOrderItemInput(product_id=item.product_id, quantity=item.quantity)
-                    for item in payload.items
-                ],
-                payment_method=payload.payment_method,
+        if idempotency_key is not None:
+            idempotent_use_case = IdempotentCreateOrderUseCase(
+                idempotency_store,
+                use_case,
+                ttl_seconds=settings.order_idempotency_ttl_seconds,
+                lease_seconds=settings.order_idempotency_lease_seconds,
             )
-        )
+            idempotent_result = idempotent_use_case.execute(idempotency_key, command)
+            if idempotent_result.replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            return _receipt_to_response(idempotent_result.receipt)
+
+        result = use_case.execute(command)
+    except InvalidIdempotencyKeyError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except IdempotencyKeyInProgressError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    except IdempotencyKeyReusedError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
     except ProductNotFoundError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except InsufficientStockError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
     except InvalidOrderError as exc:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    except PaymentProviderUnavailableError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": str(max(math.ceil(exc.retry_after_seconds), 1))},
+        ) from exc
     except PaymentGatewayError as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
 
     return _to_response(result)
+
+
+@router.get("", response_model=OrderPageResponse, dependencies=[Depends(require_admin)])
+def list_orders(
+    order_status: OrderStatus | None = Query(default=None, alias="status"),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None),
+    customer_phone: str | None = Query(default=None, max_length=40),
+    limit: int = Query(default=DEFAULT_ORDER_PAGE_SIZE, ge=1, le=MAX_ORDER_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    repository: OrderRepository = Depends(get_order_repository),
+) -> OrderPageResponse:
+    use_case = ListOrdersUseCase(repository)
+
+    try:
+        after = _decode_order_cursor(cursor) if cursor is not None else None
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    try:
+        page = use_case.execute(
+            OrderListFilter(
+                status=order_status,
+                created_from=created_from,
+                created_to=created_to,
+                customer_phone=customer_phone,
+            ),
+            limit=limit,
+            after=after,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
+    return OrderPageResponse(
+        items=[_to_order_detail_response(entry) for entry in page.items],
+        next_cursor=_encode_order_cursor(page.next_cursor) if page.next_cursor else None,
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(require_admin)],
+    responses={
+        status.HTTP_200_OK: {
+            "content": {CSV_MEDIA_TYPE: {}, NDJSON_MEDIA_TYPE: {}},
+            "description": "Order lines with their payment streamed as CSV or NDJSON",
+        }
+    },
+)
+def export_orders(
+    output_format: Literal["csv", "ndjson"] = Query(default="csv", alias="format"),
+    order_status: OrderStatus | None = Query(default=None, alias="status"),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None),
+    customer_phone: str | None = Query(default=None, max_length=40),
+    repository: OrderRepository = Depends(get_order_repository),
+    settings: Settings = Depends(get_settings),
+) -> StreamingResponse:
+    use_case = ExportOrderLinesUseCase(repository)
+    try:
+        chunks = use_case.stream(
+            OrderListFilter(
+                status=order_status,
+                created_from=created_from,
+                created_to=created_to,
+                customer_phone=customer_phone,
+            ),
+            chunk_size=settings.order_export_chunk_size,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
+    # Sync iterators are consumed in the threadpool, so the event loop stays free.
+    if output_format == "ndjson":
+        return StreamingResponse(iter_ndjson(chunks), media_type=NDJSON_MEDIA_TYPE)
+    return StreamingResponse(
+        iter_csv(chunks, ORDER_LINE_EXPORT_COLUMNS),
+        media_type=CSV_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="order-lines.csv"'},
+    )
+
+
+@router.get(
+    "/reports/sales",
+    response_model=SalesReportResponse,
+    response_model_by_alias=True,
+    dependencies=[Depends(require_admin)],
+)
+def get_sales_report(
+    from_day: date = Query(alias="from"),
+    to_day: date = Query(alias="to"),
+    order_statuses: list[OrderStatus] | None = Query(default=None, alias="status"),
+    repository: OrderRepository = Depends(get_order_repository),
+) -> SalesReportResponse:
+    try:
+        report = GetSalesReportUseCase(repository).execute(from_day, to_day, order_statuses)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
+    return SalesReportResponse(
+        from_day=report.from_day,
+        to_day=report.to_day,
+        statuses=list(report.statuses),
+        daily=[
+            DailyStatusTotalResponse(
+                day=total.day,
+                status=total.status,
+                order_count=total.order_count,
+                total_cents=total.total_cents,
+            )
+            for total in report.daily
+        ],
+        products=[
+            ProductSalesTotalResponse(
+                product_id=total.product_id,
+                product_name=total.product_name,
+                units=total.units,
+                revenue_cents=total.revenue_cents,
+            )
+            for total in report.products
+        ],
+    )
+
+
+@router.get(
+    "/payment-gateway/stats",
+    response_model=PaymentGatewayStatsResponse,
+    dependencies=[Depends(require_admin)],
+)
+def get_payment_gateway_stats() -> PaymentGatewayStatsResponse:
+    stats = get_mercadopago_breaker().stats()
+    return PaymentGatewayStatsResponse(
+        name=stats.name,
+        state=stats.state,
+        failure_rate=stats.failure_rate,
+        window_calls=stats.window_calls,
+        in_flight=stats.in_flight,
+        max_concurrent_calls=stats.max_concurrent_calls,
+        successful_calls=stats.successful_calls,
+        failed_calls=stats.failed_calls,
+        rejected_calls=stats.rejected_calls,
+        times_opened=stats.times_opened,
+        retry_after_seconds=stats.retry_after_seconds,
+    )
+
+
+@router.get("/{order_number}/payment", response_model=OrderPaymentResponse)
+def get_order_payment(
+    order_number: str,
+    repository: OrderRepository = Depends(get_order_repository),
+) -> OrderPaymentResponse:
+    use_case = GetOrderPaymentUseCase(repository)
+    try:
+        payment = use_case.execute(order_number)
+    except OrderPaymentNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+    return OrderPaymentResponse(
+        order_number=order_number,
+        status=payment.status,
+        amount_cents=payment.amount_cents,
+        currency=payment.currency,
+        payment_url=payment.init_point,
+    )
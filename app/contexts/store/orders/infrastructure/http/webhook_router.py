@@ -0,0 +1,62 @@
+"""HTTP adapter receiving payment provider webhooks."""
+
+from typing import Literal
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.contexts.store.orders.application.receive_payment_webhook import (
+    InvalidWebhookError,
+    ReceivePaymentWebhookUseCase,
+)
+from app.contexts.store.orders.domain.webhook_inbox import WebhookInbox
+from app.contexts.store.orders.infrastructure.sql_webhook_inbox import SQLWebhookInbox
+from app.shared.infrastructure.db.session import get_db
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+
+
+class MercadoPagoNotificationData(BaseModel):
+    id: str | int | None = None
+
+
+class MercadoPagoNotification(BaseModel):
+    """Webhook body; only what identifies the resource is read, the rest is not trusted."""
+
+    type: str | None = None
+    topic: str | None = None
+    action: str | None = None
+    data: MercadoPagoNotificationData | None = None
+
+
+class WebhookAckResponse(BaseModel):
+    status: Literal["recorded", "duplicate", "ignored"]
+
+
+def get_webhook_inbox(db: Session = Depends(get_db)) -> WebhookInbox:
+    return SQLWebhookInbox(db)
+
+
+@router.post("/mercadopago", response_model=WebhookAckResponse)
+def receive_mercadopago_webhook(
+    notification: MercadoPagoNotification | None = Body(default=None),
+    query_type: str | None = Query(default=None, alias="type"),
+    query_topic: str | None = Query(default=None, alias="topic"),
+    query_data_id: str | None = Query(default=None, alias="data.id"),
+    query_id: str | None = Query(default=None, alias="id"),
+    inbox: WebhookInbox = Depends(get_webhook_inbox),
+) -> WebhookAckResponse:
+    # Webhooks send `type` + `data.id`; legacy IPN sends `topic` + `id`, query string only.
+    body = notification or MercadoPagoNotification()
+    body_data_id = body.data.id if body.data is not None else None
+    topic = body.type or body.topic or query_type or query_topic
+    resource_id = str(body_data_id) if body_data_id is not None else query_data_id or query_id
+
+    use_case = ReceivePaymentWebhookUseCase(inbox)
+    try:
+        receipt = use_case.execute(topic, resource_id)
+    except InvalidWebhookError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    return WebhookAckResponse(status=receipt)
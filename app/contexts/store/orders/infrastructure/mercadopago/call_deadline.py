@@ -0,0 +1,55 @@
+"""Overall wall-clock deadline for one synchronous provider call."""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+
+DEFAULT_CALL_DEADLINE_SECONDS = 10.0
+_TIMEOUT_PHASES = ("connect", "read", "write", "pool")
+# Floor for the per-operation timeout once the budget is spent: the next socket
+# operation then times out at once instead of blocking.
+_EXHAUSTED_TIMEOUT_SECONDS = 0.001
+
+
+class CallDeadlineExceededError(httpx.TimeoutException):
+    """Raised when a provider call runs past its overall deadline."""
+
+
+class CallDeadline:
+    """Budget for one request across pool wait, connect, TLS, write and read.
+
+    httpx timeouts bound every socket operation on its own, so a provider that
+    trickles bytes can stretch a call far past them. httpcore reads the
+    `timeout` extension before each operation: this one is shrunk to the time
+    left on every trace event and between body chunks, so no operation can
+    outlive the deadline.
+    """
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        if seconds <= 0:
+            raise ValueError("seconds must be greater than zero")
+        self._seconds = seconds
+        self._clock = clock
+        self._expires_at = clock() + seconds
+        self._timeouts: dict[str, float] = dict.fromkeys(_TIMEOUT_PHASES, seconds)
+
+    def extensions(self) -> dict[str, Any]:
+        return {"timeout": self._timeouts, "trace": self._on_trace}
+
+    def check(self) -> None:
+        """Raise once the budget is spent; otherwise cap the next operations to what is left."""
+
+        remaining = self._expires_at - self._clock()
+        if remaining <= 0:
+            raise CallDeadlineExceededError(f"provider call exceeded its {self._seconds:g}s deadline")
+        self._shrink(remaining)
+
+    def _on_trace(self, event_name: str, info: dict[str, Any]) -> None:
+        # Raising inside httpcore's trace hooks could mask the real error, so only shrink here.
+        self._shrink(max(self._expires_at - self._clock(), _EXHAUSTED_TIMEOUT_SECONDS))
+
+    def _shrink(self, remaining: float) -> None:
+        for phase in _TIMEOUT_PHASES:
+            self._timeouts[phase] = remaining
@@ -0,0 +1,61 @@
+"""PaymentGateway decorator that guards provider calls with a circuit breaker."""
+
+from functools import lru_cache
+
+from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.payment_gateway import (
+    PaymentGateway,
+    PaymentGatewayUnavailableError,
+    PaymentProviderResponse,
+    ProviderPayment,
+)
+from app.contexts.store.orders.infrastructure.mercadopago.mercadopago_gateway import (
+    get_shared_mercadopago_gateway,
+    is_provider_failure,
+)
+from app.shared.config.settings import get_settings
+from app.shared.infrastructure.resilience.circuit_breaker import CallRejectedError, CircuitBreaker
+
+
+@lru_cache(maxsize=1)
+def get_mercadopago_breaker() -> CircuitBreaker:
+    """Return the process-wide breaker shared by every Mercado Pago call."""
+
+    settings = get_settings()
+    return CircuitBreaker(
+        "mercadopago",
+        failure_rate_threshold=settings.mp_breaker_failure_rate,
+        window_size=settings.mp_breaker_window_size,
+        minimum_calls=min(settings.mp_breaker_minimum_calls, settings.mp_breaker_window_size),
+        open_seconds=settings.mp_breaker_open_seconds,
+        half_open_max_calls=settings.mp_breaker_half_open_calls,
+        max_concurrent_calls=settings.mp_max_concurrent_calls,
+        slow_call_seconds=settings.mp_slow_call_seconds,
+        record_failure=is_provider_failure,
+    )
+
+
+class CircuitBreakingPaymentGateway(PaymentGateway):
+    """Fails fast with PaymentGatewayUnavailableError instead of waiting on a degraded provider."""
+
+    def __init__(self, inner: PaymentGateway, breaker: CircuitBreaker) -> None:
+        self._inner = inner
+        self._breaker = breaker
+
+    def create_preference(self, order: Order) -> PaymentProviderResponse:
+        try:
+            return self._breaker.call(lambda: self._inner.create_preference(order))
+        except CallRejectedError as exc:
+            raise PaymentGatewayUnavailableError(str(exc), exc.retry_after_seconds) from exc
+
+    def get_payment(self, provider_payment_id: str) -> ProviderPayment:
+        try:
+            return self._breaker.call(lambda: self._inner.get_payment(provider_payment_id))
+        except CallRejectedError as exc:
+            raise PaymentGatewayUnavailableError(str(exc), exc.retry_after_seconds) from exc
+
+
+def get_guarded_mercadopago_gateway() -> PaymentGateway:
+    """Shared pooled gateway behind the shared breaker, as used by requests and workers."""
+
+    return CircuitBreakingPaymentGateway(get_shared_mercadopago_gateway(), get_mercadopago_breaker())
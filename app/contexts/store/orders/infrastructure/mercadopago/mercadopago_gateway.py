@@ -1,16 +1,35 @@
 """Mercado Pago Checkout Pro adapter."""
 
+import json
+from functools import lru_cache
+from typing import Any
+
 import httpx
 
 from app.contexts.store.orders.domain.order import Order
 from app.contexts.store.orders.domain.payment_gateway import (
     PaymentGateway,
     PaymentProviderResponse,
+    ProviderPayment,
+)
+from app.contexts.store.orders.infrastructure.mercadopago.call_deadline import (
+    DEFAULT_CALL_DEADLINE_SECONDS,
+    CallDeadline,
 )
+from app.shared.config.settings import get_settings
+
+DEFAULT_TIMEOUT_SECONDS = 15.0
 
 
 class MercadoPagoGateway(PaymentGateway):
-    """Sync adapter for Mercado Pago preferences API."""
+    """Sync adapter for Mercado Pago preferences API.
+
+    The gateway owns one pooled `httpx.Client`, so consecutive preferences reuse
+    warm keep-alive connections instead of paying DNS + TCP + TLS on every call.
+    It is meant to live as long as the application and be closed on shutdown.
+    Each call runs under a `CallDeadline`, so a slow but steady provider cannot
+    hold a request longer than `call_deadline_seconds` in total.
+    """
 
     def __init__(
         self,
@@ -18,11 +37,18 @@ class MercadoPagoGateway(PaymentGateway):
         webhook_url: str | None = None,
         environment: str = "sandbox",
         base_url: str = "https://api.mercadopago.com",
+        client: httpx.Client | None = None,
+        call_deadline_seconds: float = DEFAULT_CALL_DEADLINE_SECONDS,
     ) -> None:
         self._access_token = access_token
         self._webhook_url = webhook_url
         self._environment = environment
         self._base_url = base_url.rstrip("/")
+        self._client = client if client is not None else httpx.Client(timeout=DEFAULT_TIMEOUT_SECONDS)
+        self._call_deadline_seconds = call_deadline_seconds
+
+    def close(self) -> None:
+        self._client.close()
 
     def create_preference(self, order: Order) -> PaymentProviderResponse:
         if not self._access_token:
@@ -51,15 +77,12 @@ class MercadoPagoGateway(PaymentGateway):
             "Content-Type": "application/json",
         }
 
-        with httpx.Client(timeout=15.0) as client:
-            response = client.post(
-                f"{self._base_url}/checkout/preferences",
-                headers=headers,
-                json=payload,
-            )
-        response.raise_for_status()
-
-        data = response.json()
+        data = self._request_json(
+            "POST",
+            f"{self._base_url}/checkout/preferences",
+            headers=headers,
+            json=payload,
+        )
         provider_payment_id = str(data.get("id", ""))
         init_point = str(data.get("init_point", ""))
         sandbox_init_point_raw = data.get("sandbox_init_point")
@@ -73,3 +96,111 @@ class MercadoPagoGateway(PaymentGateway):
             init_point=init_point,
             sandbox_init_point=sandbox_init_point,
         )
+
+    def get_payment(self, provider_payment_id: str) -> ProviderPayment:
+        if not self._access_token:
+            raise ValueError("MP_ACCESS_TOKEN is required for Mercado Pago payments")
+
+        data = self._request_json(
+            "GET",
+            f"{self._base_url}/v1/payments/{provider_payment_id}",
+            headers={"Authorization": f"Bearer {self._access_token}"},
+        )
+        return parse_provider_payment(data)
+
+    def _request_json(self, method: str, url: str, **kwargs: Any) -> Any:
+        """Send a request and read its JSON body, all within the call deadline."""
+
+        deadline = CallDeadline(self._call_deadline_seconds)
+        request = self._client.build_request(method, url, extensions=deadline.extensions(), **kwargs)
+        response = self._client.send(request, stream=True)
+        try:
+            deadline.check()
+            response.raise_for_status()
+            body = bytearray()
+            for chunk in response.iter_bytes():
+                deadline.check()
+                body += chunk
+        finally:
+            response.close()
+        return json.loads(body)
+
+
+def is_provider_failure(exc: BaseException) -> bool:
+    """True for errors that mean the provider is degraded, as counted by the circuit breaker.
+
+    Transport errors, timeouts, 5xx and 429 qualify. A 4xx answer, a missing
+    access token or an unexpected body are faults of the request, not the provider.
+    """
+
+    if isinstance(exc, httpx.HTTPStatusError):
+        status_code = exc.response.status_code
+        return status_code >= 500 or status_code == httpx.codes.TOO_MANY_REQUESTS
+    return isinstance(exc, httpx.TransportError | TimeoutError)
+
+
+def parse_provider_payment(data: dict[str, object]) -> ProviderPayment:
+    """Map a Mercado Pago `/v1/payments/{id}` body to the fields used for verification."""
+
+    payment_id = data.get("id")
+    status = data.get("status")
+    amount = data.get("transaction_amount")
+    if payment_id is None or not status or not isinstance(amount, int | float):
+        raise ValueError("Mercado Pago payment response is missing required fields")
+
+    external_reference = data.get("external_reference")
+    return ProviderPayment(
+        provider_payment_id=str(payment_id),
+        status=str(status),
+        external_reference=str(external_reference) if external_reference else None,
+        amount_cents=round(amount * 100),
+        currency=str(data.get("currency_id") or "MXN"),
+    )
+
+
+def build_mercadopago_http_client(
+    max_connections: int = 20,
+    max_keepalive_connections: int = 10,
+    keepalive_expiry_seconds: float = 30.0,
+    http2: bool = False,
+    timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+) -> httpx.Client:
+    """Pooled client for the provider API; `http2=True` needs the `httpx[http2]` extra."""
+
+    return httpx.Client(
+        timeout=timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds,
+        ),
+        http2=http2,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_shared_mercadopago_gateway() -> MercadoPagoGateway:
+    """Return the process-wide gateway and its connection pool, built from settings."""
+
+    settings = get_settings()
+    return MercadoPagoGateway(
+        access_token=settings.mp_access_token,
+        webhook_url=settings.mp_webhook_url,
+        environment=settings.mp_environment,
+        client=build_mercadopago_http_client(
+            max_connections=settings.mp_http_max_connections,
+            max_keepalive_connections=settings.mp_http_max_keepalive_connections,
+            keepalive_expiry_seconds=settings.mp_http_keepalive_expiry_seconds,
+            http2=settings.mp_http2,
+            timeout_seconds=settings.mp_http_timeout_seconds,
+        ),
+        call_deadline_seconds=settings.mp_call_deadline_seconds,
+    )
+
+
+def close_shared_mercadopago_gateway() -> None:
+    """Close the pooled connections of the shared gateway, if it was ever created."""
+
+    if get_shared_mercadopago_gateway.cache_info().currsize:
+        get_shared_mercadopago_gateway().close()
+    get_shared_mercadopago_gateway.cache_clear()
@@ -0,0 +1,100 @@
+"""Async Mercado Pago payment search used by batch jobs."""
+
+import asyncio
+
+import httpx
+
+from app.contexts.store.orders.domain.payment_gateway import PaymentLookup, ProviderPayment
+from app.contexts.store.orders.infrastructure.mercadopago.call_deadline import (
+    DEFAULT_CALL_DEADLINE_SECONDS,
+    CallDeadlineExceededError,
+)
+from app.contexts.store.orders.infrastructure.mercadopago.mercadopago_gateway import (
+    DEFAULT_TIMEOUT_SECONDS,
+    parse_provider_payment,
+)
+from app.shared.config.settings import Settings
+
+# Statuses meaning money moved; such a payment describes the order better than a newer attempt.
+_SETTLED_PROVIDER_STATUSES = frozenset({"approved", "refunded", "charged_back"})
+
+
+def pick_order_payment(payments: list[ProviderPayment]) -> ProviderPayment | None:
+    """Choose the payment that describes an order among its attempts, newest first."""
+
+    for payment in payments:
+        if payment.status in _SETTLED_PROVIDER_STATUSES:
+            return payment
+    return payments[0] if payments else None
+
+
+class MercadoPagoPaymentLookup(PaymentLookup):
+    """Finds the payment behind an order through `/v1/payments/search`.
+
+    The lookup owns one pooled `httpx.AsyncClient`; callers bound concurrency,
+    so the pool is sized to match it. Each search is cancelled once it runs
+    past `call_deadline_seconds` in total. Close it with `aclose()` on the
+    event loop that used it.
+    """
+
+    def __init__(
+        self,
+        access_token: str | None,
+        base_url: str = "https://api.mercadopago.com",
+        client: httpx.AsyncClient | None = None,
+        call_deadline_seconds: float = DEFAULT_CALL_DEADLINE_SECONDS,
+    ) -> None:
+        self._access_token = access_token
+        self._base_url = base_url.rstrip("/")
+        self._client = (
+            client if client is not None else httpx.AsyncClient(timeout=DEFAULT_TIMEOUT_SECONDS)
+        )
+        self._call_deadline_seconds = call_deadline_seconds
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def find_by_external_reference(self, external_reference: str) -> ProviderPayment | None:
+        if not self._access_token:
+            raise ValueError("MP_ACCESS_TOKEN is required for Mercado Pago payments")
+
+        try:
+            async with asyncio.timeout(self._call_deadline_seconds):
+                response = await self._client.get(
+                    f"{self._base_url}/v1/payments/search",
+                    params={
+                        "external_reference": external_reference,
+                        "sort": "date_created",
+                        "criteria": "desc",
+                    },
+                    headers={"Authorization": f"Bearer {self._access_token}"},
+                )
+        except TimeoutError as exc:
+            raise CallDeadlineExceededError(
+                f"payment search exceeded its {self._call_deadline_seconds:g}s deadline"
+            ) from exc
+        response.raise_for_status()
+        results = response.json().get("results") or []
+        return pick_order_payment([parse_provider_payment(result) for result in results])
+
+
+def build_mercadopago_payment_lookup(
+    settings: Settings,
+    base_url: str = "https://api.mercadopago.com",
+) -> MercadoPagoPaymentLookup:
+    """Lookup with a connection pool as large as the reconciliation concurrency."""
+
+    concurrency = settings.payment_reconcile_concurrency
+    return MercadoPagoPaymentLookup(
+        access_token=settings.mp_access_token,
+        base_url=base_url,
+        client=httpx.AsyncClient(
+            timeout=settings.mp_http_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=concurrency,
+                max_keepalive_connections=concurrency,
+                keepalive_expiry=settings.mp_http_keepalive_expiry_seconds,
+            ),
+        ),
+        call_deadline_seconds=settings.mp_call_deadline_seconds,
+    )
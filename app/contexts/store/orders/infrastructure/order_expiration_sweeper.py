@@ -0,0 +1,91 @@
+"""Background task expiring unpaid orders on a fixed interval."""
+
+import logging
+import threading
+from collections.abc import Callable
+from datetime import timedelta
+
+from sqlalchemy.orm import Session
+
+from app.contexts.store.orders.application.expire_orders import (
+    ExpireOrdersUseCase,
+    OrderExpirationResult,
+)
+from app.contexts.store.orders.domain.product_cache import ProductCacheInvalidator
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.contexts.store.products.infrastructure.cached_product_repository import (
+    get_product_cache_invalidation,
+)
+from app.shared.config.settings import Settings
+from app.shared.infrastructure.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class OrderExpirationSweeper:
+    """Runs `ExpireOrdersUseCase` every `interval_seconds` on a daemon thread.
+
+    Several app processes may sweep at once: each batch only takes rows that
+    are still `pending_payment` and, on Postgres, not locked by someone else.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_age: timedelta,
+        batch_size: int = 500,
+        interval_seconds: float = 300.0,
+        product_cache: ProductCacheInvalidator | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._product_cache = product_cache
+        self._max_age = max_age
+        self._batch_size = batch_size
+        self._interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def sweep(self) -> OrderExpirationResult:
+        """Expire every stale order now; used by the CLI and tests."""
+
+        with self._session_factory() as session:
+            result = ExpireOrdersUseCase(
+                SQLOrderRepository(session, self._product_cache),
+                batch_size=self._batch_size,
+            ).execute(self._max_age)
+        if result.expired:
+            logger.info("expired %s unpaid orders in %s batches", result.expired, result.batches)
+        return result
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="order-expiration-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("order expiration sweep failed")
+            self._stop.wait(self._interval_seconds)
+
+
+def build_order_expiration_sweeper(settings: Settings) -> OrderExpirationSweeper:
+    """Wire the sweeper with the application session factory."""
+
+    return OrderExpirationSweeper(
+        SessionLocal,
+        max_age=timedelta(seconds=settings.order_expiration_seconds),
+        batch_size=settings.order_expiration_batch_size,
+        interval_seconds=settings.order_expiration_sweep_interval_seconds,
+        product_cache=get_product_cache_invalidation(),
+    )
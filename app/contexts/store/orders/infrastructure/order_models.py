@@ -1,19 +1,40 @@
 """SQLAlchemy persistence models for orders context."""
 
-from datetime import datetime
+from datetime import date, datetime
+from uuid import UUID
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.shared.infrastructure.db.base import Base
+from app.shared.infrastructure.db.types import GUID
 
 
 class OrderModel(Base):
     """Order ORM model."""
 
     __tablename__ = "orders"
+    __table_args__ = (
+        # Admin listing: keyset on (created_at, id), optionally narrowed by status or phone.
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        Index("ix_orders_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_orders_customer_phone_created_at_id", "customer_phone", "created_at", "id"),
+    )
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    id: Mapped[UUID] = mapped_column(GUID(), primary_key=True)
     order_number: Mapped[str] = mapped_column(String(40), nullable=False, unique=True)
     customer_name: Mapped[str] = mapped_column(String(255), nullable=False)
     customer_phone: Mapped[str] = mapped_column(String(40), nullable=False)
@@ -30,14 +51,15 @@ class OrderItemModel(Base):
     """Order item ORM model with product snapshots."""
 
     __tablename__ = "order_items"
+    __table_args__ = (Index("ix_order_items_order_id", "order_id"),)
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    order_id: Mapped[str] = mapped_column(
-        String(36),
+    id: Mapped[UUID] = mapped_column(GUID(), primary_key=True)
+    order_id: Mapped[UUID] = mapped_column(
+        GUID(),
         ForeignKey("orders.id", ondelete="CASCADE"),
         nullable=False,
     )
-    product_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    product_id: Mapped[UUID] = mapped_column(GUID(), nullable=False)
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
     product_name_snapshot: Mapped[str] = mapped_column(String(255), nullable=False)
     unit_price_cents_snapshot: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -53,10 +75,15 @@ class PaymentModel(Base):
     """Base payment ORM model."""
 
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_order_id", "order_id"),
+        # Reconciliation scans unsettled payments by age.
+        Index("ix_payments_status_created_at_id", "status", "created_at", "id"),
+    )
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    order_id: Mapped[str] = mapped_column(
-        String(36),
+    id: Mapped[UUID] = mapped_column(GUID(), primary_key=True)
+    order_id: Mapped[UUID] = mapped_column(
+        GUID(),
         ForeignKey("orders.id", ondelete="CASCADE"),
         nullable=False,
     )
@@ -71,3 +98,120 @@ class PaymentModel(Base):
         nullable=False,
         server_default=func.now(),
     )
+
+
+class OrderIdempotencyKeyModel(Base):
+    """Idempotency-Key claims for order creation and the response they produced."""
+
+    __tablename__ = "order_idempotency_keys"
+    __table_args__ = (Index("ix_order_idempotency_keys_expires_at", "expires_at"),)
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    request_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    response: Mapped[dict[str, object] | None] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Only in-progress claims hold a lease; past it, the claim is reclaimable unless
+    # it already recorded its order.
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    claim_token: Mapped[UUID | None] = mapped_column(GUID(), nullable=True)
+    order_id: Mapped[UUID | None] = mapped_column(GUID(), nullable=True)
+
+
+class PaymentOutboxModel(Base):
+    """Pending payment preference requests, written in the order transaction."""
+
+    __tablename__ = "payment_outbox"
+    __table_args__ = (Index("ix_payment_outbox_status_available_at", "status", "available_at"),)
+
+    id: Mapped[UUID] = mapped_column(GUID(), primary_key=True)
+    order_id: Mapped[UUID] = mapped_column(
+        GUID(),
+        ForeignKey("orders.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    payment_id: Mapped[UUID] = mapped_column(GUID(), nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+class PaymentWebhookEventModel(Base):
+    """Provider notifications awaiting verification, one row per topic and resource."""
+
+    __tablename__ = "payment_webhook_events"
+    __table_args__ = (
+        UniqueConstraint("topic", "resource_id", name="uq_payment_webhook_events_topic_resource_id"),
+        Index("ix_payment_webhook_events_status_available_at", "status", "available_at"),
+    )
+
+    id: Mapped[UUID] = mapped_column(GUID(), primary_key=True)
+    topic: Mapped[str] = mapped_column(String(32), nullable=False)
+    resource_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    received_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+class PaymentReviewModel(Base):
+    """Payments settled by the provider that their order could not follow."""
+
+    __tablename__ = "payment_reviews"
+    __table_args__ = (Index("ix_payment_reviews_created_at", "created_at"),)
+
+    id: Mapped[UUID] = mapped_column(GUID(), primary_key=True)
+    payment_id: Mapped[UUID] = mapped_column(
+        GUID(),
+        ForeignKey("payments.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    order_id: Mapped[UUID] = mapped_column(
+        GUID(),
+        ForeignKey("orders.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    reason: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class DailyOrderStatusRollupModel(Base):
+    """Orders created on a UTC day, by their current status; kept by the repository writes.
+
+    Each (day, status) is split over counter shards that readers sum.
+    """
+
+    __tablename__ = "sales_daily_status_rollups"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=0)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class DailyProductSalesRollupModel(Base):
+    """Units and revenue per product for orders created on a UTC day, by order status."""
+
+    __tablename__ = "sales_daily_product_rollups"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    product_id: Mapped[UUID] = mapped_column(GUID(), primary_key=True)
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=0)
+    product_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,177 @@
+"""Background worker draining the payment outbox into Mercado Pago preferences."""
+
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.contexts.store.orders.application.create_payment_preference import (
+    CreatePaymentPreferenceUseCase,
+)
+from app.contexts.store.orders.domain.payment_gateway import (
+    PaymentGateway,
+    PaymentGatewayUnavailableError,
+)
+from app.contexts.store.orders.domain.payment_outbox import PaymentOutboxMessage
+from app.contexts.store.orders.infrastructure.mercadopago.circuit_breaking_gateway import (
+    get_guarded_mercadopago_gateway,
+)
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.contexts.store.orders.infrastructure.sql_payment_outbox import SQLPaymentOutbox
+from app.shared.config.settings import Settings
+from app.shared.infrastructure.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 5.0
+RETRY_MAX_SECONDS = 300.0
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the given number of failed attempts."""
+
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), RETRY_MAX_SECONDS))
+
+
+class PaymentOutboxWorker:
+    """Leases due outbox messages in batches and processes them on a bounded thread pool.
+
+    Each message gets its own session; a failure is retried with backoff until
+    `max_attempts`, after which the message is parked as `failed`.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        payment_gateway: PaymentGateway,
+        concurrency: int = 4,
+        batch_size: int = 20,
+        max_attempts: int = 5,
+        poll_interval_seconds: float = 1.0,
+        lease_seconds: float = 60.0,
+        clock: Callable[[], datetime] = _utc_now,
+    ) -> None:
+        if concurrency <= 0:
+            raise ValueError("concurrency must be greater than zero")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than zero")
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be greater than zero")
+        self._session_factory = session_factory
+        self._payment_gateway = payment_gateway
+        self._concurrency = concurrency
+        self._batch_size = batch_size
+        self._max_attempts = max_attempts
+        self._poll_interval_seconds = poll_interval_seconds
+        self._lease = timedelta(seconds=lease_seconds)
+        self._clock = clock
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    def drain_once(self) -> int:
+        """Process one batch of due messages and return how many were leased."""
+
+        now = self._clock()
+        with self._session_factory() as session:
+            messages = SQLPaymentOutbox(session).claim_due(
+                now,
+                limit=self._batch_size,
+                lease_until=now + self._lease,
+            )
+        if not messages:
+            return 0
+
+        executor = self._get_executor()
+        list(executor.map(self._process, messages))
+        return len(messages)
+
+    def drain(self) -> int:
+        """Process batches until no message is due; used by the CLI and tests."""
+
+        total = 0
+        while processed := self.drain_once():
+            total += processed
+        return total
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="payment-outbox-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.drain_once()
+            except Exception:
+                logger.exception("payment outbox drain failed")
+                processed = 0
+            if processed == 0:
+                self._stop.wait(self._poll_interval_seconds)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._concurrency,
+                thread_name_prefix="payment-outbox",
+            )
+        return self._executor
+
+    def _process(self, message: PaymentOutboxMessage) -> None:
+        try:
+            with self._session_factory() as session:
+                CreatePaymentPreferenceUseCase(
+                    SQLOrderRepository(session),
+                    payment_gateway=self._payment_gateway,
+                ).execute(message.order_id)
+        except PaymentGatewayUnavailableError as exc:
+            # The provider was never contacted: wait for the breaker without spending attempts.
+            retry_at = self._clock() + timedelta(seconds=max(exc.retry_after_seconds, 1.0))
+            with self._session_factory() as session:
+                outbox = SQLPaymentOutbox(session)
+                outbox.release(message.id, f"{type(exc).__name__}: {exc}", retry_at)
+            return
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            with self._session_factory() as session:
+                outbox = SQLPaymentOutbox(session)
+                if message.attempts >= self._max_attempts:
+                    logger.warning("payment outbox message %s failed permanently: %s", message.id, error)
+                    outbox.mark_failed(message.id, error)
+                else:
+                    outbox.mark_retry(message.id, error, self._clock() + retry_delay(message.attempts))
+            return
+
+        with self._session_factory() as session:
+            SQLPaymentOutbox(session).mark_sent(message.id)
+
+
+def build_payment_outbox_worker(settings: Settings) -> PaymentOutboxWorker:
+    """Wire the worker with the application session factory and the shared gateway."""
+
+    return PaymentOutboxWorker(
+        SessionLocal,
+        get_guarded_mercadopago_gateway(),
+        concurrency=settings.payment_outbox_concurrency,
+        batch_size=settings.payment_outbox_batch_size,
+        max_attempts=settings.payment_outbox_max_attempts,
+        poll_interval_seconds=settings.payment_outbox_poll_interval_seconds,
+    )
@@ -0,0 +1,190 @@
+"""Background worker verifying queued Mercado Pago webhooks against the provider API."""
+
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.contexts.store.orders.application.apply_provider_payment import (
+    ApplyProviderPaymentUseCase,
+    PaymentVerificationError,
+)
+from app.contexts.store.orders.domain.payment_gateway import (
+    PaymentGateway,
+    PaymentGatewayUnavailableError,
+)
+from app.contexts.store.orders.domain.webhook_inbox import WebhookEvent
+from app.contexts.store.orders.infrastructure.mercadopago.circuit_breaking_gateway import (
+    get_guarded_mercadopago_gateway,
+)
+from app.contexts.store.orders.infrastructure.payment_outbox_worker import retry_delay
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.contexts.store.orders.infrastructure.sql_webhook_inbox import SQLWebhookInbox
+from app.shared.config.settings import Settings
+from app.shared.infrastructure.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
+
+
+@dataclass(frozen=True, slots=True)
+class _Outcome:
+    event: WebhookEvent
+    error: str | None = None
+    permanent: bool = False
+    retry_after_seconds: float | None = None
+
+
+class PaymentWebhookWorker:
+    """Leases queued webhook events in batches and verifies them on a bounded thread pool.
+
+    Events verified in a batch are settled with one UPDATE. Verification errors
+    (unknown reference, amount mismatch) are parked as `failed` right away;
+    other failures are retried with backoff until `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        payment_gateway: PaymentGateway,
+        concurrency: int = 4,
+        batch_size: int = 50,
+        max_attempts: int = 5,
+        poll_interval_seconds: float = 1.0,
+        lease_seconds: float = 60.0,
+        clock: Callable[[], datetime] = _utc_now,
+    ) -> None:
+        if concurrency <= 0:
+            raise ValueError("concurrency must be greater than zero")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than zero")
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be greater than zero")
+        self._session_factory = session_factory
+        self._payment_gateway = payment_gateway
+        self._concurrency = concurrency
+        self._batch_size = batch_size
+        self._max_attempts = max_attempts
+        self._poll_interval_seconds = poll_interval_seconds
+        self._lease = timedelta(seconds=lease_seconds)
+        self._clock = clock
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    def drain_once(self) -> int:
+        """Verify one batch of due events and return how many were leased."""
+
+        now = self._clock()
+        with self._session_factory() as session:
+            events = SQLWebhookInbox(session).claim_due(
+                now,
+                limit=self._batch_size,
+                lease_until=now + self._lease,
+            )
+        if not events:
+            return 0
+
+        outcomes = list(self._get_executor().map(self._verify, events))
+        self._settle(outcomes)
+        return len(events)
+
+    def drain(self) -> int:
+        """Process batches until no event is due; used by the CLI and tests."""
+
+        total = 0
+        while processed := self.drain_once():
+            total += processed
+        return total
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="payment-webhook-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.drain_once()
+            except Exception:
+                logger.exception("payment webhook drain failed")
+                processed = 0
+            if processed == 0:
+                self._stop.wait(self._poll_interval_seconds)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._concurrency,
+                thread_name_prefix="payment-webhook",
+            )
+        return self._executor
+
+    def _verify(self, event: WebhookEvent) -> _Outcome:
+        try:
+            with self._session_factory() as session:
+                ApplyProviderPaymentUseCase(
+                    SQLOrderRepository(session),
+                    payment_gateway=self._payment_gateway,
+                ).execute(event.resource_id)
+        except PaymentGatewayUnavailableError as exc:
+            return _Outcome(
+                event,
+                f"{type(exc).__name__}: {exc}",
+                retry_after_seconds=exc.retry_after_seconds,
+            )
+        except PaymentVerificationError as exc:
+            return _Outcome(event, f"{type(exc).__name__}: {exc}", permanent=True)
+        except Exception as exc:
+            return _Outcome(event, f"{type(exc).__name__}: {exc}")
+        return _Outcome(event)
+
+    def _settle(self, outcomes: list[_Outcome]) -> None:
+        now = self._clock()
+        with self._session_factory() as session:
+            inbox = SQLWebhookInbox(session)
+            inbox.mark_processed([outcome.event.id for outcome in outcomes if outcome.error is None], now)
+            for outcome in outcomes:
+                event, error = outcome.event, outcome.error
+                if error is None:
+                    continue
+                if outcome.retry_after_seconds is not None:
+                    # The provider was never contacted: wait for the breaker without spending attempts.
+                    retry_at = now + timedelta(seconds=max(outcome.retry_after_seconds, 1.0))
+                    inbox.release(event.id, error, retry_at)
+                elif outcome.permanent or event.attempts >= self._max_attempts:
+                    logger.warning("payment webhook event %s failed permanently: %s", event.id, error)
+                    inbox.mark_failed(event.id, error)
+                else:
+                    inbox.mark_retry(event.id, error, now + retry_delay(event.attempts))
+
+
+def build_payment_webhook_worker(settings: Settings) -> PaymentWebhookWorker:
+    """Wire the worker with the application session factory and the shared gateway."""
+
+    return PaymentWebhookWorker(
+        SessionLocal,
+        get_guarded_mercadopago_gateway(),
+        concurrency=settings.payment_webhook_concurrency,
+        batch_size=settings.payment_webhook_batch_size,
+        max_attempts=settings.payment_webhook_max_attempts,
+        poll_interval_seconds=settings.payment_webhook_poll_interval_seconds,
+    )
@@ -0,0 +1,175 @@
+"""SQLAlchemy adapter implementing IdempotencyStore port."""
+
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import Row, and_, delete, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.contexts.store.orders.domain.idempotency_store import (
+    IdempotencyClaim,
+    IdempotencyRecord,
+    IdempotencyStore,
+    OrderReceipt,
+)
+from app.contexts.store.orders.infrastructure.order_models import OrderIdempotencyKeyModel, OrderModel
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns.
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+def _to_receipt(response: dict[str, object] | None) -> OrderReceipt | None:
+    if response is None:
+        return None
+    return OrderReceipt(
+        order_number=str(response["order_number"]),
+        status=str(response["status"]),
+        total_cents=int(str(response["total_cents"])),
+        payment_url=str(response["payment_url"]) if response.get("payment_url") is not None else None,
+    )
+
+
+def _to_response(receipt: OrderReceipt) -> dict[str, object]:
+    return {
+        "order_number": receipt.order_number,
+        "status": receipt.status,
+        "total_cents": receipt.total_cents,
+        "payment_url": receipt.payment_url,
+    }
+
+
+def _to_domain(row: Row[Any]) -> IdempotencyRecord:
+    model, order_number, order_status, total_cents = row
+    receipt = _to_receipt(model.response)
+    if receipt is None and order_number is not None:
+        # The order committed but its request never completed the key: replay it without
+        # a payment URL.
+        receipt = OrderReceipt(
+            order_number=order_number,
+            status=str(order_status),
+            total_cents=int(str(total_cents)),
+        )
+    return IdempotencyRecord(
+        key=model.key,
+        request_fingerprint=model.request_fingerprint,
+        status="completed" if model.status == "completed" else "in_progress",
+        expires_at=_as_utc(model.expires_at),
+        receipt=receipt,
+        lease_expires_at=_as_utc(model.lease_expires_at) if model.lease_expires_at is not None else None,
+        order_id=model.order_id,
+    )
+
+
+class SQLIdempotencyStore(IdempotencyStore):
+    """Idempotency store backed by the `order_idempotency_keys` table.
+
+    Every call commits on its own so that a claim is visible to concurrent
+    requests before the order itself is created.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def get(self, key: str) -> IdempotencyRecord | None:
+        row = self._session.execute(
+            select(
+                OrderIdempotencyKeyModel,
+                OrderModel.order_number,
+                OrderModel.status,
+                OrderModel.total_cents,
+            )
+            .outerjoin(OrderModel, OrderModel.id == OrderIdempotencyKeyModel.order_id)
+            .where(OrderIdempotencyKeyModel.key == key)
+        ).one_or_none()
+        self._session.commit()
+        return _to_domain(row) if row is not None else None
+
+    def claim(
+        self,
+        claim: IdempotencyClaim,
+        request_fingerprint: str,
+        now: datetime,
+        expires_at: datetime,
+        lease_expires_at: datetime,
+    ) -> bool:
+        values = {
+            "key": claim.key,
+            "claim_token": claim.token,
+            "request_fingerprint": request_fingerprint,
+            "status": "in_progress",
+            "created_at": now,
+            "expires_at": expires_at,
+            "lease_expires_at": lease_expires_at,
+        }
+        try:
+            # An expired record, or a claim abandoned by a crashed request before its order
+            # committed, gives way to the new claim.
+            self._session.execute(
+                delete(OrderIdempotencyKeyModel).where(
+                    OrderIdempotencyKeyModel.key == claim.key,
+                    or_(
+                        OrderIdempotencyKeyModel.expires_at <= now,
+                        and_(
+                            OrderIdempotencyKeyModel.status == "in_progress",
+                            OrderIdempotencyKeyModel.lease_expires_at <= now,
+                            OrderIdempotencyKeyModel.order_id.is_(None),
+                        ),
+                    ),
+                )
+            )
+            claimed = self._insert_if_absent(values)
+            self._session.commit()
+        except IntegrityError:
+            self._session.rollback()
+            return False
+        except Exception:
+            self._session.rollback()
+            raise
+        return claimed
+
+    def complete(self, claim: IdempotencyClaim, receipt: OrderReceipt) -> bool:
+        # Compare-and-set on the claim token: a stale request never overwrites its successor.
+        result = self._session.execute(
+            update(OrderIdempotencyKeyModel)
+            .where(
+                OrderIdempotencyKeyModel.key == claim.key,
+                OrderIdempotencyKeyModel.claim_token == claim.token,
+                OrderIdempotencyKeyModel.status == "in_progress",
+            )
+            .values(status="completed", response=_to_response(receipt), lease_expires_at=None)
+        )
+        self._session.commit()
+        return result.rowcount == 1
+
+    def release(self, claim: IdempotencyClaim) -> None:
+        self._session.execute(
+            delete(OrderIdempotencyKeyModel).where(
+                OrderIdempotencyKeyModel.key == claim.key,
+                OrderIdempotencyKeyModel.claim_token == claim.token,
+                OrderIdempotencyKeyModel.status == "in_progress",
+            )
+        )
+        self._session.commit()
+
+    def purge_expired(self, now: datetime) -> int:
+        result = self._session.execute(
+            delete(OrderIdempotencyKeyModel).where(OrderIdempotencyKeyModel.expires_at <= now)
+        )
+        self._session.commit()
+        return result.rowcount
+
+    def _insert_if_absent(self, values: dict[str, object]) -> bool:
+        dialect_name = self._session.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            stmt = postgresql_insert(OrderIdempotencyKeyModel).values(values).on_conflict_do_nothing()
+        elif dialect_name == "sqlite":
+            stmt = sqlite_insert(OrderIdempotencyKeyModel).values(values).on_conflict_do_nothing()
+        else:
+            # Other backends surface the duplicate as IntegrityError, handled by `claim`.
+            stmt = insert(OrderIdempotencyKeyModel).values(values)
+        return self._session.execute(stmt).rowcount == 1
@@ -1,86 +1,271 @@
 """SQLAlchemy adapter implementing OrderRepository port."""
 
+from collections.abc import Collection, Iterator, Sequence
+from datetime import UTC, date, datetime
+from typing import Any, cast
 from uuid import UUID
 
-from sqlalchemy import Select, select
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, bindparam, case, exists, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session, aliased
 
-from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.idempotency_store import IdempotencyClaim
+from app.contexts.store.orders.domain.order import Order, OrderStatus
 from app.contexts.store.orders.domain.order_item import OrderItem
 from app.contexts.store.orders.domain.order_repository import (
     ActiveProductSnapshot,
+    DailyStatusTotal,
+    OrderCursor,
+    OrderLineExportRow,
+    OrderListFilter,
+    OrderPage,
     OrderRepository,
+    OrderWithPayment,
+    PaymentCursor,
+    PaymentToReconcile,
+    ProductSalesTotal,
 )
-from app.contexts.store.orders.domain.payment import Payment
+from app.contexts.store.orders.domain.payment import Payment, PaymentStatus
+from app.contexts.store.orders.domain.payment_outbox import PaymentOutboxMessage
+from app.contexts.store.orders.domain.payment_review import PaymentReview
+from app.contexts.store.orders.domain.product_cache import ProductCacheInvalidator
+from app.contexts.store.orders.domain.state_machine import StatusTransition
 from app.contexts.store.orders.infrastructure.order_models import (
+    DailyOrderStatusRollupModel,
+    DailyProductSalesRollupModel,
+    OrderIdempotencyKeyModel,
     OrderItemModel,
     OrderModel,
     PaymentModel,
+    PaymentOutboxModel,
+    PaymentReviewModel,
 )
+from app.contexts.store.orders.infrastructure.sql_sales_rollups import SQLSalesRollups
 from app.contexts.store.products.infrastructure.product_model import ProductModel
 
 
-def _to_order_model(order: Order) -> OrderModel:
-    return OrderModel(
-        id=str(order.id),
-        order_number=order.order_number,
-        customer_name=order.customer_name,
-        customer_phone=order.customer_phone,
-        status=order.status,
-        total_cents=order.total_cents,
-        created_at=order.created_at,
+def _to_order_row(order: Order) -> dict[str, object]:
+    return {
+        "id": order.id,
+        "order_number": order.order_number,
+        "customer_name": order.customer_name,
+        "customer_phone": order.customer_phone,
+        "status": order.status,
+        "total_cents": order.total_cents,
+        "created_at": order.created_at,
+    }
+
+
+def _to_order_item_row(order_id: UUID, item: OrderItem) -> dict[str, object]:
+    return {
+        "id": item.id,
+        "order_id": order_id,
+        "product_id": item.product_id,
+        "quantity": item.quantity,
+        "product_name_snapshot": item.product_name_snapshot,
+        "unit_price_cents_snapshot": item.unit_price_cents_snapshot,
+        "line_total_cents": item.line_total_cents,
+    }
+
+
+def _to_payment_row(payment: Payment) -> dict[str, object]:
+    return {
+        "id": payment.id,
+        "order_id": payment.order_id,
+        "status": payment.status,
+        "amount_cents": payment.amount_cents,
+        "currency": payment.currency,
+        "external_payment_id": payment.external_payment_id,
+        "init_point": payment.init_point,
+        "sandbox_init_point": payment.sandbox_init_point,
+        "created_at": payment.created_at,
+    }
+
+
+def _to_payment_outbox_row(message: PaymentOutboxMessage) -> dict[str, object]:
+    return {
+        "id": message.id,
+        "order_id": message.order_id,
+        "payment_id": message.payment_id,
+        "status": message.status,
+        "attempts": message.attempts,
+        "available_at": message.available_at,
+        "last_error": message.last_error,
+    }
+
+
+def _to_order(model: OrderModel, item_models: list[OrderItemModel]) -> Order:
+    return Order(
+        id=model.id,
+        order_number=model.order_number,
+        customer_name=model.customer_name,
+        customer_phone=model.customer_phone,
+        status=cast(OrderStatus, model.status),
+        created_at=model.created_at,
+        items=[
+            OrderItem(
+                id=item.id,
+                product_id=item.product_id,
+                quantity=item.quantity,
+                product_name_snapshot=item.product_name_snapshot,
+                unit_price_cents_snapshot=item.unit_price_cents_snapshot,
+            )
+            for item in item_models
+        ],
     )
 
 
-def _to_order_item_model(order_id: UUID, item: OrderItem) -> OrderItemModel:
-    return OrderItemModel(
-        id=str(item.id),
-        order_id=str(order_id),
-        product_id=str(item.product_id),
-        quantity=item.quantity,
-        product_name_snapshot=item.product_name_snapshot,
-        unit_price_cents_snapshot=item.unit_price_cents_snapshot,
-        line_total_cents=item.line_total_cents,
+def _to_payment(model: PaymentModel) -> Payment:
+    return Payment(
+        id=model.id,
+        order_id=model.order_id,
+        amount_cents=model.amount_cents,
+        status=cast(PaymentStatus, model.status),
+        currency=model.currency,
+        external_payment_id=model.external_payment_id,
+        init_point=model.init_point,
+        sandbox_init_point=model.sandbox_init_point,
+        created_at=model.created_at,
     )
 
 
-def _to_payment_model(payment: Payment) -> PaymentModel:
-    return PaymentModel(
-        id=str(payment.id),
-        order_id=str(payment.order_id),
-        status=payment.status,
-        amount_cents=payment.amount_cents,
-        currency=payment.currency,
-        external_payment_id=payment.external_payment_id,
-        init_point=payment.init_point,
-        sandbox_init_point=payment.sandbox_init_point,
-        created_at=payment.created_at,
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns.
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+_ORDER_LINE_COLUMNS = (
+    OrderModel.order_number,
+    OrderModel.created_at,
+    OrderModel.status,
+    OrderModel.customer_name,
+    OrderModel.customer_phone,
+    OrderModel.total_cents,
+    OrderItemModel.product_id,
+    OrderItemModel.product_name_snapshot,
+    OrderItemModel.quantity,
+    OrderItemModel.unit_price_cents_snapshot,
+    OrderItemModel.line_total_cents,
+    PaymentModel.status,
+    PaymentModel.amount_cents,
+    PaymentModel.currency,
+    PaymentModel.external_payment_id,
+)
+
+
+def _to_order_line(row: Row[Any]) -> OrderLineExportRow:
+    return OrderLineExportRow(
+        order_number=row[0],
+        order_created_at=_as_utc(row[1]),
+        order_status=row[2],
+        customer_name=row[3],
+        customer_phone=row[4],
+        order_total_cents=row[5],
+        product_id=row[6],
+        product_name=row[7],
+        quantity=row[8],
+        unit_price_cents=row[9],
+        line_total_cents=row[10],
+        payment_status=row[11],
+        payment_amount_cents=row[12],
+        payment_currency=row[13],
+        external_payment_id=row[14],
     )
 
 
+def _filter_orders(stmt: Select[Any], filters: OrderListFilter) -> Select[Any]:
+    if filters.status is not None:
+        stmt = stmt.where(OrderModel.status == filters.status)
+    if filters.customer_phone is not None:
+        stmt = stmt.where(OrderModel.customer_phone == filters.customer_phone)
+    if filters.created_from is not None:
+        stmt = stmt.where(OrderModel.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        stmt = stmt.where(OrderModel.created_at < filters.created_to)
+    return stmt
+
+
+_RELEASE_STOCK = (
+    update(ProductModel)
+    .where(ProductModel.id == bindparam("product_id"))
+    .values(stock=ProductModel.stock + bindparam("quantity"), updated_at=bindparam("updated_at"))
+)
+
+
 def _to_active_product_snapshot(model: ProductModel) -> ActiveProductSnapshot:
     return ActiveProductSnapshot(
-        id=UUID(model.id),
+        id=model.id,
         name=model.name,
         price_cents=model.price_cents,
         currency=model.currency,
     )
 
 
+def _compare_and_set_status(
+    session: Session,
+    model: type[OrderModel] | type[PaymentModel],
+    transitions: Sequence[StatusTransition],
+    *returning: Any,
+) -> dict[tuple[str, str], list[Row[Any]]]:
+    """Apply status transitions as `UPDATE ... WHERE id = :id AND status = :expected`.
+
+    Transitions sharing (expected, target) go out as one statement over their
+    ids, so a bulk move costs one UPDATE per kind of move; RETURNING tells
+    which rows were still in `expected`. Rows are `(id, *returning)`, grouped
+    by their (expected, target) move.
+    """
+
+    ids_by_move: dict[tuple[str, str], list[UUID]] = {}
+    for transition in transitions:
+        ids_by_move.setdefault((transition.expected, transition.target), []).append(transition.id)
+
+    moved: dict[tuple[str, str], list[Row[Any]]] = {}
+    for (expected, target), ids in ids_by_move.items():
+        id_clause = model.id == ids[0] if len(ids) == 1 else model.id.in_(ids)
+        result = session.execute(
+            update(model)
+            .where(id_clause, model.status == expected)
+            .values(status=target)
+            .returning(model.id, *returning),
+            execution_options={"synchronize_session": False},
+        )
+        moved[(expected, target)] = list(result.all())
+    return moved
+
+
+def _moved_ids(moved: dict[tuple[str, str], list[Row[Any]]]) -> set[UUID]:
+    return {row[0] for rows in moved.values() for row in rows}
+
+
 class SQLOrderRepository(OrderRepository):
-    """Order repository backed by SQLAlchemy session."""
+    """Order repository backed by SQLAlchemy session.
 
-    def __init__(self, session: Session) -> None:
+    Products whose stock a transaction moved are handed to `product_cache`
+    after it commits, so cached catalog reads cannot be refilled from the
+    pre-commit rows.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        product_cache: ProductCacheInvalidator | None = None,
+    ) -> None:
         self._session = session
+        self._rollups = SQLSalesRollups(session)
+        self._product_cache = product_cache
+        self._stock_changed: set[UUID] = set()
 
     def begin(self) -> None:
         self._session.begin()
 
     def commit(self) -> None:
         self._session.commit()
+        changed, self._stock_changed = self._stock_changed, set()
+        if changed and self._product_cache is not None:
+            self._product_cache.invalidate_products(changed)
 
     def rollback(self) -> None:
         self._session.rollback()
+        self._stock_changed.clear()
 
     def get_active_products_by_ids(
         self,
@@ -90,7 +275,7 @@ class SQLOrderRepository(OrderRepository):
             return {}
 
         stmt: Select[tuple[ProductModel]] = select(ProductModel).where(
-            ProductModel.id.in_([str(product_id) for product_id in product_ids]),
+            ProductModel.id.in_(product_ids),
             ProductModel.is_active.is_(True),
         )
         products = self._session.execute(stmt).scalars().all()
@@ -99,23 +284,383 @@ class SQLOrderRepository(OrderRepository):
             for snapshot in (_to_active_product_snapshot(product) for product in products)
         }
 
-    def add_order(self, order: Order) -> None:
-        # Ensure parent row exists before inserting dependent order_items.
-        self._session.add(_to_order_model(order))
-        self._session.flush()
+    def reserve_stock(self, quantities: dict[UUID, int]) -> bool:
+        if len(quantities) == 0:
+            return True
 
-        for item in order.items:
-            self._session.add(_to_order_item_model(order.id, item))
+        # One conditional decrement for the whole cart: a row only changes when it is
+        # active and still has enough stock, and RETURNING names the rows that did.
+        # Success is judged on those ids, never on an executemany rowcount, which
+        # drivers without sane multi-row rowcount may misreport. The id IN (...)
+        # lookup walks the primary key in order, so concurrent carts lock shared
+        # rows in the same order.
+        quantity = case(
+            *((ProductModel.id == product_id, amount) for product_id, amount in quantities.items())
+        )
+        result = self._session.execute(
+            update(ProductModel)
+            .where(
+                ProductModel.id.in_(quantities),
+                ProductModel.is_active.is_(True),
+                ProductModel.stock >= quantity,
+            )
+            .values(stock=ProductModel.stock - quantity, updated_at=datetime.now(UTC))
+            .returning(ProductModel.id),
+            execution_options={"synchronize_session": False},
+        )
+        reserved = set(result.scalars().all())
+        self._stock_changed.update(reserved)
+        return reserved == set(quantities)
+
+    def add_order(self, order: Order) -> None:
+        # Two statements whatever the cart size: the order row, then one multi-row
+        # INSERT for its items (parent first so the foreign key holds).
+        self._session.execute(insert(OrderModel).values(_to_order_row(order)))
+        self._session.execute(
+            insert(OrderItemModel).values(
+                [_to_order_item_row(order.id, item) for item in order.items]
+            )
+        )
+        self._rollups.add_order(order)
 
     def add_payment(self, payment: Payment) -> None:
-        self._session.add(_to_payment_model(payment))
+        self._session.execute(insert(PaymentModel).values(_to_payment_row(payment)))
+
+    def attach_payment_preference(self, payment: Payment) -> bool:
+        # Compare-and-set in one statement: no read first, and a row another writer
+        # already settled or gave a preference is left alone.
+        result = self._session.execute(
+            update(PaymentModel)
+            .where(
+                PaymentModel.id == payment.id,
+                PaymentModel.status == "created",
+                PaymentModel.init_point.is_(None),
+            )
+            .values(
+                external_payment_id=payment.external_payment_id,
+                init_point=payment.init_point,
+                sandbox_init_point=payment.sandbox_init_point,
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        return result.rowcount == 1
+
+    def transition_payment(self, transition: StatusTransition) -> bool:
+        return transition.id in self.transition_payments([transition])
 
-    def update_payment(self, payment: Payment) -> None:
-        model = self._session.get(PaymentModel, str(payment.id))
+    def transition_payments(self, transitions: Sequence[StatusTransition]) -> set[UUID]:
+        return _moved_ids(_compare_and_set_status(self._session, PaymentModel, transitions))
+
+    def transition_order(self, transition: StatusTransition) -> bool:
+        return transition.id in self.transition_orders([transition])
+
+    def transition_orders(self, transitions: Sequence[StatusTransition]) -> set[UUID]:
+        moved = _compare_and_set_status(
+            self._session,
+            OrderModel,
+            transitions,
+            OrderModel.created_at,
+            OrderModel.total_cents,
+        )
+        # Same transaction as the status write, so the rollups never drift from it.
+        for (expected, target), rows in moved.items():
+            self._rollups.move_orders(
+                [(order_id, created_at, total_cents) for order_id, created_at, total_cents in rows],
+                expected,
+                target,
+            )
+        return _moved_ids(moved)
+
+    def expire_orders(self, created_before: datetime, limit: int) -> list[UUID]:
+        # One bounded, set-based UPDATE per batch over ix_orders_status_created_at_id.
+        # SKIP LOCKED (Postgres) lets checkouts and other sweepers keep their rows;
+        # the outer status check keeps an order paid meanwhile out of the batch.
+        # A `pending` payment was reported in process by the provider (ix_payments_order_id
+        # probe): its order waits for the webhook or reconciliation instead of releasing
+        # stock. An unused checkout stays `created` and expires with its order.
+        in_flight = exists().where(
+            PaymentModel.order_id == OrderModel.id, PaymentModel.status == "pending"
+        )
+        stale = (
+            select(OrderModel.id)
+            .where(
+                OrderModel.status == "pending_payment",
+                OrderModel.created_at < created_before,
+                ~in_flight,
+            )
+            .order_by(OrderModel.created_at, OrderModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = self._session.execute(
+            update(OrderModel)
+            .where(OrderModel.id.in_(stale), OrderModel.status == "pending_payment")
+            .values(status="expired")
+            .returning(OrderModel.id, OrderModel.created_at, OrderModel.total_cents),
+            execution_options={"synchronize_session": False},
+        )
+        rows = [(order_id, created_at, total_cents) for order_id, created_at, total_cents in result]
+        self._rollups.move_orders(rows, "pending_payment", "expired")
+        return [order_id for order_id, _, _ in rows]
+
+    def release_stock(self, order_ids: Collection[UUID]) -> None:
+        if len(order_ids) == 0:
+            return
+
+        quantities = self._session.execute(
+            select(OrderItemModel.product_id, func.sum(OrderItemModel.quantity))
+            .where(OrderItemModel.order_id.in_(order_ids))
+            .group_by(OrderItemModel.product_id)
+        ).all()
+        if not quantities:
+            return
+
+        # Same row-lock order as reserve_stock.
+        now = datetime.now(UTC)
+        params = [
+            {"product_id": product_id, "quantity": quantity, "updated_at": now}
+            for product_id, quantity in sorted(quantities, key=lambda row: str(row[0]))
+        ]
+        self._session.connection().execute(_RELEASE_STOCK, params)
+        self._stock_changed.update(product_id for product_id, _ in quantities)
+
+    def list_payments_by_status(
+        self,
+        statuses: Collection[str],
+        created_before: datetime,
+        limit: int,
+        after: PaymentCursor | None = None,
+    ) -> list[PaymentToReconcile]:
+        # Keyset walk over ix_payments_status_created_at_id: rows moved out of
+        # `statuses` while paging cannot shift later pages.
+        stmt = (
+            select(PaymentModel, OrderModel.order_number)
+            .join(OrderModel, OrderModel.id == PaymentModel.order_id)
+            .where(PaymentModel.status.in_(statuses), PaymentModel.created_at < created_before)
+            .order_by(PaymentModel.created_at, PaymentModel.id)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(PaymentModel.created_at, PaymentModel.id) > (after.created_at, after.id)
+            )
+
+        return [
+            PaymentToReconcile(payment=_to_payment(model), order_number=order_number)
+            for model, order_number in self._session.execute(stmt).all()
+        ]
+
+    def add_payment_outbox_message(self, message: PaymentOutboxMessage) -> None:
+        self._session.execute(insert(PaymentOutboxModel).values(_to_payment_outbox_row(message)))
+
+    def add_payment_reviews(self, reviews: Sequence[PaymentReview]) -> None:
+        if len(reviews) == 0:
+            return
+        self._session.execute(
+            insert(PaymentReviewModel).values(
+                [
+                    {
+                        "id": review.id,
+                        "payment_id": review.payment_id,
+                        "order_id": review.order_id,
+                        "reason": review.reason,
+                        "created_at": review.created_at,
+                    }
+                    for review in reviews
+                ]
+            )
+        )
+
+    def record_idempotent_order(self, claim: IdempotencyClaim, order_id: UUID) -> bool:
+        # Compare-and-set on the claim token: a request whose key was taken over
+        # rolls its order back instead of creating a second one.
+        result = self._session.execute(
+            update(OrderIdempotencyKeyModel)
+            .where(
+                OrderIdempotencyKeyModel.key == claim.key,
+                OrderIdempotencyKeyModel.claim_token == claim.token,
+                OrderIdempotencyKeyModel.status == "in_progress",
+            )
+            .values(order_id=order_id),
+            execution_options={"synchronize_session": False},
+        )
+        return result.rowcount == 1
+
+    def daily_status_totals(self, from_day: date, to_day: date) -> list[DailyStatusTotal]:
+        # Primary-key range scan: at most ROLLUP_SHARDS rows per (day, status), whatever
+        # the order volume, summed here.
+        order_count = func.sum(DailyOrderStatusRollupModel.order_count)
+        total_cents = func.sum(DailyOrderStatusRollupModel.total_cents)
+        rows = self._session.execute(
+            select(
+                DailyOrderStatusRollupModel.day,
+                DailyOrderStatusRollupModel.status,
+                order_count,
+                total_cents,
+            )
+            .where(
+                DailyOrderStatusRollupModel.day >= from_day,
+                DailyOrderStatusRollupModel.day <= to_day,
+            )
+            .group_by(DailyOrderStatusRollupModel.day, DailyOrderStatusRollupModel.status)
+            .having(order_count != 0)
+            .order_by(DailyOrderStatusRollupModel.day, DailyOrderStatusRollupModel.status)
+        ).all()
+        return [
+            DailyStatusTotal(
+                day=day,
+                status=status,
+                order_count=int(status_count),
+                total_cents=int(status_total_cents),
+            )
+            for day, status, status_count, status_total_cents in rows
+        ]
+
+    def product_sales_totals(
+        self,
+        from_day: date,
+        to_day: date,
+        statuses: Collection[str],
+    ) -> list[ProductSalesTotal]:
+        units = func.sum(DailyProductSalesRollupModel.units)
+        revenue_cents = func.sum(DailyProductSalesRollupModel.revenue_cents)
+        rows = self._session.execute(
+            select(
+                DailyProductSalesRollupModel.product_id,
+                func.max(DailyProductSalesRollupModel.product_name),
+                units,
+                revenue_cents,
+            )
+            .where(
+                DailyProductSalesRollupModel.day >= from_day,
+                DailyProductSalesRollupModel.day <= to_day,
+                DailyProductSalesRollupModel.status.in_(statuses),
+            )
+            .group_by(DailyProductSalesRollupModel.product_id)
+            .having(units != 0)
+            .order_by(revenue_cents.desc(), DailyProductSalesRollupModel.product_id)
+        ).all()
+        return [
+            ProductSalesTotal(
+                product_id=product_id,
+                product_name=product_name,
+                units=int(product_units),
+                revenue_cents=int(product_revenue_cents),
+            )
+            for product_id, product_name, product_units, product_revenue_cents in rows
+        ]
+
+    def get_order(self, order_id: UUID) -> Order | None:
+        model = self._session.get(OrderModel, order_id)
         if model is None:
-            raise ValueError("payment not found")
+            return None
+
+        items = self._session.execute(
+            select(OrderItemModel)
+            .where(OrderItemModel.order_id == model.id)
+            .order_by(OrderItemModel.created_at, OrderItemModel.id)
+        ).scalars().all()
+        return _to_order(model, list(items))
+
+    def get_payment_by_order_number(self, order_number: str) -> Payment | None:
+        model = self._session.execute(
+            select(PaymentModel)
+            .join(OrderModel, OrderModel.id == PaymentModel.order_id)
+            .where(OrderModel.order_number == order_number)
+            .order_by(PaymentModel.created_at.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+        return _to_payment(model) if model is not None else None
+
+    def list_orders(
+        self,
+        filters: OrderListFilter,
+        limit: int,
+        after: OrderCursor | None = None,
+    ) -> OrderPage:
+        # Three queries per page whatever its size: orders, then their items and payments.
+        stmt = _filter_orders(
+            select(OrderModel)
+            .order_by(OrderModel.created_at.desc(), OrderModel.id.desc())
+            .limit(limit + 1),
+            filters,
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(OrderModel.created_at, OrderModel.id) < (after.created_at, after.id)
+            )
 
-        model.status = payment.status
-        model.external_payment_id = payment.external_payment_id
-        model.init_point = payment.init_point
-        model.sandbox_init_point = payment.sandbox_init_point
+        order_models = list(self._session.execute(stmt).scalars().all())
+        page_models = order_models[:limit]
+        if not page_models:
+            return OrderPage(items=[])
+
+        order_ids = [model.id for model in page_models]
+        items_by_order: dict[UUID, list[OrderItemModel]] = {order_id: [] for order_id in order_ids}
+        for item in self._session.execute(
+            select(OrderItemModel)
+            .where(OrderItemModel.order_id.in_(order_ids))
+            .order_by(OrderItemModel.created_at, OrderItemModel.id)
+        ).scalars():
+            items_by_order[item.order_id].append(item)
+
+        payments_by_order: dict[UUID, PaymentModel] = {}
+        for payment in self._session.execute(
+            select(PaymentModel)
+            .where(PaymentModel.order_id.in_(order_ids))
+            .order_by(PaymentModel.created_at)
+        ).scalars():
+            # Later payments of the same order win, matching get_payment_by_order_number.
+            payments_by_order[payment.order_id] = payment
+
+        items = [
+            OrderWithPayment(
+                order=_to_order(model, items_by_order[model.id]),
+                payment=(
+                    _to_payment(payments_by_order[model.id])
+                    if model.id in payments_by_order
+                    else None
+                ),
+            )
+            for model in page_models
+        ]
+
+        next_cursor: OrderCursor | None = None
+        if len(order_models) > limit:
+            last = page_models[-1]
+            next_cursor = OrderCursor(created_at=last.created_at, id=last.id)
+
+        return OrderPage(items=items, next_cursor=next_cursor)
+
+    def iter_order_lines(
+        self,
+        filters: OrderListFilter,
+        chunk_size: int = 1000,
+    ) -> Iterator[list[OrderLineExportRow]]:
+        # One joined projection read through a server-side cursor (yield_per), so an
+        # export holds `chunk_size` rows at a time whatever the date range. Only the
+        # latest payment of each order is joined, as in list_orders, so retried
+        # payments do not repeat the order's lines.
+        attempt = aliased(PaymentModel)
+        latest_payment_id = (
+            select(attempt.id)
+            .where(attempt.order_id == OrderModel.id)
+            .order_by(attempt.created_at.desc(), attempt.id.desc())
+            .limit(1)
+            .correlate(OrderModel)
+            .scalar_subquery()
+        )
+        stmt = _filter_orders(
+            select(*_ORDER_LINE_COLUMNS)
+            .join(OrderItemModel, OrderItemModel.order_id == OrderModel.id)
+            .outerjoin(PaymentModel, PaymentModel.id == latest_payment_id)
+            .order_by(OrderModel.created_at, OrderModel.id, OrderItemModel.id)
+            .execution_options(yield_per=chunk_size),
+            filters,
+        )
+        result = self._session.execute(stmt)
+        try:
+            for rows in result.partitions():
+                yield [_to_order_line(row) for row in rows]
+        finally:
+            result.close()
@@ -0,0 +1,118 @@
+"""SQLAlchemy adapter implementing PaymentOutbox port."""
+
+from datetime import UTC, datetime
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.contexts.store.orders.domain.payment_outbox import (
+    PaymentOutbox,
+    PaymentOutboxMessage,
+)
+from app.contexts.store.orders.infrastructure.order_models import PaymentOutboxModel
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns.
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+class SQLPaymentOutbox(PaymentOutbox):
+    """Outbox backed by the `payment_outbox` table; every call commits on its own.
+
+    A leased message stays `processing` with `available_at` set to the end of
+    its lease, so a worker that dies mid-message gives it back once the lease
+    runs out. The lease is taken by a conditional UPDATE that re-checks the row
+    is still due and returns only the rows it moved, so concurrent workers never
+    share a message on any backend; on Postgres they also skip each other's
+    candidates with `FOR UPDATE SKIP LOCKED` instead of waiting on them.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def claim_due(
+        self,
+        now: datetime,
+        limit: int,
+        lease_until: datetime,
+    ) -> list[PaymentOutboxMessage]:
+        due = (
+            PaymentOutboxModel.status.in_(("pending", "processing")),
+            PaymentOutboxModel.available_at <= now,
+        )
+        try:
+            candidate_ids = self._session.execute(
+                select(PaymentOutboxModel.id)
+                .where(*due)
+                .order_by(PaymentOutboxModel.available_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not candidate_ids:
+                self._session.commit()
+                return []
+
+            # A worker that leased a candidate first has already pushed its
+            # available_at past `now`, so the guard leaves that row out here.
+            rows = self._session.execute(
+                update(PaymentOutboxModel)
+                .where(PaymentOutboxModel.id.in_(candidate_ids), *due)
+                .values(
+                    status="processing",
+                    attempts=PaymentOutboxModel.attempts + 1,
+                    available_at=lease_until,
+                )
+                .returning(
+                    PaymentOutboxModel.id,
+                    PaymentOutboxModel.order_id,
+                    PaymentOutboxModel.payment_id,
+                    PaymentOutboxModel.attempts,
+                    PaymentOutboxModel.last_error,
+                ),
+                execution_options={"synchronize_session": False},
+            ).all()
+            messages = [
+                PaymentOutboxMessage(
+                    id=row.id,
+                    order_id=row.order_id,
+                    payment_id=row.payment_id,
+                    status="processing",
+                    attempts=row.attempts,
+                    available_at=_as_utc(lease_until),
+                    last_error=row.last_error,
+                )
+                for row in rows
+            ]
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+        return messages
+
+    def mark_sent(self, message_id: UUID) -> None:
+        self._settle(message_id, status="sent", last_error=None)
+
+    def mark_retry(self, message_id: UUID, error: str, available_at: datetime) -> None:
+        self._settle(message_id, status="pending", last_error=error, available_at=available_at)
+
+    def mark_failed(self, message_id: UUID, error: str) -> None:
+        self._settle(message_id, status="failed", last_error=error)
+
+    def release(self, message_id: UUID, error: str, available_at: datetime) -> None:
+        self._settle(
+            message_id,
+            status="pending",
+            last_error=error,
+            available_at=available_at,
+            attempts=PaymentOutboxModel.attempts - 1,
+        )
+
+    def _settle(self, message_id: UUID, **values: object) -> None:
+        self._session.execute(
+            update(PaymentOutboxModel)
+            .where(PaymentOutboxModel.id == message_id)
+            .values(**values)
+        )
+        self._session.commit()
@@ -0,0 +1,232 @@
+"""SQLAlchemy writer keeping the daily sales rollups in step with order writes."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import Insert as SQLiteInsert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.infrastructure.order_models import (
+    DailyOrderStatusRollupModel,
+    DailyProductSalesRollupModel,
+    OrderItemModel,
+)
+
+
+# Counter rows per rollup key. Each order writes the shard picked by the low bits
+# of its uuid7 id (random, then counting within a millisecond), so concurrent checkouts of one day and product rarely wait
+# on the same row; readers sum the shards. A single shard may go negative when an
+# order moves out of a status that was backfilled into shard 0; only sums matter.
+ROLLUP_SHARDS = 16
+SUPPORTED_DIALECTS = frozenset({"postgresql", "sqlite"})
+
+
+class UnsupportedSalesRollupsDatabaseError(RuntimeError):
+    """Raised when the database has no `INSERT ... ON CONFLICT DO UPDATE` for the rollups."""
+
+
+def ensure_sales_rollups_supported(dialect_name: str) -> None:
+    """Fail fast, at startup or when a repository is built, instead of on a checkout write."""
+
+    if dialect_name not in SUPPORTED_DIALECTS:
+        raise UnsupportedSalesRollupsDatabaseError(
+            f"sales rollups need INSERT ... ON CONFLICT, unavailable on {dialect_name}"
+        )
+
+
+def rollup_shard(order_id: UUID) -> int:
+    return order_id.int % ROLLUP_SHARDS
+
+
+@dataclass(slots=True)
+class _StatusDelta:
+    order_count: int = 0
+    total_cents: int = 0
+
+
+@dataclass(slots=True)
+class _ProductDelta:
+    product_name: str
+    units: int = 0
+    revenue_cents: int = 0
+
+
+@dataclass(slots=True)
+class _RollupDeltas:
+    statuses: dict[tuple[date, str, int], _StatusDelta]
+    products: dict[tuple[date, UUID, str, int], _ProductDelta]
+
+    def add_order(self, day: date, status: str, shard: int, sign: int, total_cents: int) -> None:
+        delta = self.statuses.setdefault((day, status, shard), _StatusDelta())
+        delta.order_count += sign
+        delta.total_cents += sign * total_cents
+
+    def add_line(
+        self,
+        day: date,
+        product_id: UUID,
+        status: str,
+        shard: int,
+        sign: int,
+        product_name: str,
+        quantity: int,
+        line_total_cents: int,
+    ) -> None:
+        delta = self.products.setdefault((day, product_id, status, shard), _ProductDelta(product_name))
+        delta.units += sign * quantity
+        delta.revenue_cents += sign * line_total_cents
+
+
+def utc_day(value: datetime) -> date:
+    # SQLite hands back naive datetimes even for timezone-aware columns; they are UTC.
+    return value.astimezone(UTC).date() if value.tzinfo is not None else value.date()
+
+
+class SQLSalesRollups:
+    """Applies signed deltas to `sales_daily_*_rollups` inside the caller's transaction.
+
+    Each write is one executemany of `INSERT ... ON CONFLICT DO UPDATE SET
+    n = n + excluded.n`, so concurrent order writes never read-modify-write a
+    rollup row. Rows are keyed by the UTC day the order was created and the
+    order's shard, and written in key order, so concurrent transactions lock
+    them in the same order and checkouts spread over `ROLLUP_SHARDS` rows.
+    """
+
+    def __init__(self, session: Session) -> None:
+        ensure_sales_rollups_supported(session.get_bind().dialect.name)
+        self._session = session
+
+    def add_order(self, order: Order) -> None:
+        day = utc_day(order.created_at)
+        shard = rollup_shard(order.id)
+        deltas = _RollupDeltas(statuses={}, products={})
+        deltas.add_order(day, order.status, shard, 1, order.total_cents)
+        for item in order.items:
+            deltas.add_line(
+                day,
+                item.product_id,
+                order.status,
+                shard,
+                1,
+                item.product_name_snapshot,
+                item.quantity,
+                item.line_total_cents,
+            )
+        self._apply(deltas)
+
+    def move_orders(
+        self,
+        orders: Sequence[tuple[UUID, datetime, int]],
+        source: str,
+        target: str,
+    ) -> None:
+        """Move `(order_id, created_at, total_cents)` orders from `source` to `target`."""
+
+        if not orders:
+            return
+
+        deltas = _RollupDeltas(statuses={}, products={})
+        day_by_order: dict[UUID, date] = {}
+        for order_id, created_at, total_cents in orders:
+            day = day_by_order[order_id] = utc_day(created_at)
+            shard = rollup_shard(order_id)
+            deltas.add_order(day, source, shard, -1, total_cents)
+            deltas.add_order(day, target, shard, 1, total_cents)
+
+        lines = self._session.execute(
+            select(
+                OrderItemModel.order_id,
+                OrderItemModel.product_id,
+                OrderItemModel.product_name_snapshot,
+                OrderItemModel.quantity,
+                OrderItemModel.line_total_cents,
+            ).where(OrderItemModel.order_id.in_(day_by_order))
+        ).all()
+        for order_id, product_id, product_name, quantity, line_total_cents in lines:
+            day, shard = day_by_order[order_id], rollup_shard(order_id)
+            for status, sign in ((source, -1), (target, 1)):
+                deltas.add_line(
+                    day, product_id, status, shard, sign, product_name, quantity, line_total_cents
+                )
+
+        self._apply(deltas)
+
+    def _apply(self, deltas: _RollupDeltas) -> None:
+        connection = self._session.connection()
+        status_stmt = self._insert(DailyOrderStatusRollupModel)
+        connection.execute(
+            status_stmt.on_conflict_do_update(
+                index_elements=[
+                    DailyOrderStatusRollupModel.day,
+                    DailyOrderStatusRollupModel.status,
+                    DailyOrderStatusRollupModel.shard,
+                ],
+                set_={
+                    "order_count": DailyOrderStatusRollupModel.order_count
+                    + status_stmt.excluded.order_count,
+                    "total_cents": DailyOrderStatusRollupModel.total_cents
+                    + status_stmt.excluded.total_cents,
+                },
+            ),
+            [
+                {
+                    "day": day,
+                    "status": status,
+                    "shard": shard,
+                    "order_count": delta.order_count,
+                    "total_cents": delta.total_cents,
+                }
+                for (day, status, shard), delta in sorted(deltas.statuses.items())
+            ],
+        )
+        if not deltas.products:
+            return
+
+        product_stmt = self._insert(DailyProductSalesRollupModel)
+        connection.execute(
+            product_stmt.on_conflict_do_update(
+                index_elements=[
+                    DailyProductSalesRollupModel.day,
+                    DailyProductSalesRollupModel.product_id,
+                    DailyProductSalesRollupModel.status,
+                    DailyProductSalesRollupModel.shard,
+                ],
+                set_={
+                    "product_name": product_stmt.excluded.product_name,
+                    "units": DailyProductSalesRollupModel.units + product_stmt.excluded.units,
+                    "revenue_cents": DailyProductSalesRollupModel.revenue_cents
+                    + product_stmt.excluded.revenue_cents,
+                },
+            ),
+            [
+                {
+                    "day": day,
+                    "product_id": product_id,
+                    "status": status,
+                    "shard": shard,
+                    "product_name": delta.product_name,
+                    "units": delta.units,
+                    "revenue_cents": delta.revenue_cents,
+                }
+                for (day, product_id, status, shard), delta in sorted(
+                    deltas.products.items(),
+                    key=lambda entry: (entry[0][0], str(entry[0][1]), entry[0][2], entry[0][3]),
+                )
+            ],
+        )
+
+    def _insert(
+        self,
+        model: type[DailyOrderStatusRollupModel] | type[DailyProductSalesRollupModel],
+    ) -> PostgresqlInsert | SQLiteInsert:
+        # The constructor already rejected every other dialect.
+        if self._session.get_bind().dialect.name == "postgresql":
+            return postgresql_insert(model)
+        return sqlite_insert(model)
@@ -0,0 +1,173 @@
+"""SQLAlchemy adapter implementing WebhookInbox port."""
+
+from datetime import UTC, datetime
+from uuid import UUID
+
+from sqlalchemy import Insert, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.contexts.store.orders.domain.webhook_inbox import WebhookEvent, WebhookInbox
+from app.contexts.store.orders.infrastructure.order_models import PaymentWebhookEventModel
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns.
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+def _to_row(event: WebhookEvent, received_at: datetime) -> dict[str, object]:
+    return {
+        "id": event.id,
+        "topic": event.topic,
+        "resource_id": event.resource_id,
+        "status": event.status,
+        "attempts": event.attempts,
+        "available_at": event.available_at,
+        "received_at": received_at,
+    }
+
+
+class SQLWebhookInbox(WebhookInbox):
+    """Inbox backed by the `payment_webhook_events` table; every call commits on its own.
+
+    `record` is a single `INSERT ... ON CONFLICT (topic, resource_id)` statement:
+    a duplicate of a queued event is dropped, a settled one is queued again.
+    Leasing works like the payment outbox: a conditional UPDATE ... RETURNING
+    hands each event to one worker, with `FOR UPDATE SKIP LOCKED` on Postgres.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def record(self, topic: str, resource_id: str, received_at: datetime) -> bool:
+        event = WebhookEvent(topic=topic, resource_id=resource_id, available_at=received_at)
+        try:
+            recorded = self._session.execute(self._upsert(_to_row(event, received_at))).rowcount == 1
+            self._session.commit()
+        except IntegrityError:
+            self._session.rollback()
+            return False
+        except Exception:
+            self._session.rollback()
+            raise
+        return recorded
+
+    def claim_due(
+        self,
+        now: datetime,
+        limit: int,
+        lease_until: datetime,
+    ) -> list[WebhookEvent]:
+        due = (
+            PaymentWebhookEventModel.status.in_(("pending", "processing")),
+            PaymentWebhookEventModel.available_at <= now,
+        )
+        try:
+            candidate_ids = self._session.execute(
+                select(PaymentWebhookEventModel.id)
+                .where(*due)
+                .order_by(PaymentWebhookEventModel.available_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not candidate_ids:
+                self._session.commit()
+                return []
+
+            # Events another worker leased since the SELECT are no longer due and stay out.
+            rows = self._session.execute(
+                update(PaymentWebhookEventModel)
+                .where(PaymentWebhookEventModel.id.in_(candidate_ids), *due)
+                .values(
+                    status="processing",
+                    attempts=PaymentWebhookEventModel.attempts + 1,
+                    available_at=lease_until,
+                )
+                .returning(
+                    PaymentWebhookEventModel.id,
+                    PaymentWebhookEventModel.topic,
+                    PaymentWebhookEventModel.resource_id,
+                    PaymentWebhookEventModel.attempts,
+                    PaymentWebhookEventModel.last_error,
+                ),
+                execution_options={"synchronize_session": False},
+            ).all()
+            events = [
+                WebhookEvent(
+                    id=row.id,
+                    topic=row.topic,
+                    resource_id=row.resource_id,
+                    status="processing",
+                    attempts=row.attempts,
+                    available_at=_as_utc(lease_until),
+                    last_error=row.last_error,
+                )
+                for row in rows
+            ]
+            self._session.commit()
+        except Exception:
+            self._session.rollback()
+            raise
+        return events
+
+    def mark_processed(self, event_ids: list[UUID], processed_at: datetime) -> None:
+        if not event_ids:
+            return
+        self._session.execute(
+            update(PaymentWebhookEventModel)
+            .where(
+                PaymentWebhookEventModel.id.in_(event_ids),
+                PaymentWebhookEventModel.status == "processing",
+            )
+            .values(status="processed", processed_at=processed_at, last_error=None)
+        )
+        self._session.commit()
+
+    def mark_retry(self, event_id: UUID, error: str, available_at: datetime) -> None:
+        self._settle(event_id, status="pending", last_error=error, available_at=available_at)
+
+    def mark_failed(self, event_id: UUID, error: str) -> None:
+        self._settle(event_id, status="failed", last_error=error)
+
+    def release(self, event_id: UUID, error: str, available_at: datetime) -> None:
+        self._settle(
+            event_id,
+            status="pending",
+            last_error=error,
+            available_at=available_at,
+            attempts=PaymentWebhookEventModel.attempts - 1,
+        )
+
+    def _settle(self, event_id: UUID, **values: object) -> None:
+        self._session.execute(
+            update(PaymentWebhookEventModel)
+            .where(PaymentWebhookEventModel.id == event_id)
+            .values(**values)
+        )
+        self._session.commit()
+
+    def _upsert(self, values: dict[str, object]) -> Insert:
+        dialect_name = self._session.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            stmt = postgresql_insert(PaymentWebhookEventModel).values(values)
+        elif dialect_name == "sqlite":
+            stmt = sqlite_insert(PaymentWebhookEventModel).values(values)
+        else:
+            # Other backends surface the duplicate as IntegrityError, handled by `record`.
+            return insert(PaymentWebhookEventModel).values(values)
+
+        return stmt.on_conflict_do_update(
+            index_elements=[PaymentWebhookEventModel.topic, PaymentWebhookEventModel.resource_id],
+            set_={
+                "status": "pending",
+                "attempts": 0,
+                "available_at": stmt.excluded.available_at,
+                "received_at": stmt.excluded.received_at,
+                "processed_at": None,
+                "last_error": None,
+            },
+            where=PaymentWebhookEventModel.status.in_(("processed", "failed")),
+        )
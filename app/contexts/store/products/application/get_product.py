@@ -0,0 +1,23 @@
+"""Get product detail use case."""
+
+from uuid import UUID
+
+from app.contexts.store.products.domain.product import Product
+from app.contexts.store.products.domain.product_repository import ProductRepository
+
+
+class ProductNotFoundError(Exception):
+    """Raised when the product does not exist or is not active."""
+
+
+class GetProductUseCase:
+    """Application service that returns one active product."""
+
+    def __init__(self, repository: ProductRepository) -> None:
+        self._repository = repository
+
+    def execute(self, product_id: UUID) -> Product:
+        product = self._repository.get_by_id(product_id)
+        if product is None or not product.is_active:
+            raise ProductNotFoundError(f"product not found: {product_id}")
+        return product
@@ -0,0 +1,119 @@
+"""Bulk product import use case."""
+
+import logging
+from dataclasses import dataclass, field
+
+from app.contexts.store.products.application.create_product import CreateProductCommand
+from app.contexts.store.products.domain.product import Product
+from app.contexts.store.products.domain.product_repository import (
+    ProductBatchRejectedError,
+    ProductRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMPORT_BATCH_SIZE = 500
+MAX_IMPORT_BATCH_SIZE = 2000
+
+
+@dataclass(frozen=True, slots=True)
+class ImportProductRow:
+    """One parsed input row and its position in the uploaded document."""
+
+    line: int
+    command: CreateProductCommand
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRowError:
+    line: int
+    error: str
+
+
+@dataclass(slots=True)
+class ImportProductsResult:
+    """Accumulated outcome of an import; rows fail individually."""
+
+    imported: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+    def merge(self, other: "ImportProductsResult") -> None:
+        self.imported += other.imported
+        self.errors.extend(other.errors)
+
+
+class ImportProductsUseCase:
+    """Application service that validates rows and persists them in batches."""
+
+    def __init__(
+        self,
+        repository: ProductRepository,
+        batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+    ) -> None:
+        if batch_size <= 0 or batch_size > MAX_IMPORT_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {MAX_IMPORT_BATCH_SIZE}")
+        self._repository = repository
+        self.batch_size = batch_size
+
+    def execute(self, rows: list[ImportProductRow]) -> ImportProductsResult:
+        result = ImportProductsResult()
+        for start in range(0, len(rows), self.batch_size):
+            result.merge(self.import_batch(rows[start : start + self.batch_size]))
+        return result
+
+    def import_batch(self, rows: list[ImportProductRow]) -> ImportProductsResult:
+        """Validate rows with domain rules and insert the valid ones in one statement."""
+
+        result = ImportProductsResult()
+        valid_rows: list[ImportProductRow] = []
+        products: list[Product] = []
+
+        for row in rows:
+            command = row.command
+            try:
+                product = Product(
+                    name=command.name,
+                    description=command.description,
+                    price_cents=command.price_cents,
+                    currency=command.currency,
+                    stock=command.stock,
+                    is_active=command.is_active,
+                )
+            except ValueError as exc:
+                result.errors.append(ImportRowError(line=row.line, error=str(exc)))
+                continue
+            valid_rows.append(row)
+            products.append(product)
+
+        if not products:
+            return result
+
+        # Only data the database refused becomes row errors; anything else (lost
+        # connection, bugs) fails the import instead of being reported as bad rows.
+        try:
+            self._repository.save_many(products)
+        except ProductBatchRejectedError as exc:
+            logger.warning(
+                "product import batch of lines %s-%s rejected: %s",
+                valid_rows[0].line,
+                valid_rows[-1].line,
+                exc,
+            )
+            result.errors.extend(
+                ImportRowError(line=row.line, error="batch insert failed") for row in valid_rows
+            )
+            return result
+        except Exception:
+            logger.exception(
+                "product import batch of lines %s-%s failed",
+                valid_rows[0].line,
+                valid_rows[-1].line,
+            )
+            raise
+
+        result.imported = len(products)
+        return result
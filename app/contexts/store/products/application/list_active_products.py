@@ -1,7 +1,17 @@
 """List active products use case."""
 
-from app.contexts.store.products.domain.product import Product
-from app.contexts.store.products.domain.product_repository import ProductRepository
+from collections.abc import Iterator
+
+from app.contexts.store.products.domain.product_repository import (
+    ProductCursor,
+    ProductPage,
+    ProductRepository,
+    ProductSummary,
+    ProductView,
+)
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
 
 
 class ListActiveProductsUseCase:
@@ -10,5 +20,27 @@ class ListActiveProductsUseCase:
     def __init__(self, repository: ProductRepository) -> None:
         self._repository = repository
 
-    def execute(self) -> list[Product]:
-        return self._repository.list_active()
+    def execute(self, view: ProductView = "full") -> list[ProductSummary]:
+        return self._repository.list_active(view)
+
+    def execute_page(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: ProductCursor | None = None,
+        view: ProductView = "full",
+    ) -> ProductPage:
+        if limit <= 0 or limit > MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        return self._repository.list_active_page(limit, after, view)
+
+    def stream(
+        self,
+        view: ProductView = "full",
+        chunk_size: int = 1000,
+    ) -> Iterator[list[ProductSummary]]:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be greater than zero")
+        return self._repository.iter_active(view, chunk_size)
+
+    def catalog_version(self) -> str:
+        return self._repository.get_catalog_version()
@@ -0,0 +1,35 @@
+"""Search active products use case."""
+
+from app.contexts.store.products.application.list_active_products import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+)
+from app.contexts.store.products.domain.product_repository import (
+    ProductRepository,
+    ProductSearchCursor,
+    ProductSearchPage,
+)
+
+MAX_QUERY_LENGTH = 200
+
+
+class SearchProductsUseCase:
+    """Application service that runs ranked full-text search over active products."""
+
+    def __init__(self, repository: ProductRepository) -> None:
+        self._repository = repository
+
+    def execute(
+        self,
+        query: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: ProductSearchCursor | None = None,
+    ) -> ProductSearchPage:
+        normalized = " ".join(query.split())
+        if not normalized:
+            raise ValueError("query must not be empty")
+        if len(normalized) > MAX_QUERY_LENGTH:
+            raise ValueError(f"query must have at most {MAX_QUERY_LENGTH} characters")
+        if limit <= 0 or limit > MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        return self._repository.search_active(normalized, limit, after)
@@ -2,7 +2,9 @@
 
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from app.shared.domain.ids import new_id
 
 
 def _utc_now() -> datetime:
@@ -19,7 +21,7 @@ class Product:
     description: str | None = None
     currency: str = "MXN"
     is_active: bool = True
-    id: UUID = field(default_factory=uuid4)
+    id: UUID = field(default_factory=new_id)
     created_at: datetime = field(default_factory=_utc_now)
 
     def __post_init__(self) -> None:
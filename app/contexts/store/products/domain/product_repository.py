@@ -1,9 +1,69 @@
 """Product repository port (hexagonal)."""
 
-from typing import Protocol
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal, Protocol
+from uuid import UUID
 
 from app.contexts.store.products.domain.product import Product
 
+ProductView = Literal["full", "summary"]
+
+
+@dataclass(frozen=True, slots=True)
+class ProductSummary:
+    """Read-only catalog row projected from storage for the `summary` view."""
+
+    id: UUID
+    name: str
+    price_cents: int
+    currency: str
+    stock: int
+    is_active: bool
+    created_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class ProductListing(ProductSummary):
+    """Read-only catalog row projected from storage for the `full` view."""
+
+    description: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class ProductCursor:
+    """Keyset position inside the active catalog ordered by (created_at, id) DESC."""
+
+    created_at: datetime
+    id: UUID
+
+
+@dataclass(frozen=True, slots=True)
+class ProductPage:
+    """One page of the active catalog and the position where the next one starts."""
+
+    items: list[ProductSummary]
+    next_cursor: ProductCursor | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ProductSearchCursor:
+    """Keyset position inside search results ordered by (score, id); lower score ranks first."""
+
+    score: float
+    id: UUID
+
+
+@dataclass(frozen=True, slots=True)
+class ProductSearchPage:
+    items: list[Product]
+    next_cursor: ProductSearchCursor | None = None
+
+
+class ProductBatchRejectedError(Exception):
+    """Raised when storage refuses a batch because of its data (constraint or value errors)."""
+
 
 class ProductRepository(Protocol):
     """Port used by application layer to persist and query products."""
@@ -11,5 +71,38 @@ class ProductRepository(Protocol):
     def save(self, product: Product) -> Product:
         ...
 
-    def list_active(self) -> list[Product]:
+    def save_many(self, products: list[Product]) -> None:
+        """Insert every product or none; raises ProductBatchRejectedError for bad data."""
+        ...
+
+    def get_by_id(self, product_id: UUID) -> Product | None:
+        ...
+
+    def list_active(self, view: ProductView = "full") -> list[ProductSummary]:
+        ...
+
+    def list_active_page(
+        self,
+        limit: int,
+        after: ProductCursor | None = None,
+        view: ProductView = "full",
+    ) -> ProductPage:
+        ...
+
+    def iter_active(
+        self,
+        view: ProductView = "full",
+        chunk_size: int = 1000,
+    ) -> Iterator[list[ProductSummary]]:
+        ...
+
+    def get_catalog_version(self) -> str:
+        ...
+
+    def search_active(
+        self,
+        query: str,
+        limit: int,
+        after: ProductSearchCursor | None = None,
+    ) -> ProductSearchPage:
         ...
@@ -0,0 +1,185 @@
+"""In-process catalog cache decorating a ProductRepository."""
+
+from collections.abc import Collection, Iterator
+from dataclasses import replace
+from functools import lru_cache
+from uuid import UUID
+
+from app.contexts.store.products.domain.product import Product
+from app.contexts.store.products.domain.product_repository import (
+    ProductCursor,
+    ProductPage,
+    ProductRepository,
+    ProductSearchCursor,
+    ProductSearchPage,
+    ProductSummary,
+    ProductView,
+)
+from app.shared.config.settings import get_settings
+from app.shared.infrastructure.cache.ttl_cache import TTLCache
+
+CatalogCache = TTLCache[tuple[object, ...], object]
+ProductDetailCache = TTLCache[UUID, Product]
+
+
+@lru_cache(maxsize=1)
+def get_product_catalog_cache() -> CatalogCache:
+    """Return the process-wide cache holding active catalog query results."""
+
+    settings = get_settings()
+    return TTLCache(
+        max_entries=settings.product_cache_max_entries,
+        ttl_seconds=settings.product_cache_ttl_seconds,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_product_detail_cache() -> ProductDetailCache:
+    """Return the process-wide cache of single products keyed by id."""
+
+    settings = get_settings()
+    return TTLCache(
+        max_entries=settings.product_detail_cache_max_entries,
+        ttl_seconds=settings.product_detail_cache_ttl_seconds,
+    )
+
+
+class ProductCacheInvalidation:
+    """Drops cached entries for products written outside this context (stock moves).
+
+    Catalog listings carry stock and the catalog version, so any change empties
+    the catalog cache; single products are dropped by id.
+    """
+
+    def __init__(self, cache: CatalogCache, detail_cache: ProductDetailCache) -> None:
+        self._cache = cache
+        self._detail_cache = detail_cache
+
+    def invalidate_products(self, product_ids: Collection[UUID]) -> None:
+        self._cache.clear()
+        for product_id in product_ids:
+            self._detail_cache.invalidate(product_id)
+
+
+def get_product_cache_invalidation() -> ProductCacheInvalidation:
+    """Return an invalidator over the process-wide product caches."""
+
+    return ProductCacheInvalidation(get_product_catalog_cache(), get_product_detail_cache())
+
+
+class CachedProductRepository(ProductRepository):
+    """Read-through cache for catalog queries with write-through invalidation.
+
+    Entries are snapshots of the active catalog and of single products; any
+    write done through this repository drops the affected ones. Writes made by
+    other processes become visible once the entries expire.
+
+    Listings are keyed by the catalog version, and the repository (one per
+    request) keeps the first version it reads: a listing is always the one
+    that matches the version served as its ETag, even when the version entry
+    expires in between. Fills carry the cache generation taken before the
+    read, so a load that raced with an invalidation is not stored.
+
+    Listings are frozen rows and are shared as they are. `Product` is a mutable
+    entity, so the detail cache stores and hands out copies: a caller mutating
+    its product cannot change what other requests read.
+    """
+
+    def __init__(
+        self,
+        inner: ProductRepository,
+        cache: CatalogCache,
+        detail_cache: ProductDetailCache,
+    ) -> None:
+        self._inner = inner
+        self._cache = cache
+        self._detail_cache = detail_cache
+        self._catalog_version: str | None = None
+
+    def save(self, product: Product) -> Product:
+        saved = self._inner.save(product)
+        self._cache.clear()
+        self._detail_cache.invalidate(saved.id)
+        self._catalog_version = None
+        return saved
+
+    def save_many(self, products: list[Product]) -> None:
+        self._inner.save_many(products)
+        self._cache.clear()
+        for product in products:
+            self._detail_cache.invalidate(product.id)
+        self._catalog_version = None
+
+    def get_by_id(self, product_id: UUID) -> Product | None:
+        cached = self._detail_cache.get(product_id)
+        if cached is not None:
+            return replace(cached)
+
+        generation = self._detail_cache.generation
+        product = self._inner.get_by_id(product_id)
+        if product is not None:
+            self._detail_cache.set(product_id, replace(product), generation)
+        return product
+
+    def list_active(self, view: ProductView = "full") -> list[ProductSummary]:
+        generation = self._cache.generation
+        key = ("list_active", view, self.get_catalog_version())
+        cached = self._cache.get(key)
+        if isinstance(cached, tuple):
+            return list(cached)
+
+        listings = self._inner.list_active(view)
+        self._cache.set(key, tuple(listings), generation)
+        return listings
+
+    def list_active_page(
+        self,
+        limit: int,
+        after: ProductCursor | None = None,
+        view: ProductView = "full",
+    ) -> ProductPage:
+        generation = self._cache.generation
+        key = ("list_active_page", limit, after, view, self.get_catalog_version())
+        cached = self._cache.get(key)
+        if isinstance(cached, ProductPage):
+            return ProductPage(items=list(cached.items), next_cursor=cached.next_cursor)
+
+        page = self._inner.list_active_page(limit, after, view)
+        self._cache.set(
+            key,
+            ProductPage(items=list(page.items), next_cursor=page.next_cursor),
+            generation,
+        )
+        return page
+
+    def iter_active(
+        self,
+        view: ProductView = "full",
+        chunk_size: int = 1000,
+    ) -> Iterator[list[ProductSummary]]:
+        # Full exports are streamed from storage; caching them would defeat flat memory.
+        return self._inner.iter_active(view, chunk_size)
+
+    def get_catalog_version(self) -> str:
+        if self._catalog_version is not None:
+            return self._catalog_version
+
+        key = ("catalog_version",)
+        cached = self._cache.get(key)
+        if isinstance(cached, str):
+            self._catalog_version = cached
+            return cached
+
+        generation = self._cache.generation
+        version = self._inner.get_catalog_version()
+        self._cache.set(key, version, generation)
+        self._catalog_version = version
+        return version
+
+    def search_active(
+        self,
+        query: str,
+        limit: int,
+        after: ProductSearchCursor | None = None,
+    ) -> ProductSearchPage:
+        return self._inner.search_active(query, limit, after)
@@ -0,0 +1,115 @@
+"""Incremental NDJSON/CSV parsing for streamed product import bodies."""
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/jsonl", "application/ndjson"}
+CSV_MEDIA_TYPES = {"text/csv", "application/csv"}
+
+
+@dataclass(frozen=True, slots=True)
+class RawImportRow:
+    """A raw record read from the body, or the reason it could not be read."""
+
+    line: int
+    values: dict[str, object] | None = None
+    error: str | None = None
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str | None]]:
+    # Only the new chunk is scanned for newlines and a partial line is kept as a list
+    # of pieces joined once, so a line spanning many chunks costs linear time.
+    pending: list[bytes] = []
+    line_number = 0
+
+    async for chunk in chunks:
+        start = 0
+        newline = chunk.find(b"\n")
+        while newline != -1:
+            pending.append(chunk[start:newline])
+            line_number += 1
+            yield line_number, _decode(b"".join(pending))
+            pending.clear()
+            start = newline + 1
+            newline = chunk.find(b"\n", start)
+        if start < len(chunk):
+            pending.append(chunk[start:])
+
+    if pending:
+        yield line_number + 1, _decode(b"".join(pending))
+
+
+def _decode(raw_line: bytes) -> str | None:
+    try:
+        return raw_line.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        return None
+
+
+async def iter_ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[RawImportRow]:
+    async for line_number, line in _iter_lines(chunks):
+        if line is None:
+            yield RawImportRow(line=line_number, error="line is not valid UTF-8")
+            continue
+        if not line.strip():
+            continue
+
+        try:
+            values = json.loads(line)
+        except ValueError:
+            yield RawImportRow(line=line_number, error="line is not valid JSON")
+            continue
+        if not isinstance(values, dict):
+            yield RawImportRow(line=line_number, error="line must be a JSON object")
+            continue
+
+        yield RawImportRow(line=line_number, values=values)
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[RawImportRow]:
+    """Yield CSV records keyed by the header row; quoted fields may span lines."""
+
+    header: list[str] | None = None
+    pending = ""
+    record_line = 0
+
+    async for line_number, line in _iter_lines(chunks):
+        if line is None:
+            yield RawImportRow(line=line_number, error="line is not valid UTF-8")
+            continue
+
+        if not pending:
+            record_line = line_number
+            pending = line
+        else:
+            pending = f"{pending}\n{line}"
+        # An odd number of quotes means a quoted field continues on the next line.
+        if pending.count('"') % 2 == 1:
+            continue
+
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+
+        fields = next(csv.reader(io.StringIO(record)))
+        if header is None:
+            header = [name.strip() for name in fields]
+            continue
+        if len(fields) != len(header):
+            yield RawImportRow(
+                line=record_line,
+                error=f"expected {len(header)} columns, got {len(fields)}",
+            )
+            continue
+
+        # Empty cells fall back to request defaults (description, currency, is_active).
+        values: dict[str, object] = {
+            name: value for name, value in zip(header, fields, strict=True) if value != ""
+        }
+        yield RawImportRow(line=record_line, values=values)
+
+    if pending:
+        yield RawImportRow(line=record_line, error="unterminated quoted field")
@@ -1,25 +1,79 @@
 """HTTP router for products context."""
 
+import hashlib
 from datetime import datetime
+from typing import Any, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field, field_validator
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, field_validator
 from sqlalchemy.orm import Session
 
 from app.contexts.store.products.application.create_product import (
     CreateProductCommand,
     CreateProductUseCase,
 )
+from app.contexts.store.products.application.get_product import (
+    GetProductUseCase,
+    ProductNotFoundError,
+)
+from app.contexts.store.products.application.import_products import (
+    MAX_IMPORT_BATCH_SIZE,
+    ImportProductRow,
+    ImportProductsResult,
+    ImportProductsUseCase,
+    ImportRowError,
+)
 from app.contexts.store.products.application.list_active_products import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
     ListActiveProductsUseCase,
 )
+from app.contexts.store.products.application.search_products import (
+    MAX_QUERY_LENGTH,
+    SearchProductsUseCase,
+)
 from app.contexts.store.products.domain.product import Product
-from app.contexts.store.products.domain.product_repository import ProductRepository
+from app.contexts.store.products.domain.product_repository import (
+    ProductCursor,
+    ProductRepository,
+    ProductSearchCursor,
+    ProductView,
+)
+from app.contexts.store.products.infrastructure.cached_product_repository import (
+    CachedProductRepository,
+    CatalogCache,
+    ProductDetailCache,
+    get_product_catalog_cache,
+    get_product_detail_cache,
+)
+from app.contexts.store.products.infrastructure.http.product_import_parser import (
+    CSV_MEDIA_TYPES,
+    NDJSON_MEDIA_TYPES,
+    RawImportRow,
+    iter_csv_rows,
+    iter_ndjson_rows,
+)
 from app.contexts.store.products.infrastructure.sql_product_repository import (
     SQLProductRepository,
 )
+from app.shared.config.settings import Settings, get_settings
+from app.shared.infrastructure.cache.ttl_cache import CacheStats
 from app.shared.infrastructure.db.session import get_db
+from app.shared.infrastructure.http.cursor import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+from app.shared.infrastructure.http.admin_auth import require_admin
+from app.shared.infrastructure.http.responses import FastJSONResponse
+from app.shared.infrastructure.http.streaming import (
+    NDJSON_MEDIA_TYPE,
+    iter_json_array,
+    iter_ndjson,
+)
 
 router = APIRouter(prefix="/products", tags=["products"])
 
@@ -57,6 +111,67 @@ class ProductResponse(BaseModel):
     created_at: datetime
 
 
+class ProductSummaryResponse(BaseModel):
+    id: UUID
+    name: str
+    price_cents: int
+    currency: str
+    stock: int
+    is_active: bool
+    created_at: datetime
+
+
+class ProductPageResponse(BaseModel):
+    items: list[ProductResponse | ProductSummaryResponse]
+    next_cursor: str | None = None
+
+
+# Schemas FastJSONResponse validates and encodes against, one per listing view.
+_PRODUCT_LIST_SCHEMAS: dict[ProductView, TypeAdapter[Any]] = {
+    "full": TypeAdapter(list[ProductResponse]),
+    "summary": TypeAdapter(list[ProductSummaryResponse]),
+}
+_PRODUCT_PAGE_SCHEMA: TypeAdapter[Any] = TypeAdapter(ProductPageResponse)
+
+
+class ImportRowErrorResponse(BaseModel):
+    line: int
+    error: str
+
+
+class ProductImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: list[ImportRowErrorResponse]
+
+
+class CacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    size: int
+    max_entries: int
+    ttl_seconds: float
+
+
+class ProductCachesStatsResponse(BaseModel):
+    catalog: CacheStatsResponse
+    product_detail: CacheStatsResponse
+
+
+def _to_cache_stats_response(stats: CacheStats) -> CacheStatsResponse:
+    return CacheStatsResponse(
+        hits=stats.hits,
+        misses=stats.misses,
+        hit_ratio=stats.hit_ratio,
+        evictions=stats.evictions,
+        size=stats.size,
+        max_entries=stats.max_entries,
+        ttl_seconds=stats.ttl_seconds,
+    )
+
+
 def _to_response(product: Product) -> ProductResponse:
     return ProductResponse(
         id=product.id,
@@ -70,8 +185,80 @@ def _to_response(product: Product) -> ProductResponse:
     )
 
 
-def get_product_repository(db: Session = Depends(get_db)) -> ProductRepository:
-    return SQLProductRepository(db)
+def _to_import_row(raw_row: RawImportRow) -> ImportProductRow | ImportRowError:
+    if raw_row.values is None:
+        return ImportRowError(line=raw_row.line, error=raw_row.error or "invalid row")
+
+    try:
+        payload = CreateProductRequest.model_validate(raw_row.values)
+    except ValidationError as exc:
+        detail = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in exc.errors()
+        )
+        return ImportRowError(line=raw_row.line, error=detail)
+
+    return ImportProductRow(
+        line=raw_row.line,
+        command=CreateProductCommand(
+            name=payload.name,
+            description=payload.description,
+            price_cents=payload.price_cents,
+            currency=payload.currency,
+            stock=payload.stock,
+            is_active=payload.is_active,
+        ),
+    )
+
+
+def _encode_product_cursor(cursor: ProductCursor) -> str:
+    return encode_cursor({"created_at": cursor.created_at.isoformat(), "id": str(cursor.id)})
+
+
+def _decode_product_cursor(token: str) -> ProductCursor:
+    values = decode_cursor(token)
+    try:
+        return ProductCursor(
+            created_at=datetime.fromisoformat(values["created_at"]),
+            id=UUID(values["id"]),
+        )
+    except (KeyError, ValueError) as exc:
+        raise InvalidCursorError("invalid cursor") from exc
+
+
+def _catalog_etag(version: str, view: str, limit: int | None, cursor: str | None) -> str:
+    representation = f"{version}|{view}|{limit}|{cursor}".encode("utf-8")
+    return f'W/"{hashlib.sha256(representation).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(candidate.removeprefix("W/") == opaque_tag for candidate in candidates)
+
+
+def _encode_search_cursor(cursor: ProductSearchCursor) -> str:
+    return encode_cursor({"score": repr(cursor.score), "id": str(cursor.id)})
+
+
+def _decode_search_cursor(token: str) -> ProductSearchCursor:
+    values = decode_cursor(token)
+    try:
+        return ProductSearchCursor(score=float(values["score"]), id=UUID(values["id"]))
+    except (KeyError, ValueError) as exc:
+        raise InvalidCursorError("invalid cursor") from exc
+
+
+def get_product_repository(
+    db: Session = Depends(get_db),
+    cache: CatalogCache = Depends(get_product_catalog_cache),
+    detail_cache: ProductDetailCache = Depends(get_product_detail_cache),
+) -> ProductRepository:
+    return CachedProductRepository(SQLProductRepository(db), cache, detail_cache)
 
 
 @router.post("", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
@@ -101,10 +288,187 @@ def create_product(
     return _to_response(product)
 
 
-@router.get("", response_model=list[ProductResponse])
+@router.post(":bulk", response_model=ProductImportResponse)
+async def import_products(
+    request: Request,
+    batch_size: int | None = Query(default=None, ge=1, le=MAX_IMPORT_BATCH_SIZE),
+    repository: ProductRepository = Depends(get_product_repository),
+    settings: Settings = Depends(get_settings),
+) -> ProductImportResponse:
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type in NDJSON_MEDIA_TYPES:
+        raw_rows = iter_ndjson_rows(request.stream())
+    elif media_type in CSV_MEDIA_TYPES:
+        raw_rows = iter_csv_rows(request.stream())
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="body must be application/x-ndjson or text/csv",
+        )
+
+    use_case = ImportProductsUseCase(
+        repository,
+        batch_size=batch_size or settings.product_import_batch_size,
+    )
+    result = ImportProductsResult()
+    batch: list[ImportProductRow] = []
+
+    async for raw_row in raw_rows:
+        row = _to_import_row(raw_row)
+        if isinstance(row, ImportRowError):
+            result.errors.append(row)
+            continue
+        batch.append(row)
+        if len(batch) >= use_case.batch_size:
+            result.merge(await run_in_threadpool(use_case.import_batch, batch))
+            batch = []
+    if batch:
+        result.merge(await run_in_threadpool(use_case.import_batch, batch))
+
+    return ProductImportResponse(
+        imported=result.imported,
+        failed=result.failed,
+        errors=[
+            ImportRowErrorResponse(line=error.line, error=error.error)
+            for error in sorted(result.errors, key=lambda error: error.line)
+        ],
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/json": {}, NDJSON_MEDIA_TYPE: {}},
+            "description": "Active catalog streamed as a JSON array or NDJSON",
+        }
+    },
+)
+def export_products(
+    output_format: Literal["json", "ndjson"] = Query(default="ndjson", alias="format"),
+    view: ProductView = Query(default="full"),
+    repository: ProductRepository = Depends(get_product_repository),
+    settings: Settings = Depends(get_settings),
+) -> StreamingResponse:
+    use_case = ListActiveProductsUseCase(repository)
+    chunks = use_case.stream(view, chunk_size=settings.product_export_chunk_size)
+
+    if output_format == "json":
+        return StreamingResponse(iter_json_array(chunks), media_type="application/json")
+    return StreamingResponse(iter_ndjson(chunks), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get("/search", response_model=ProductPageResponse, response_class=FastJSONResponse)
+def search_products(
+    q: str = Query(min_length=1, max_length=MAX_QUERY_LENGTH),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    repository: ProductRepository = Depends(get_product_repository),
+) -> FastJSONResponse:
+    use_case = SearchProductsUseCase(repository)
+
+    try:
+        after = _decode_search_cursor(cursor) if cursor is not None else None
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    try:
+        page = use_case.execute(q, limit=limit, after=after)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(exc),
+        ) from exc
+
+    return FastJSONResponse(
+        {
+            "items": page.items,
+            "next_cursor": (
+                _encode_search_cursor(page.next_cursor) if page.next_cursor else None
+            ),
+        },
+        schema=_PRODUCT_PAGE_SCHEMA,
+    )
+
+
+@router.get(
+    "",
+    response_model=list[ProductResponse] | list[ProductSummaryResponse] | ProductPageResponse,
+    response_class=FastJSONResponse,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Catalog unchanged"}},
+)
 def list_products(
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    view: ProductView = Query(default="full"),
+    if_none_match: str | None = Header(default=None),
     repository: ProductRepository = Depends(get_product_repository),
-) -> list[ProductResponse]:
+    settings: Settings = Depends(get_settings),
+) -> Response:
     use_case = ListActiveProductsUseCase(repository)
-    products = use_case.execute()
-    return [_to_response(product) for product in products]
+
+    etag = _catalog_etag(use_case.catalog_version(), view, limit, cursor)
+    cache_headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={settings.product_catalog_max_age_seconds}, must-revalidate"
+        ),
+    }
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    # Projections are encoded straight from attributes against the view's schema.
+    if limit is None and cursor is None:
+        return FastJSONResponse(
+            use_case.execute(view),
+            schema=_PRODUCT_LIST_SCHEMAS[view],
+            headers=cache_headers,
+        )
+
+    try:
+        after = _decode_product_cursor(cursor) if cursor is not None else None
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    page = use_case.execute_page(limit=limit or DEFAULT_PAGE_SIZE, after=after, view=view)
+    return FastJSONResponse(
+        {
+            "items": page.items,
+            "next_cursor": (
+                _encode_product_cursor(page.next_cursor) if page.next_cursor else None
+            ),
+        },
+        schema=_PRODUCT_PAGE_SCHEMA,
+        headers=cache_headers,
+    )
+
+
+@router.get(
+    "/cache/stats",
+    response_model=ProductCachesStatsResponse,
+    dependencies=[Depends(require_admin)],
+)
+def product_cache_stats(
+    cache: CatalogCache = Depends(get_product_catalog_cache),
+    detail_cache: ProductDetailCache = Depends(get_product_detail_cache),
+) -> ProductCachesStatsResponse:
+    return ProductCachesStatsResponse(
+        catalog=_to_cache_stats_response(cache.stats()),
+        product_detail=_to_cache_stats_response(detail_cache.stats()),
+    )
+
+
+@router.get("/{product_id}", response_model=ProductResponse)
+def get_product(
+    product_id: UUID,
+    repository: ProductRepository = Depends(get_product_repository),
+) -> ProductResponse:
+    use_case = GetProductUseCase(repository)
+
+    try:
+        product = use_case.execute(product_id)
+    except ProductNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+    return _to_response(product)
@@ -1,19 +1,55 @@
 """SQLAlchemy ORM model for products."""
 
-from datetime import datetime
+from datetime import UTC, datetime
+from uuid import UUID
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text, func
+from sqlalchemy import (
+    Boolean,
+    ColumnElement,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    column,
+    func,
+    literal_column,
+    table,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.shared.infrastructure.db.base import Base
+from app.shared.infrastructure.db.types import GUID
+
+PRODUCT_SEARCH_CONFIG = "spanish"
+
+
+def _utc_now() -> datetime:
+    return datetime.now(UTC)
 
 
 class ProductModel(Base):
     """ORM persistence model mapped to products table."""
 
     __tablename__ = "products"
+    __table_args__ = (
+        # Backs keyset pagination of the active catalog: WHERE is_active ORDER BY created_at, id.
+        Index("ix_products_is_active_created_at_id", "is_active", "created_at", "id"),
+        # MAX(updated_at) for the catalog version is read from the end of this index.
+        Index("ix_products_updated_at", "updated_at"),
+        # Full-text search on Postgres; must match `product_search_document()` expression.
+        Index(
+            "ix_products_search_document",
+            text(
+                f"to_tsvector('{PRODUCT_SEARCH_CONFIG}'::regconfig, "
+                "name || ' ' || coalesce(description, ''))"
+            ),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    id: Mapped[UUID] = mapped_column(GUID(), primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     price_cents: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -25,3 +61,29 @@ class ProductModel(Base):
         nullable=False,
         server_default=func.now(),
     )
+    # Bumped by every write to the row, stock moves included; drives the catalog ETag.
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=_utc_now,
+    )
+
+
+def product_search_document() -> ColumnElement[object]:
+    """Postgres tsvector over name and description; queries must reuse it to hit the index."""
+
+    columns = ProductModel.__table__.c
+    return func.to_tsvector(
+        literal_column(f"'{PRODUCT_SEARCH_CONFIG}'::regconfig"),
+        columns.name + literal_column("' '") + func.coalesce(columns.description, literal_column("''")),
+    )
+
+
+# SQLite FTS5 index created by migration 0001 and kept in sync by SQLProductRepository
+# writes (not part of Base.metadata).
+products_fts = table(
+    "products_fts",
+    column("product_id", GUID()),
+    column("name"),
+    column("description"),
+)
@@ -1,18 +1,67 @@
 """SQLAlchemy adapter implementing ProductRepository port."""
 
+import re
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import Select, select
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    tuple_,
+)
+from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.orm import Session
 
 from app.contexts.store.products.domain.product import Product
-from app.contexts.store.products.domain.product_repository import ProductRepository
-from app.contexts.store.products.infrastructure.product_model import ProductModel
+from app.contexts.store.products.domain.product_repository import (
+    ProductBatchRejectedError,
+    ProductCursor,
+    ProductListing,
+    ProductPage,
+    ProductRepository,
+    ProductSearchCursor,
+    ProductSearchPage,
+    ProductSummary,
+    ProductView,
+)
+from app.contexts.store.products.infrastructure.product_model import (
+    PRODUCT_SEARCH_CONFIG,
+    ProductModel,
+    product_search_document,
+    products_fts,
+)
+
+_SEARCH_TOKEN = re.compile(r"\w+")
+# bm25 weights follow products_fts column order: product_id (unindexed), name, description.
+_FTS_BM25_WEIGHTS = (0.0, 10.0, 1.0)
+
+# Column projections for catalog listings per view.
+_SUMMARY_COLUMNS = (
+    ProductModel.id,
+    ProductModel.name,
+    ProductModel.price_cents,
+    ProductModel.currency,
+    ProductModel.stock,
+    ProductModel.is_active,
+    ProductModel.created_at,
+)
+_LISTING_COLUMNS: dict[ProductView, tuple[Any, ...]] = {
+    "summary": _SUMMARY_COLUMNS,
+    "full": (*_SUMMARY_COLUMNS, ProductModel.description),
+}
 
 
 def _to_domain(model: ProductModel) -> Product:
     return Product(
-        id=UUID(model.id),
+        id=model.id,
         name=model.name,
         description=model.description,
         price_cents=model.price_cents,
@@ -23,6 +72,59 @@ def _to_domain(model: ProductModel) -> Product:
     )
 
 
+def _to_listing(row: Row[Any]) -> ProductSummary:
+    if len(row) > len(_SUMMARY_COLUMNS):
+        return ProductListing(
+            id=row.id,
+            name=row.name,
+            price_cents=row.price_cents,
+            currency=row.currency,
+            stock=row.stock,
+            is_active=row.is_active,
+            created_at=row.created_at,
+            description=row.description,
+        )
+    return ProductSummary(
+        id=row.id,
+        name=row.name,
+        price_cents=row.price_cents,
+        currency=row.currency,
+        stock=row.stock,
+        is_active=row.is_active,
+        created_at=row.created_at,
+    )
+
+
+def _to_row(product: Product) -> dict[str, object]:
+    return {
+        "id": product.id,
+        "name": product.name,
+        "description": product.description,
+        "price_cents": product.price_cents,
+        "currency": product.currency,
+        "stock": product.stock,
+        "is_active": product.is_active,
+        "created_at": product.created_at,
+        "updated_at": datetime.now(UTC),
+    }
+
+
+def _to_fts_row(product: Product) -> dict[str, object]:
+    return {
+        "product_id": product.id,
+        "name": product.name,
+        "description": product.description or "",
+    }
+
+
+def _to_fts_match(query: str) -> str | None:
+    # Quote every token so user input never reaches FTS5 query syntax; `*` enables prefixes.
+    tokens = _SEARCH_TOKEN.findall(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
 class SQLProductRepository(ProductRepository):
     """Product repository backed by SQLAlchemy session."""
 
@@ -30,26 +132,165 @@ class SQLProductRepository(ProductRepository):
         self._session = session
 
     def save(self, product: Product) -> Product:
-        model = ProductModel(
-            id=str(product.id),
-            name=product.name,
-            description=product.description,
-            price_cents=product.price_cents,
-            currency=product.currency,
-            stock=product.stock,
-            is_active=product.is_active,
-            created_at=product.created_at,
-        )
-        self._session.add(model)
+        # Insert or update by id; either way updated_at moves the catalog version.
+        model = self._session.merge(ProductModel(**_to_row(product)))
+        self._index_for_search([product], replace=True)
         self._session.commit()
         self._session.refresh(model)
         return _to_domain(model)
 
-    def list_active(self) -> list[Product]:
-        stmt: Select[tuple[ProductModel]] = (
-            select(ProductModel)
+    def save_many(self, products: list[Product]) -> None:
+        if len(products) == 0:
+            return
+
+        # One multi-row INSERT ... VALUES per call instead of add/flush/refresh per product.
+        stmt = insert(ProductModel).values([_to_row(product) for product in products])
+        try:
+            self._session.execute(stmt)
+            self._index_for_search(products)
+            self._session.commit()
+        except (IntegrityError, DataError) as exc:
+            self._session.rollback()
+            raise ProductBatchRejectedError(str(exc.orig)) from exc
+        except Exception:
+            self._session.rollback()
+            raise
+
+    def get_by_id(self, product_id: UUID) -> Product | None:
+        model = self._session.get(ProductModel, product_id)
+        return _to_domain(model) if model is not None else None
+
+    def list_active(self, view: ProductView = "full") -> list[ProductSummary]:
+        # Core rows of the projected columns: no identity map, no entity or domain validation.
+        stmt: Select[Any] = (
+            select(*_LISTING_COLUMNS[view])
             .where(ProductModel.is_active.is_(True))
             .order_by(ProductModel.created_at.desc())
         )
-        models = self._session.execute(stmt).scalars().all()
-        return [_to_domain(model) for model in models]
+        return [_to_listing(row) for row in self._session.execute(stmt)]
+
+    def list_active_page(
+        self,
+        limit: int,
+        after: ProductCursor | None = None,
+        view: ProductView = "full",
+    ) -> ProductPage:
+        stmt: Select[Any] = (
+            select(*_LISTING_COLUMNS[view])
+            .where(ProductModel.is_active.is_(True))
+            .order_by(ProductModel.created_at.desc(), ProductModel.id.desc())
+            .limit(limit + 1)
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(ProductModel.created_at, ProductModel.id)
+                < (after.created_at, after.id)
+            )
+
+        rows = self._session.execute(stmt).all()
+        items = [_to_listing(row) for row in rows[:limit]]
+
+        next_cursor: ProductCursor | None = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = ProductCursor(created_at=last.created_at, id=last.id)
+
+        return ProductPage(items=items, next_cursor=next_cursor)
+
+    def iter_active(
+        self,
+        view: ProductView = "full",
+        chunk_size: int = 1000,
+    ) -> Iterator[list[ProductSummary]]:
+        # yield_per enables stream_results (server-side cursor on Postgres) and fetches
+        # `chunk_size` rows at a time, so memory stays flat regardless of catalog size.
+        stmt: Select[Any] = (
+            select(*_LISTING_COLUMNS[view])
+            .where(ProductModel.is_active.is_(True))
+            .order_by(ProductModel.created_at.desc(), ProductModel.id.desc())
+            .execution_options(yield_per=chunk_size)
+        )
+        result = self._session.execute(stmt)
+        try:
+            for rows in result.partitions():
+                yield [_to_listing(row) for row in rows]
+        finally:
+            result.close()
+
+    def get_catalog_version(self) -> str:
+        # Every product and stock write bumps updated_at, so MAX(updated_at) moves on
+        # edits, deactivations and checkouts alike. Both halves are index-only reads
+        # (ix_products_is_active_created_at_id, ix_products_updated_at).
+        stmt = select(
+            select(func.count())
+            .where(ProductModel.is_active.is_(True))
+            .scalar_subquery(),
+            select(func.max(ProductModel.updated_at)).scalar_subquery(),
+        )
+        count, last_updated_at = self._session.execute(stmt).one()
+        last_marker = last_updated_at.isoformat() if last_updated_at is not None else "-"
+        return f"{count}:{last_marker}"
+
+    def search_active(
+        self,
+        query: str,
+        limit: int,
+        after: ProductSearchCursor | None = None,
+    ) -> ProductSearchPage:
+        if self._is_sqlite():
+            match = _to_fts_match(query)
+            if match is None:
+                return ProductSearchPage(items=[])
+            matches = (
+                select(
+                    products_fts.c.product_id,
+                    func.bm25(literal_column("products_fts"), *_FTS_BM25_WEIGHTS).label("score"),
+                )
+                .where(literal_column("products_fts").op("MATCH")(match))
+                .subquery()
+            )
+            score: ColumnElement[float] = matches.c.score
+            stmt = select(ProductModel, score).join(
+                matches, matches.c.product_id == ProductModel.id
+            )
+        else:
+            ts_query = func.plainto_tsquery(
+                literal_column(f"'{PRODUCT_SEARCH_CONFIG}'::regconfig"), query
+            )
+            document = product_search_document()
+            score = -func.ts_rank(document, ts_query)
+            stmt = select(ProductModel, score).where(document.op("@@")(ts_query))
+
+        stmt = (
+            stmt.where(ProductModel.is_active.is_(True))
+            .order_by(score, ProductModel.id)
+            .limit(limit + 1)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(score, ProductModel.id) > (after.score, after.id))
+
+        rows = self._session.execute(stmt).all()
+        items = [_to_domain(model) for model, _ in rows[:limit]]
+
+        next_cursor: ProductSearchCursor | None = None
+        if len(rows) > limit:
+            _, last_score = rows[limit - 1]
+            next_cursor = ProductSearchCursor(score=float(last_score), id=items[-1].id)
+
+        return ProductSearchPage(items=items, next_cursor=next_cursor)
+
+    def _is_sqlite(self) -> bool:
+        return self._session.get_bind().dialect.name == "sqlite"
+
+    def _index_for_search(self, products: list[Product], replace: bool = False) -> None:
+        # Postgres indexes the expression itself; SQLite needs explicit FTS5 rows.
+        if self._is_sqlite():
+            if replace:
+                self._session.execute(
+                    delete(products_fts).where(
+                        products_fts.c.product_id.in_([product.id for product in products])
+                    )
+                )
+            self._session.execute(
+                insert(products_fts).values([_to_fts_row(product) for product in products])
+            )
@@ -1,20 +1,58 @@
 """FastAPI application entrypoint."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Annotated
 
 from fastapi import Depends, FastAPI
 from sqlalchemy.orm import Session
 
+from app.contexts.store.orders.infrastructure.mercadopago.mercadopago_gateway import (
+    close_shared_mercadopago_gateway,
+)
+from app.contexts.store.orders.infrastructure.order_expiration_sweeper import (
+    build_order_expiration_sweeper,
+)
+from app.contexts.store.orders.infrastructure.payment_outbox_worker import (
+    build_payment_outbox_worker,
+)
+from app.contexts.store.orders.infrastructure.payment_webhook_worker import (
+    build_payment_webhook_worker,
+)
+from app.contexts.store.orders.infrastructure.sql_sales_rollups import ensure_sales_rollups_supported
 from app.shared.infrastructure.http.routes import register_routes
 from app.shared.config.settings import get_settings
 from app.shared.infrastructure.db.ping import ping_db
-from app.shared.infrastructure.db.session import get_db
+from app.shared.infrastructure.db.session import engine, get_db
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run the enabled background workers and release pooled provider connections."""
+
+    settings = get_settings()
+    ensure_sales_rollups_supported(engine.dialect.name)
+    workers = []
+    if settings.payment_preference_mode == "outbox" and settings.payment_outbox_worker_enabled:
+        workers.append(build_payment_outbox_worker(settings))
+    if settings.payment_webhook_worker_enabled:
+        workers.append(build_payment_webhook_worker(settings))
+    if settings.order_expiration_sweeper_enabled:
+        workers.append(build_order_expiration_sweeper(settings))
+    for worker in workers:
+        worker.start()
+    try:
+        yield
+    finally:
+        for worker in workers:
+            worker.stop()
+        close_shared_mercadopago_gateway()
 
 
 def create_app() -> FastAPI:
     """Application factory used by runtime and tests."""
 
-    app = FastAPI(title="Ecommerce Backend", version="0.2.0")
+    app = FastAPI(title="Ecommerce Backend", version="0.2.0", lifespan=lifespan)
     _ = get_settings()
     register_routes(app)
 
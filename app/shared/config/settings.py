@@ -22,6 +22,7 @@ class Settings(BaseSettings):
     )
     env: Literal["dev", "test", "prod"] = Field(default="dev", alias="ENV")
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    admin_api_token: str | None = Field(default=None, alias="ADMIN_API_TOKEN")
     mp_access_token: str | None = Field(default=None, alias="MP_ACCESS_TOKEN")
     mp_public_key: str | None = Field(default=None, alias="MP_PUBLIC_KEY")
     mp_webhook_url: str | None = Field(default=None, alias="MP_WEBHOOK_URL")
@@ -29,6 +30,207 @@ class Settings(BaseSettings):
         default="sandbox",
         alias="MP_ENVIRONMENT",
     )
+    mp_http_max_connections: int = Field(
+        default=20,
+        ge=1,
+        alias="MP_HTTP_MAX_CONNECTIONS",
+    )
+    mp_http_max_keepalive_connections: int = Field(
+        default=10,
+        ge=0,
+        alias="MP_HTTP_MAX_KEEPALIVE_CONNECTIONS",
+    )
+    mp_http_keepalive_expiry_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        alias="MP_HTTP_KEEPALIVE_EXPIRY_SECONDS",
+    )
+    mp_http2: bool = Field(default=False, alias="MP_HTTP2")
+    mp_http_timeout_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        alias="MP_HTTP_TIMEOUT_SECONDS",
+    )
+    mp_call_deadline_seconds: float = Field(
+        default=10.0,
+        gt=0,
+        alias="MP_CALL_DEADLINE_SECONDS",
+    )
+    mp_slow_call_seconds: float = Field(
+        default=5.0,
+        gt=0,
+        alias="MP_SLOW_CALL_SECONDS",
+    )
+    mp_breaker_failure_rate: float = Field(
+        default=0.5,
+        gt=0,
+        le=1,
+        alias="MP_BREAKER_FAILURE_RATE",
+    )
+    mp_breaker_window_size: int = Field(
+        default=20,
+        ge=1,
+        alias="MP_BREAKER_WINDOW_SIZE",
+    )
+    mp_breaker_minimum_calls: int = Field(
+        default=5,
+        ge=1,
+        alias="MP_BREAKER_MINIMUM_CALLS",
+    )
+    mp_breaker_open_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        alias="MP_BREAKER_OPEN_SECONDS",
+    )
+    mp_breaker_half_open_calls: int = Field(
+        default=1,
+        ge=1,
+        alias="MP_BREAKER_HALF_OPEN_CALLS",
+    )
+    mp_max_concurrent_calls: int = Field(
+        default=10,
+        ge=1,
+        alias="MP_MAX_CONCURRENT_CALLS",
+    )
+    product_cache_ttl_seconds: float = Field(
+        default=30.0,
+        ge=0,
+        alias="PRODUCT_CACHE_TTL_SECONDS",
+    )
+    product_cache_max_entries: int = Field(
+        default=256,
+        ge=0,
+        alias="PRODUCT_CACHE_MAX_ENTRIES",
+    )
+    product_detail_cache_ttl_seconds: float = Field(
+        default=60.0,
+        ge=0,
+        alias="PRODUCT_DETAIL_CACHE_TTL_SECONDS",
+    )
+    product_detail_cache_max_entries: int = Field(
+        default=1024,
+        ge=0,
+        alias="PRODUCT_DETAIL_CACHE_MAX_ENTRIES",
+    )
+    product_import_batch_size: int = Field(
+        default=500,
+        ge=1,
+        le=2000,
+        alias="PRODUCT_IMPORT_BATCH_SIZE",
+    )
+    product_export_chunk_size: int = Field(
+        default=1000,
+        ge=1,
+        alias="PRODUCT_EXPORT_CHUNK_SIZE",
+    )
+    product_catalog_max_age_seconds: int = Field(
+        default=0,
+        ge=0,
+        alias="PRODUCT_CATALOG_MAX_AGE_SECONDS",
+    )
+    order_export_chunk_size: int = Field(
+        default=1000,
+        ge=1,
+        alias="ORDER_EXPORT_CHUNK_SIZE",
+    )
+    order_idempotency_ttl_seconds: int = Field(
+        default=86400,
+        ge=1,
+        alias="ORDER_IDEMPOTENCY_TTL_SECONDS",
+    )
+    order_idempotency_lease_seconds: int = Field(
+        default=120,
+        ge=1,
+        alias="ORDER_IDEMPOTENCY_LEASE_SECONDS",
+    )
+    order_expiration_seconds: int = Field(
+        default=86400,
+        ge=60,
+        alias="ORDER_EXPIRATION_SECONDS",
+    )
+    order_expiration_sweeper_enabled: bool = Field(
+        default=True,
+        alias="ORDER_EXPIRATION_SWEEPER_ENABLED",
+    )
+    order_expiration_sweep_interval_seconds: float = Field(
+        default=300.0,
+        gt=0,
+        alias="ORDER_EXPIRATION_SWEEP_INTERVAL_SECONDS",
+    )
+    order_expiration_batch_size: int = Field(
+        default=500,
+        ge=1,
+        le=5000,
+        alias="ORDER_EXPIRATION_BATCH_SIZE",
+    )
+    payment_preference_mode: Literal["sync", "outbox"] = Field(
+        default="sync",
+        alias="PAYMENT_PREFERENCE_MODE",
+    )
+    payment_outbox_worker_enabled: bool = Field(
+        default=True,
+        alias="PAYMENT_OUTBOX_WORKER_ENABLED",
+    )
+    payment_outbox_concurrency: int = Field(
+        default=4,
+        ge=1,
+        alias="PAYMENT_OUTBOX_CONCURRENCY",
+    )
+    payment_outbox_batch_size: int = Field(
+        default=20,
+        ge=1,
+        alias="PAYMENT_OUTBOX_BATCH_SIZE",
+    )
+    payment_outbox_max_attempts: int = Field(
+        default=5,
+        ge=1,
+        alias="PAYMENT_OUTBOX_MAX_ATTEMPTS",
+    )
+    payment_outbox_poll_interval_seconds: float = Field(
+        default=1.0,
+        gt=0,
+        alias="PAYMENT_OUTBOX_POLL_INTERVAL_SECONDS",
+    )
+    payment_webhook_worker_enabled: bool = Field(
+        default=True,
+        alias="PAYMENT_WEBHOOK_WORKER_ENABLED",
+    )
+    payment_webhook_concurrency: int = Field(
+        default=4,
+        ge=1,
+        alias="PAYMENT_WEBHOOK_CONCURRENCY",
+    )
+    payment_webhook_batch_size: int = Field(
+        default=50,
+        ge=1,
+        alias="PAYMENT_WEBHOOK_BATCH_SIZE",
+    )
+    payment_webhook_max_attempts: int = Field(
+        default=5,
+        ge=1,
+        alias="PAYMENT_WEBHOOK_MAX_ATTEMPTS",
+    )
+    payment_webhook_poll_interval_seconds: float = Field(
+        default=1.0,
+        gt=0,
+        alias="PAYMENT_WEBHOOK_POLL_INTERVAL_SECONDS",
+    )
+    payment_reconcile_concurrency: int = Field(
+        default=16,
+        ge=1,
+        alias="PAYMENT_RECONCILE_CONCURRENCY",
+    )
+    payment_reconcile_page_size: int = Field(
+        default=200,
+        ge=1,
+        le=1000,
+        alias="PAYMENT_RECONCILE_PAGE_SIZE",
+    )
+    payment_reconcile_min_age_seconds: int = Field(
+        default=900,
+        ge=0,
+        alias="PAYMENT_RECONCILE_MIN_AGE_SECONDS",
+    )
 
 
 @lru_cache(maxsize=1)
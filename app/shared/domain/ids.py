@@ -0,0 +1,88 @@
+"""Time-ordered entity identifiers (UUIDv7, RFC 9562) shared by every context."""
+
+import secrets
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from threading import Lock
+from typing import Protocol
+from uuid import UUID
+
+_RANDOM_BITS = 74
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+_RAND_B_BITS = 62
+_RAND_B_MASK = (1 << _RAND_B_BITS) - 1
+
+
+def _unix_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+class IdGenerator(Protocol):
+    """Source of new entity ids; values must be UUIDv7 so they sort by creation time."""
+
+    def __call__(self) -> UUID:
+        ...
+
+
+class UUIDv7Generator:
+    """Thread-safe UUIDv7 generator, strictly increasing within the process.
+
+    The first id of each millisecond takes a random 74-bit tail with its top bit
+    clear; later ids in the same millisecond increment it. Consecutive inserts
+    therefore land on the right edge of B-tree indexes instead of random pages.
+    If the wall clock steps back, ids keep counting from the last timestamp.
+    """
+
+    def __init__(
+        self,
+        clock_ms: Callable[[], int] = _unix_ms,
+        random_bits: Callable[[int], int] = secrets.randbits,
+    ) -> None:
+        self._clock_ms = clock_ms
+        self._random_bits = random_bits
+        self._lock = Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def __call__(self) -> UUID:
+        with self._lock:
+            now_ms = self._clock_ms()
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._last_random = self._random_bits(_RANDOM_BITS - 1)
+            elif self._last_random < _RANDOM_MAX:
+                self._last_random += 1
+            else:
+                self._last_ms += 1
+                self._last_random = self._random_bits(_RANDOM_BITS - 1)
+            unix_ms, random = self._last_ms, self._last_random
+
+        rand_a = random >> _RAND_B_BITS
+        rand_b = random & _RAND_B_MASK
+        return UUID(int=(unix_ms << 80) | (0x7 << 76) | (rand_a << 64) | (0b10 << 62) | rand_b)
+
+
+_generator: IdGenerator = UUIDv7Generator()
+
+
+def new_id() -> UUID:
+    """Return a new entity id from the process-wide generator."""
+
+    return _generator()
+
+
+def set_id_generator(generator: IdGenerator) -> IdGenerator:
+    """Replace the process-wide generator and return the previous one."""
+
+    global _generator
+    previous, _generator = _generator, generator
+    return previous
+
+
+def uuid7_datetime(value: UUID) -> datetime:
+    """Return the creation instant embedded in a UUIDv7."""
+
+    if value.version != 7:
+        raise ValueError("expected a UUIDv7")
+    return datetime.fromtimestamp((value.int >> 80) / 1000, tz=UTC)
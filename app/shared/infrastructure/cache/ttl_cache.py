@@ -0,0 +1,114 @@
+"""Bounded in-process LRU cache with per-entry time-to-live."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from threading import Lock
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Point-in-time counters of a cache instance."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_entries: int
+    ttl_seconds: float
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe LRU cache whose entries also expire after `ttl_seconds`.
+
+    `generation` moves on every `invalidate()` and `clear()`. A reader that
+    takes it before loading a value and hands it to `set()` never stores a
+    value loaded before an invalidation that raced with it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries must be greater than or equal to zero")
+        if ttl_seconds < 0:
+            raise ValueError("ttl_seconds must be greater than or equal to zero")
+
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: K, value: V, generation: int | None = None) -> None:
+        if self._max_entries == 0 or self._ttl_seconds == 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (self._clock() + self._ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generation += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                max_entries=self._max_entries,
+                ttl_seconds=self._ttl_seconds,
+            )
@@ -0,0 +1,78 @@
+"""Compare the indexes declared on the ORM models with the ones in a live database.
+
+Usage: ``python -m app.shared.infrastructure.db.index_check`` exits with status 1
+and lists the missing indexes when the configured database is behind the models.
+"""
+
+import sys
+from dataclasses import dataclass
+
+from sqlalchemy import Connection, Index, MetaData, create_engine, inspect
+
+from app.shared.config.settings import get_settings
+from app.shared.infrastructure.db.metadata import load_metadata
+
+
+@dataclass(frozen=True, slots=True)
+class MissingIndex:
+    table: str
+    index: str
+
+
+def _applies_to(index: Index, dialect_name: str) -> bool:
+    # Indexes declared with `.ddl_if(dialect=...)` only exist on that backend.
+    ddl_if = getattr(index, "_ddl_if", None)
+    return ddl_if is None or ddl_if.dialect in (None, dialect_name)
+
+
+def find_missing_indexes(
+    connection: Connection,
+    metadata: MetaData | None = None,
+) -> list[MissingIndex]:
+    """Return the model indexes that the connected database does not have."""
+
+    metadata = metadata if metadata is not None else load_metadata()
+    inspector = inspect(connection)
+    dialect_name = connection.dialect.name
+    existing_tables = set(inspector.get_table_names())
+    missing: list[MissingIndex] = []
+
+    for table in metadata.sorted_tables:
+        declared = [
+            index for index in table.indexes if index.name and _applies_to(index, dialect_name)
+        ]
+        if not declared:
+            continue
+
+        present: set[str] = set()
+        if table.name in existing_tables:
+            present = {index["name"] for index in inspector.get_indexes(table.name) if index["name"]}
+        missing.extend(
+            MissingIndex(table=table.name, index=str(index.name))
+            for index in sorted(declared, key=lambda item: str(item.name))
+            if index.name not in present
+        )
+
+    return missing
+
+
+def main() -> int:
+    engine = create_engine(get_settings().database_url)
+    try:
+        with engine.connect() as connection:
+            missing = find_missing_indexes(connection)
+    finally:
+        engine.dispose()
+
+    if not missing:
+        print("All model indexes are present.")
+        return 0
+
+    for item in missing:
+        print(f"missing index {item.index} on {item.table}")
+    print("Run `alembic upgrade head` to create them.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+"""Complete ORM metadata for schema tooling (migrations, index checks)."""
+
+from sqlalchemy import MetaData
+
+from app.shared.infrastructure.db.base import Base
+
+
+def load_metadata() -> MetaData:
+    """Import every context's models so `Base.metadata` lists all tables."""
+
+    import app.contexts.store.orders.infrastructure.order_models  # noqa: F401
+    import app.contexts.store.products.infrastructure.product_model  # noqa: F401
+
+    return Base.metadata
@@ -0,0 +1,35 @@
+"""Portable SQLAlchemy column types shared by every context."""
+
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import LargeBinary, Uuid
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+
+class GUID(TypeDecorator[UUID]):
+    """UUID column stored as native `uuid` on Postgres and as 16 raw bytes elsewhere.
+
+    Binary keys are less than half the size of their 36-character text form, which
+    keeps primary, foreign and composite indexes small, and mappers get `UUID`
+    values back without parsing strings.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[Any]:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(Uuid(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value: UUID | None, dialect: Dialect) -> Any:
+        if value is None or dialect.name == "postgresql":
+            return value
+        return value.bytes
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> UUID | None:
+        if value is None or dialect.name == "postgresql":
+            return value
+        return UUID(bytes=value)
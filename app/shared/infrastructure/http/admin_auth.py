@@ -0,0 +1,24 @@
+"""Shared-secret guard for back-office endpoints."""
+
+import secrets
+
+from fastapi import Depends, Header, HTTPException, status
+
+from app.shared.config.settings import Settings, get_settings
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def require_admin(
+    admin_token: str | None = Header(default=None, alias=ADMIN_TOKEN_HEADER),
+    settings: Settings = Depends(get_settings),
+) -> None:
+    """Reject the request unless it carries the configured `ADMIN_API_TOKEN`."""
+
+    if not settings.admin_api_token:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="admin API is disabled")
+    if admin_token is None or not secrets.compare_digest(
+        admin_token.encode("utf-8"),
+        settings.admin_api_token.encode("utf-8"),
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid admin token")
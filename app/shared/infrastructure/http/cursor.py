@@ -0,0 +1,30 @@
+"""Opaque keyset pagination cursors for HTTP APIs."""
+
+import base64
+import binascii
+import json
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a cursor that cannot be decoded."""
+
+
+def encode_cursor(values: dict[str, str]) -> str:
+    """Encode keyset values as a URL-safe token clients must treat as opaque."""
+
+    raw = json.dumps(values, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> dict[str, str]:
+    """Decode a token produced by `encode_cursor`."""
+
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise InvalidCursorError("invalid cursor") from exc
+
+    if not isinstance(values, dict) or not all(isinstance(value, str) for value in values.values()):
+        raise InvalidCursorError("invalid cursor")
+    return values
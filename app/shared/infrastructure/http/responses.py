@@ -0,0 +1,33 @@
+"""Response classes for high-volume JSON endpoints."""
+
+from collections.abc import Mapping
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response validated and encoded by pydantic-core against a declared schema.
+
+    Routes opt in by returning an instance directly: FastAPI then skips its own
+    `response_model` pass (validate into models, then serialize them), and the
+    body is produced here in one pass instead. `schema` must be the adapter for
+    the route's response schema: content is read from attributes, so domain
+    dataclasses and projections are accepted, and anything the schema does not
+    declare is dropped instead of reaching the wire.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        *,
+        schema: TypeAdapter[Any],
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        self._schema = schema
+        super().__init__(content, status_code=status_code, headers=headers)
+
+    def render(self, content: Any) -> bytes:
+        return self._schema.dump_json(self._schema.validate_python(content, from_attributes=True))
@@ -4,6 +4,7 @@ from fastapi import APIRouter, FastAPI
 
 from app.contexts.store.products.infrastructure.http.router import router as products_router
 from app.contexts.store.orders.infrastructure.http.router import router as orders_router
+from app.contexts.store.orders.infrastructure.http.webhook_router import router as webhooks_router
 
 API_V1_PREFIX = "/api/v1"
 
@@ -14,4 +15,5 @@ def register_routes(app: FastAPI) -> None:
     version_api_router = APIRouter(prefix=API_V1_PREFIX)
     version_api_router.include_router(products_router)
     version_api_router.include_router(orders_router)
+    version_api_router.include_router(webhooks_router)
     app.include_router(version_api_router)
@@ -0,0 +1,60 @@
+"""Incremental JSON and CSV encoders for streamed responses."""
+
+import csv
+import io
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime
+from typing import Any
+
+import orjson
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+
+def iter_ndjson(chunks: Iterable[list[Any]]) -> Iterator[bytes]:
+    """Encode each chunk of records as newline-delimited JSON, one write per chunk."""
+
+    for chunk in chunks:
+        if chunk:
+            yield b"".join(
+                orjson.dumps(record, option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+                for record in chunk
+            )
+
+
+def iter_json_array(chunks: Iterable[list[Any]]) -> Iterator[bytes]:
+    """Encode chunks of records as a single JSON array without materializing it."""
+
+    yield b"["
+    separator = b""
+    for chunk in chunks:
+        if chunk:
+            yield separator + b",".join(
+                orjson.dumps(record, option=orjson.OPT_UTC_Z) for record in chunk
+            )
+            separator = b","
+    yield b"]"
+
+
+def _csv_value(value: object) -> object:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_csv(chunks: Iterable[list[Any]], columns: Sequence[str]) -> Iterator[bytes]:
+    """Encode chunks of records as CSV with a header row, reading `columns` as attributes."""
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    yield buffer.getvalue().encode("utf-8")
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [_csv_value(getattr(record, column)) for column in columns] for record in chunk
+        )
+        yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,209 @@
+"""Circuit breaker with a bulkhead for calls to unreliable external services."""
+
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import Lock
+from typing import Literal, TypeVar
+
+T = TypeVar("T")
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CallRejectedError(Exception):
+    """Raised instead of calling the service; retry after `retry_after_seconds`."""
+
+    def __init__(self, message: str, retry_after_seconds: float) -> None:
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
+class CircuitOpenError(CallRejectedError):
+    """Raised while the breaker is open or its half-open probes are taken."""
+
+
+class BulkheadFullError(CallRejectedError):
+    """Raised when the maximum number of concurrent calls is already in flight."""
+
+
+@dataclass(frozen=True, slots=True)
+class CircuitBreakerStats:
+    """Point-in-time state and counters of a breaker instance."""
+
+    name: str
+    state: CircuitState
+    failure_rate: float
+    window_calls: int
+    in_flight: int
+    max_concurrent_calls: int
+    successful_calls: int
+    failed_calls: int
+    rejected_calls: int
+    times_opened: int
+    retry_after_seconds: float
+
+
+class CircuitBreaker:
+    """Thread-safe count-based circuit breaker.
+
+    The breaker opens once at least `minimum_calls` of the last `window_size`
+    calls were recorded and the share of failures reaches `failure_rate_threshold`.
+    A call that outlives `slow_call_seconds`, or that raises an exception accepted
+    by `record_failure` (by default, any exception), is a failure; other
+    exceptions mean the service answered and count like a return. After
+    `open_seconds` it lets `half_open_max_calls` probes through: if they all
+    succeed the breaker closes, otherwise it opens again. Independently, no more
+    than `max_concurrent_calls` run at once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        minimum_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        max_concurrent_calls: int = 10,
+        slow_call_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        record_failure: Callable[[BaseException], bool] | None = None,
+    ) -> None:
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError("failure_rate_threshold must be in (0, 1]")
+        if window_size <= 0 or minimum_calls <= 0 or minimum_calls > window_size:
+            raise ValueError("minimum_calls must be between 1 and window_size")
+        if half_open_max_calls <= 0 or max_concurrent_calls <= 0:
+            raise ValueError("half_open_max_calls and max_concurrent_calls must be positive")
+        if open_seconds < 0:
+            raise ValueError("open_seconds must be greater than or equal to zero")
+
+        self.name = name
+        self._failure_rate_threshold = failure_rate_threshold
+        self._minimum_calls = minimum_calls
+        self._open_seconds = open_seconds
+        self._half_open_max_calls = half_open_max_calls
+        self._max_concurrent_calls = max_concurrent_calls
+        self._slow_call_seconds = slow_call_seconds
+        self._clock = clock
+        self._record_failure = record_failure
+        self._lock = Lock()
+        self._window: deque[bool] = deque(maxlen=window_size)
+        self._state: CircuitState = "closed"
+        self._opened_at = 0.0
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self._in_flight = 0
+        self._successful_calls = 0
+        self._failed_calls = 0
+        self._rejected_calls = 0
+        self._times_opened = 0
+
+    def call(self, func: Callable[[], T]) -> T:
+        """Run `func` through the breaker, or raise CallRejectedError without running it."""
+
+        probe = self._acquire()
+        started = self._clock()
+        try:
+            result = func()
+        except Exception as exc:
+            failed = self._record_failure is None or self._record_failure(exc)
+            self._release(probe, succeeded=not failed and not self._is_slow(started))
+            raise
+
+        self._release(probe, succeeded=not self._is_slow(started))
+        return result
+
+    def stats(self) -> CircuitBreakerStats:
+        with self._lock:
+            now = self._clock()
+            self._refresh_state(now)
+            failures = sum(self._window)
+            window_calls = len(self._window)
+            return CircuitBreakerStats(
+                name=self.name,
+                state=self._state,
+                failure_rate=failures / window_calls if window_calls else 0.0,
+                window_calls=window_calls,
+                in_flight=self._in_flight,
+                max_concurrent_calls=self._max_concurrent_calls,
+                successful_calls=self._successful_calls,
+                failed_calls=self._failed_calls,
+                rejected_calls=self._rejected_calls,
+                times_opened=self._times_opened,
+                retry_after_seconds=self._retry_after(now),
+            )
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            now = self._clock()
+            self._refresh_state(now)
+
+            if self._state == "open":
+                self._rejected_calls += 1
+                raise CircuitOpenError(f"circuit {self.name} is open", self._retry_after(now))
+            if self._state == "half_open" and self._probes_started >= self._half_open_max_calls:
+                self._rejected_calls += 1
+                raise CircuitOpenError(f"circuit {self.name} is half-open", self._open_seconds)
+            if self._in_flight >= self._max_concurrent_calls:
+                self._rejected_calls += 1
+                raise BulkheadFullError(f"too many concurrent calls to {self.name}", 1.0)
+
+            self._in_flight += 1
+            if self._state == "half_open":
+                self._probes_started += 1
+                return True
+            return False
+
+    def _release(self, probe: bool, succeeded: bool) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if succeeded:
+                self._successful_calls += 1
+            else:
+                self._failed_calls += 1
+
+            if probe and self._state == "half_open":
+                if not succeeded:
+                    self._open(self._clock())
+                    return
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self._half_open_max_calls:
+                    self._state = "closed"
+                    self._window.clear()
+                return
+
+            if self._state != "closed":
+                # Late result of a call started before the breaker opened.
+                return
+            self._window.append(not succeeded)
+            failures = sum(self._window)
+            if (
+                len(self._window) >= self._minimum_calls
+                and failures / len(self._window) >= self._failure_rate_threshold
+            ):
+                self._open(self._clock())
+
+    def _is_slow(self, started: float) -> bool:
+        return (
+            self._slow_call_seconds is not None
+            and self._clock() - started > self._slow_call_seconds
+        )
+
+    def _open(self, now: float) -> None:
+        self._state = "open"
+        self._opened_at = now
+        self._times_opened += 1
+
+    def _refresh_state(self, now: float) -> None:
+        if self._state == "open" and now - self._opened_at >= self._open_seconds:
+            self._state = "half_open"
+            self._probes_started = 0
+            self._probes_succeeded = 0
+
+    def _retry_after(self, now: float) -> float:
+        if self._state != "open":
+            return 0.0
+        return max(self._opened_at + self._open_seconds - now, 0.0)
@@ -0,0 +1,103 @@
+"""Insert throughput of random uuid4 keys vs time-ordered UUIDv7 keys as a table grows.
+
+Fills an `order_items`-shaped SQLite file table (GUID primary key plus the
+order_id index) in committed batches with a small page cache, so the indexes
+soon outgrow memory the way a production table outgrows the buffer pool.
+Random keys touch a different leaf page per row; UUIDv7 keys append to the
+right edge of the B-tree.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_id_insert --rows 1000000 --batch 10000
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from uuid import UUID, uuid4
+
+from sqlalchemy import Column, Engine, Index, Integer, MetaData, Table, create_engine, event
+
+from app.shared.domain.ids import UUIDv7Generator
+from app.shared.infrastructure.db.types import GUID
+
+ITEMS_PER_ORDER = 4
+
+
+def _items_table() -> Table:
+    table = Table(
+        "order_items",
+        MetaData(),
+        Column("id", GUID(), primary_key=True),
+        Column("order_id", GUID(), nullable=False),
+        Column("product_id", GUID(), nullable=False),
+        Column("quantity", Integer, nullable=False),
+    )
+    Index("ix_order_items_order_id", table.c.order_id)
+    return table
+
+
+def _engine(path: Path, cache_kib: int) -> Engine:
+    engine = create_engine(f"sqlite+pysqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def _configure(dbapi_connection, _record) -> None:  # type: ignore[no-untyped-def]
+        dbapi_connection.execute(f"PRAGMA cache_size = -{cache_kib}")
+        dbapi_connection.execute("PRAGMA journal_mode = WAL")
+        dbapi_connection.execute("PRAGMA synchronous = NORMAL")
+
+    return engine
+
+
+def _fill(engine: Engine, table: Table, new_id: Callable[[], UUID], rows: int, batch: int) -> list[float]:
+    """Insert `rows` rows and return the rows/s of every batch."""
+
+    product_ids = [uuid4() for _ in range(100)]
+    rates: list[float] = []
+    for start in range(0, rows, batch):
+        values = []
+        for index in range(start, min(start + batch, rows), ITEMS_PER_ORDER):
+            order_id = new_id()
+            values.extend(
+                {
+                    "id": new_id(),
+                    "order_id": order_id,
+                    "product_id": product_ids[(index + line) % len(product_ids)],
+                    "quantity": 1,
+                }
+                for line in range(ITEMS_PER_ORDER)
+            )
+        started = time.perf_counter()
+        with engine.begin() as connection:
+            connection.execute(table.insert(), values)
+        rates.append(len(values) / (time.perf_counter() - started))
+    return rates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--cache-kib", type=int, default=8_192, help="SQLite page cache size")
+    args = parser.parse_args()
+
+    cases: dict[str, Callable[[], UUID]] = {"uuid4": uuid4, "uuidv7": UUIDv7Generator()}
+    with tempfile.TemporaryDirectory() as directory:
+        for label, new_id in cases.items():
+            engine = _engine(Path(directory) / f"{label}.sqlite3", args.cache_kib)
+            table = _items_table()
+            table.metadata.create_all(engine)
+            rates = _fill(engine, table, new_id, args.rows, args.batch)
+            tail = rates[-max(len(rates) // 10, 1) :]
+            print(
+                f"{label:<8} first batch {rates[0]:9.0f} rows/s  "
+                f"last 10% {sum(tail) / len(tail):9.0f} rows/s  "
+                f"overall {len(rates) / sum(1 / rate for rate in rates):9.0f} rows/s"
+            )
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Per-call latency of Mercado Pago preferences: client per call vs pooled keep-alive client.
+
+Runs against a local stand-in for the preferences API, so it measures the
+connection setup and client construction saved by pooling; against the real
+API the TLS handshake and DNS lookup make the gap larger.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_mercadopago_client --calls 500
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+import httpx
+
+from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.order_item import OrderItem
+from app.contexts.store.orders.infrastructure.mercadopago.mercadopago_gateway import (
+    MercadoPagoGateway,
+    build_mercadopago_http_client,
+)
+
+
+class _PreferencesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this Nagle's algorithm
+    # and delayed ACKs add ~40 ms to every keep-alive response.
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", "0")))
+        body = json.dumps({"id": str(uuid4()), "init_point": "https://mp.test/init-point"}).encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+
+class _ClientPerCallGateway(MercadoPagoGateway):
+    """Previous behaviour: a fresh httpx.Client, and connection, for every preference."""
+
+    def create_preference(self, order: Order):  # type: ignore[no-untyped-def]
+        with httpx.Client(timeout=15.0) as client:
+            return MercadoPagoGateway(
+                access_token=self._access_token,
+                base_url=self._base_url,
+                client=client,
+            ).create_preference(order)
+
+
+def _order() -> Order:
+    return Order(
+        order_number="ORD-BENCH",
+        customer_name="Benchmark",
+        customer_phone="5500000000",
+        items=[
+            OrderItem(
+                product_id=uuid4(),
+                quantity=1,
+                product_name_snapshot="Producto",
+                unit_price_cents_snapshot=9900,
+            )
+        ],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PreferencesHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    order = _order()
+
+    gateways = {
+        "per-call": _ClientPerCallGateway(access_token="TEST", base_url=base_url),
+        "pooled": MercadoPagoGateway(
+            access_token="TEST",
+            base_url=base_url,
+            client=build_mercadopago_http_client(),
+        ),
+    }
+    try:
+        for name, gateway in gateways.items():
+            gateway.create_preference(order)
+            started = time.perf_counter()
+            for _ in range(args.calls):
+                gateway.create_preference(order)
+            elapsed = time.perf_counter() - started
+            print(f"{name:<10} {elapsed / args.calls * 1_000_000:8.0f} us/call  ({args.calls} calls)")
+    finally:
+        for gateway in gateways.values():
+            gateway.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Reconciliation throughput: one provider call at a time vs bounded concurrency.
+
+Seeds pending payments in an in-memory SQLite database and reconciles them
+against a local stand-in for `/v1/payments/search` that answers after a fixed
+latency, as the real API does. Sequential reconciliation is bound by that
+latency; concurrent calls overlap it.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_payment_reconciliation --payments 2000 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from uuid import uuid4
+
+import httpx
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.contexts.store.orders.application.reconcile_payments import (
+    ReconcilePaymentsUseCase,
+    ReconciliationStats,
+)
+from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.order_item import OrderItem
+from app.contexts.store.orders.domain.payment import Payment
+from app.contexts.store.orders.infrastructure.mercadopago.payment_lookup import (
+    MercadoPagoPaymentLookup,
+)
+from app.contexts.store.orders.infrastructure.order_models import OrderModel, PaymentModel
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from tests.sqlite_schema import reset_sqlite_schema
+
+
+class _StandInServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections opened in a burst by the pool.
+    request_queue_size = 256
+    daemon_threads = True
+
+
+def _handler(latency_seconds: float) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:  # noqa: N802
+            reference = parse_qs(urlparse(self.path).query)["external_reference"][0]
+            time.sleep(latency_seconds)
+            result = {
+                "id": 1,
+                "status": "approved",
+                "external_reference": reference,
+                "transaction_amount": 99.0,
+                "currency_id": "MXN",
+            }
+            body = json.dumps({"results": [result]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+    return Handler
+
+
+def _seed(session_factory: sessionmaker[Session], count: int) -> None:
+    created_at = datetime.now(UTC) - timedelta(hours=1)
+    with session_factory() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        for index in range(count):
+            order = Order(
+                order_number=f"ORD-BENCH-{index:06d}",
+                customer_name="Benchmark",
+                customer_phone="5500000000",
+                created_at=created_at,
+                items=[
+                    OrderItem(
+                        product_id=uuid4(),
+                        quantity=1,
+                        product_name_snapshot="Producto",
+                        unit_price_cents_snapshot=9900,
+                    )
+                ],
+            )
+            repository.add_order(order)
+            repository.add_payment(
+                Payment(order_id=order.id, amount_cents=9900, status="pending", created_at=created_at)
+            )
+        repository.commit()
+
+
+def _reset_statuses(session_factory: sessionmaker[Session]) -> None:
+    with session_factory() as session:
+        session.execute(update(PaymentModel).values(status="pending"))
+        session.execute(update(OrderModel).values(status="pending_payment"))
+        session.commit()
+
+
+async def _reconcile(
+    session_factory: sessionmaker[Session],
+    base_url: str,
+    concurrency: int,
+    page_size: int,
+) -> ReconciliationStats:
+    lookup = MercadoPagoPaymentLookup(
+        access_token="TEST",
+        base_url=base_url,
+        client=httpx.AsyncClient(
+            timeout=15.0,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        ),
+    )
+    try:
+        with session_factory() as session:
+            return await ReconcilePaymentsUseCase(
+                SQLOrderRepository(session),
+                lookup,
+                concurrency=concurrency,
+                page_size=page_size,
+            ).execute(min_age=timedelta(0))
+    finally:
+        await lookup.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--payments", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite+pysqlite://",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    reset_sqlite_schema(engine)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    _seed(session_factory, args.payments)
+
+    server = _StandInServer(("127.0.0.1", 0), _handler(args.latency_ms / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        for concurrency in args.concurrency:
+            _reset_statuses(session_factory)
+            stats = asyncio.run(_reconcile(session_factory, base_url, concurrency, args.page_size))
+            print(
+                f"concurrency {concurrency:<4} {stats.payments_per_second:8.0f} payments/s  "
+                f"({stats.scanned} payments, {stats.updated} updated, {stats.elapsed_seconds:.2f}s)"
+            )
+    finally:
+        server.shutdown()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
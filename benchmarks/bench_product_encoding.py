@@ -0,0 +1,88 @@
+"""Throughput of GET-style catalog responses: Pydantic response_model vs FastJSONResponse.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_product_encoding --items 10000
+"""
+
+import argparse
+import time
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.contexts.store.products.domain.product_repository import ProductListing
+from app.contexts.store.products.infrastructure.http.router import ProductResponse
+from app.shared.infrastructure.http.responses import FastJSONResponse
+
+
+def _build_listings(items: int) -> list[ProductListing]:
+    created_at = datetime.now(UTC)
+    return [
+        ProductListing(
+            id=uuid4(),
+            name=f"Producto {index}",
+            price_cents=1000 + index,
+            currency="MXN",
+            stock=index % 50,
+            is_active=True,
+            created_at=created_at,
+            description="Suplemento natural de uso diario.",
+        )
+        for index in range(items)
+    ]
+
+
+def _build_app(listings: list[ProductListing]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/pydantic", response_model=list[ProductResponse])
+    def pydantic_path() -> list[ProductResponse]:
+        return [
+            ProductResponse(
+                id=listing.id,
+                name=listing.name,
+                description=listing.description,
+                price_cents=listing.price_cents,
+                currency=listing.currency,
+                stock=listing.stock,
+                is_active=listing.is_active,
+                created_at=listing.created_at,
+            )
+            for listing in listings
+        ]
+
+    schema = TypeAdapter(list[ProductResponse])
+
+    @app.get("/fast", response_model=list[ProductResponse], response_class=FastJSONResponse)
+    def fast_path() -> FastJSONResponse:
+        return FastJSONResponse(listings, schema=schema)
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    client = TestClient(_build_app(_build_listings(args.items)))
+    assert client.get("/pydantic").json() == client.get("/fast").json()
+
+    for path in ("/pydantic", "/fast"):
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            client.get(path).raise_for_status()
+        elapsed = time.perf_counter() - started
+        print(
+            f"{path:<10} {elapsed / args.requests * 1000:8.1f} ms/request  "
+            f"{args.requests / elapsed:6.1f} req/s  ({args.items} items)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Per-row cost of the ORM listing path vs the column-projected read path.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_product_listing --rows 20000
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.contexts.store.products.domain.product import Product
+from app.contexts.store.products.domain.product_repository import ProductView
+from app.contexts.store.products.infrastructure.product_model import ProductModel
+from app.contexts.store.products.infrastructure.sql_product_repository import (
+    SQLProductRepository,
+    _to_domain,
+)
+from tests.sqlite_schema import reset_sqlite_schema
+
+
+def _seed(session: Session, rows: int) -> None:
+    repository = SQLProductRepository(session)
+    description = "Suplemento natural de uso diario. " * 30
+    batch: list[Product] = []
+    for index in range(rows):
+        batch.append(
+            Product(name=f"Producto {index}", description=description, price_cents=1000, stock=5)
+        )
+        if len(batch) == 500:
+            repository.save_many(batch)
+            batch = []
+    repository.save_many(batch)
+
+
+def _orm_entities(session: Session) -> int:
+    stmt = (
+        select(ProductModel)
+        .where(ProductModel.is_active.is_(True))
+        .order_by(ProductModel.created_at.desc())
+    )
+    models = session.execute(stmt).scalars().all()
+    products = [_to_domain(model) for model in models]
+    session.expunge_all()
+    return len(products)
+
+
+def _projected(view: ProductView) -> Callable[[Session], int]:
+    def run(session: Session) -> int:
+        return len(SQLProductRepository(session).list_active(view))
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite+pysqlite://", poolclass=StaticPool)
+    reset_sqlite_schema(engine)
+    with Session(engine) as session:
+        _seed(session, args.rows)
+
+    cases: dict[str, Callable[[Session], int]] = {
+        "orm entity -> Product": _orm_entities,
+        "core rows -> ProductListing": _projected("full"),
+        "core rows -> ProductSummary": _projected("summary"),
+    }
+    for label, run in cases.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            with Session(engine) as session:
+                started = time.perf_counter()
+                count = run(session)
+                best = min(best, time.perf_counter() - started)
+        print(f"{label:<36} {best * 1000:8.1f} ms  {best / count * 1_000_000:6.2f} us/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Index size and lookup cost of UUID keys stored as String(36) vs GUID (16-byte BLOB).
+
+Builds an `order_items`-shaped table per key type on SQLite, then reports the size
+of the primary key and order_id indexes (via `dbstat`) and the time of point
+lookups by order_id, including turning the keys read back into `UUID` values.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_uuid_storage --rows 200000 --lookups 20000
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import Column, Engine, Index, Integer, MetaData, String, Table, create_engine, select
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.types import TypeEngine
+
+from app.shared.infrastructure.db.types import GUID
+
+ITEMS_PER_ORDER = 4
+
+
+def _items_table(key_type: TypeEngine[Any]) -> Table:
+    table = Table(
+        "order_items",
+        MetaData(),
+        Column("id", key_type, primary_key=True),
+        Column("order_id", key_type, nullable=False),
+        Column("product_id", key_type, nullable=False),
+        Column("quantity", Integer, nullable=False),
+    )
+    Index("ix_order_items_order_id", table.c.order_id)
+    return table
+
+
+def _seed(engine: Engine, table: Table, order_ids: list[UUID], to_key: Callable[[UUID], object]) -> None:
+    table.metadata.create_all(engine)
+    rows = [
+        {"id": to_key(uuid4()), "order_id": to_key(order_id), "product_id": to_key(uuid4()), "quantity": 1}
+        for order_id in order_ids
+        for _ in range(ITEMS_PER_ORDER)
+    ]
+    with engine.begin() as connection:
+        for start in range(0, len(rows), 5000):
+            connection.execute(table.insert(), rows[start : start + 5000])
+
+
+def _index_sizes(engine: Engine) -> dict[str, int]:
+    with engine.connect() as connection:
+        sizes = connection.exec_driver_sql(
+            "SELECT name, SUM(pgsize) FROM dbstat "
+            "WHERE name IN ('sqlite_autoindex_order_items_1', 'ix_order_items_order_id') GROUP BY name"
+        ).all()
+    return {name: size for name, size in sizes}
+
+
+def _lookups(
+    engine: Engine,
+    table: Table,
+    keys: list[object],
+    to_uuid: Callable[[Any], UUID],
+) -> float:
+    stmt = select(table.c.id, table.c.product_id)
+    best = float("inf")
+    with engine.connect() as connection:
+        for _ in range(3):
+            started = time.perf_counter()
+            for key in keys:
+                rows = connection.execute(stmt.where(table.c.order_id == key)).all()
+                ids = [(to_uuid(row.id), to_uuid(row.product_id)) for row in rows]
+                assert len(ids) == ITEMS_PER_ORDER
+            best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000, help="order_items rows per table")
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+
+    order_ids = [uuid4() for _ in range(args.rows // ITEMS_PER_ORDER)]
+    probes = random.Random(7).choices(order_ids, k=args.lookups)
+
+    # The String(36) mappers parsed every key with UUID(...); GUID hands back UUIDs.
+    cases: dict[str, tuple[TypeEngine[Any], Callable[[UUID], object], Callable[[Any], UUID]]] = {
+        "String(36)": (String(36), str, UUID),
+        "GUID (BLOB 16)": (GUID(), lambda value: value, lambda value: value),
+    }
+    for label, (key_type, to_key, to_uuid) in cases.items():
+        engine = create_engine("sqlite+pysqlite://", poolclass=StaticPool)
+        table = _items_table(key_type)
+        _seed(engine, table, order_ids, to_key)
+        sizes = _index_sizes(engine)
+        elapsed = _lookups(engine, table, [to_key(order_id) for order_id in probes], to_uuid)
+        print(
+            f"{label:<16} pk index {sizes['sqlite_autoindex_order_items_1'] / 1024:8.0f} KiB  "
+            f"order_id index {sizes['ix_order_items_order_id'] / 1024:8.0f} KiB  "
+            f"lookup {elapsed / args.lookups * 1_000_000:6.1f} us"
+        )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Initial schema: products, orders, order_items, payments and their indexes.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Frozen at this revision; the application's search queries must keep matching them.
+PRODUCT_SEARCH_CONFIG = "spanish"
+PRODUCTS_FTS_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE products_fts USING fts5("
+    "product_id UNINDEXED, name, description, "
+    "tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+
+def _dialect_name() -> str:
+    return op.get_context().dialect.name
+
+
+def upgrade() -> None:
+    op.create_table(
+        "products",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("price_cents", sa.Integer(), nullable=False),
+        sa.Column("currency", sa.String(3), nullable=False),
+        sa.Column("stock", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_products_is_active_created_at_id",
+        "products",
+        ["is_active", "created_at", "id"],
+    )
+    if _dialect_name() == "postgresql":
+        op.create_index(
+            "ix_products_search_document",
+            "products",
+            [
+                sa.text(
+                    f"to_tsvector('{PRODUCT_SEARCH_CONFIG}'::regconfig, "
+                    "name || ' ' || coalesce(description, ''))"
+                )
+            ],
+            postgresql_using="gin",
+        )
+    elif _dialect_name() == "sqlite":
+        op.execute(PRODUCTS_FTS_SQLITE_DDL)
+
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("order_number", sa.String(40), nullable=False, unique=True),
+        sa.Column("customer_name", sa.String(255), nullable=False),
+        sa.Column("customer_phone", sa.String(40), nullable=False),
+        sa.Column("status", sa.String(32), nullable=False),
+        sa.Column("total_cents", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+
+    op.create_table(
+        "order_items",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "order_id",
+            sa.String(36),
+            sa.ForeignKey("orders.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("product_id", sa.String(36), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("product_name_snapshot", sa.String(255), nullable=False),
+        sa.Column("unit_price_cents_snapshot", sa.Integer(), nullable=False),
+        sa.Column("line_total_cents", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index("ix_order_items_order_id", "order_items", ["order_id"])
+
+    op.create_table(
+        "payments",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "order_id",
+            sa.String(36),
+            sa.ForeignKey("orders.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("status", sa.String(32), nullable=False),
+        sa.Column("amount_cents", sa.Integer(), nullable=False),
+        sa.Column("currency", sa.String(3), nullable=False),
+        sa.Column("external_payment_id", sa.String(128), nullable=True),
+        sa.Column("init_point", sa.Text(), nullable=True),
+        sa.Column("sandbox_init_point", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index("ix_payments_order_id", "payments", ["order_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payments_order_id", table_name="payments")
+    op.drop_table("payments")
+    op.drop_index("ix_order_items_order_id", table_name="order_items")
+    op.drop_table("order_items")
+    op.drop_table("orders")
+    if _dialect_name() == "postgresql":
+        op.drop_index("ix_products_search_document", table_name="products")
+    elif _dialect_name() == "sqlite":
+        op.execute("DROP TABLE products_fts")
+    op.drop_index("ix_products_is_active_created_at_id", table_name="products")
+    op.drop_table("products")
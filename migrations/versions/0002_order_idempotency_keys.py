@@ -0,0 +1,43 @@
+"""Idempotency-Key store for order creation.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "order_idempotency_keys",
+        sa.Column("key", sa.String(255), primary_key=True),
+        sa.Column("request_fingerprint", sa.String(64), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("response", sa.JSON(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_order_idempotency_keys_expires_at",
+        "order_idempotency_keys",
+        ["expires_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_idempotency_keys_expires_at", table_name="order_idempotency_keys")
+    op.drop_table("order_idempotency_keys")
@@ -0,0 +1,50 @@
+"""Transactional outbox for deferred Mercado Pago preference creation.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "payment_outbox",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column(
+            "order_id",
+            sa.String(36),
+            sa.ForeignKey("orders.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("payment_id", sa.String(36), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_payment_outbox_status_available_at",
+        "payment_outbox",
+        ["status", "available_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payment_outbox_status_available_at", table_name="payment_outbox")
+    op.drop_table("payment_outbox")
@@ -0,0 +1,31 @@
+"""Indexes backing the admin order listing.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_orders_created_at_id", "orders", ["created_at", "id"])
+    op.create_index("ix_orders_status_created_at_id", "orders", ["status", "created_at", "id"])
+    op.create_index(
+        "ix_orders_customer_phone_created_at_id",
+        "orders",
+        ["customer_phone", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_orders_customer_phone_created_at_id", table_name="orders")
+    op.drop_index("ix_orders_status_created_at_id", table_name="orders")
+    op.drop_index("ix_orders_created_at_id", table_name="orders")
@@ -0,0 +1,206 @@
+"""Store every UUID key as native uuid (Postgres) or 16-byte BLOB (SQLite).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Callable, Sequence
+
+import sqlalchemy as sa
+from alembic import context, op
+
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+UUID_COLUMNS: dict[str, tuple[str, ...]] = {
+    "products": ("id",),
+    "orders": ("id",),
+    "order_items": ("id", "order_id", "product_id"),
+    "payments": ("id", "order_id"),
+    "payment_outbox": ("id", "order_id", "payment_id"),
+}
+
+# Frozen copy of the application's GUID column type as of this revision: native
+# uuid on Postgres, 16 raw bytes elsewhere.
+BINARY_UUID = sa.LargeBinary(16).with_variant(sa.Uuid(), "postgresql")
+
+# Postgres default names of the unnamed foreign keys created by 0001 and 0003.
+ORDER_FOREIGN_KEYS = (
+    ("order_items_order_id_fkey", "order_items"),
+    ("payments_order_id_fkey", "payments"),
+    ("payment_outbox_order_id_fkey", "payment_outbox"),
+)
+
+
+def _dialect_name() -> str:
+    return op.get_context().dialect.name
+
+
+def _text_to_bytes(column: str) -> str:
+    return f"CASE WHEN typeof({column}) = 'text' THEN unhex(replace({column}, '-', '')) ELSE {column} END"
+
+
+def _bytes_to_text(column: str) -> str:
+    hex_value = f"lower(hex({column}))"
+    dashed = " || '-' || ".join(
+        f"substr({hex_value}, {start}, {length})"
+        for start, length in ((1, 8), (9, 4), (13, 4), (17, 4), (21, 12))
+    )
+    return f"CASE WHEN typeof({column}) = 'blob' THEN {dashed} ELSE {column} END"
+
+
+def _provide_sqlite_unhex() -> None:
+    # unhex() is built into SQLite 3.41+; older libraries get the same function
+    # from Python when migrating online. Offline scripts need SQLite 3.41+.
+    if context.is_offline_mode():
+        return
+    bind = op.get_bind()
+    if bind.dialect.server_version_info >= (3, 41):
+        return
+    bind.connection.driver_connection.create_function("unhex", 1, bytes.fromhex, deterministic=True)
+
+
+def _convert_sqlite_values(convert: Callable[[str], str]) -> None:
+    # SQLite keeps whatever a row already holds when the declared type changes,
+    # so the stored values are rewritten explicitly before the tables are rebuilt.
+    for table, columns in UUID_COLUMNS.items():
+        assignments = ", ".join(f"{name} = {convert(name)}" for name in columns)
+        op.execute(f"UPDATE {table} SET {assignments}")
+    op.execute(f"UPDATE products_fts SET product_id = {convert('product_id')}")
+
+
+def _sqlite_tables(key_type: sa.types.TypeEngine[object]) -> dict[str, sa.Table]:
+    """The rebuilt tables as of this revision, with `key_type` UUID columns.
+
+    Batch mode copies from these instead of reflecting the live tables, so the
+    revision also renders offline (`alembic upgrade --sql`).
+    """
+
+    metadata = sa.MetaData()
+
+    def created_at() -> sa.Column[object]:
+        return sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+        )
+
+    def order_id() -> sa.Column[object]:
+        return sa.Column(
+            "order_id",
+            key_type,
+            sa.ForeignKey("orders.id", ondelete="CASCADE"),
+            nullable=False,
+        )
+
+    tables = (
+        sa.Table(
+            "products",
+            metadata,
+            sa.Column("id", key_type, primary_key=True),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("price_cents", sa.Integer(), nullable=False),
+            sa.Column("currency", sa.String(3), nullable=False),
+            sa.Column("stock", sa.Integer(), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            created_at(),
+            sa.Index("ix_products_is_active_created_at_id", "is_active", "created_at", "id"),
+        ),
+        sa.Table(
+            "orders",
+            metadata,
+            sa.Column("id", key_type, primary_key=True),
+            sa.Column("order_number", sa.String(40), nullable=False, unique=True),
+            sa.Column("customer_name", sa.String(255), nullable=False),
+            sa.Column("customer_phone", sa.String(40), nullable=False),
+            sa.Column("status", sa.String(32), nullable=False),
+            sa.Column("total_cents", sa.Integer(), nullable=False),
+            created_at(),
+            sa.Index("ix_orders_created_at_id", "created_at", "id"),
+            sa.Index("ix_orders_status_created_at_id", "status", "created_at", "id"),
+            sa.Index("ix_orders_customer_phone_created_at_id", "customer_phone", "created_at", "id"),
+        ),
+        sa.Table(
+            "order_items",
+            metadata,
+            sa.Column("id", key_type, primary_key=True),
+            order_id(),
+            sa.Column("product_id", key_type, nullable=False),
+            sa.Column("quantity", sa.Integer(), nullable=False),
+            sa.Column("product_name_snapshot", sa.String(255), nullable=False),
+            sa.Column("unit_price_cents_snapshot", sa.Integer(), nullable=False),
+            sa.Column("line_total_cents", sa.Integer(), nullable=False),
+            created_at(),
+            sa.Index("ix_order_items_order_id", "order_id"),
+        ),
+        sa.Table(
+            "payments",
+            metadata,
+            sa.Column("id", key_type, primary_key=True),
+            order_id(),
+            sa.Column("status", sa.String(32), nullable=False),
+            sa.Column("amount_cents", sa.Integer(), nullable=False),
+            sa.Column("currency", sa.String(3), nullable=False),
+            sa.Column("external_payment_id", sa.String(128), nullable=True),
+            sa.Column("init_point", sa.Text(), nullable=True),
+            sa.Column("sandbox_init_point", sa.Text(), nullable=True),
+            created_at(),
+            sa.Index("ix_payments_order_id", "order_id"),
+        ),
+        sa.Table(
+            "payment_outbox",
+            metadata,
+            sa.Column("id", key_type, primary_key=True),
+            order_id(),
+            sa.Column("payment_id", key_type, nullable=False),
+            sa.Column("status", sa.String(16), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            created_at(),
+            sa.Index("ix_payment_outbox_status_available_at", "status", "available_at"),
+        ),
+    )
+    return {table.name: table for table in tables}
+
+
+def _alter_sqlite_types(type_: sa.types.TypeEngine[object], existing_type: sa.types.TypeEngine[object]) -> None:
+    tables = _sqlite_tables(existing_type)
+    for table, columns in UUID_COLUMNS.items():
+        with op.batch_alter_table(table, copy_from=tables[table]) as batch:
+            for name in columns:
+                batch.alter_column(name, type_=type_, existing_type=existing_type)
+
+
+def _alter_postgres_types(type_: sa.types.TypeEngine[object], cast_to: str) -> None:
+    for name, table in ORDER_FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_="foreignkey")
+
+    for table, columns in UUID_COLUMNS.items():
+        for name in columns:
+            op.alter_column(table, name, type_=type_, postgresql_using=f"{name}::{cast_to}")
+
+    for name, table in ORDER_FOREIGN_KEYS:
+        op.create_foreign_key(name, table, "orders", ["order_id"], ["id"], ondelete="CASCADE")
+
+
+def upgrade() -> None:
+    if _dialect_name() == "postgresql":
+        _alter_postgres_types(BINARY_UUID, "uuid")
+    elif _dialect_name() == "sqlite":
+        _provide_sqlite_unhex()
+        _convert_sqlite_values(_text_to_bytes)
+        _alter_sqlite_types(BINARY_UUID, sa.String(36))
+
+
+def downgrade() -> None:
+    if _dialect_name() == "postgresql":
+        _alter_postgres_types(sa.String(36), "text")
+    elif _dialect_name() == "sqlite":
+        _convert_sqlite_values(_bytes_to_text)
+        _alter_sqlite_types(sa.String(36), BINARY_UUID)
@@ -0,0 +1,49 @@
+"""Inbox of Mercado Pago webhook notifications, deduplicated by topic and resource.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0006"
+down_revision: str | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The application's GUID column type as of this revision: native uuid on Postgres, 16 bytes elsewhere.
+BINARY_UUID = sa.LargeBinary(16).with_variant(sa.Uuid(), "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "payment_webhook_events",
+        sa.Column("id", BINARY_UUID, primary_key=True),
+        sa.Column("topic", sa.String(32), nullable=False),
+        sa.Column("resource_id", sa.String(64), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("received_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.UniqueConstraint(
+            "topic",
+            "resource_id",
+            name="uq_payment_webhook_events_topic_resource_id",
+        ),
+    )
+    op.create_index(
+        "ix_payment_webhook_events_status_available_at",
+        "payment_webhook_events",
+        ["status", "available_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payment_webhook_events_status_available_at", table_name="payment_webhook_events")
+    op.drop_table("payment_webhook_events")
@@ -0,0 +1,27 @@
+"""Index backing the payment reconciliation scan.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0007"
+down_revision: str | None = "0006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_payments_status_created_at_id",
+        "payments",
+        ["status", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payments_status_created_at_id", table_name="payments")
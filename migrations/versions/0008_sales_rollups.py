@@ -0,0 +1,66 @@
+"""Daily sales rollups by order status and by product, backfilled from existing orders.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0008"
+down_revision: str | None = "0007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The application's GUID column type as of this revision: native uuid on Postgres, 16 bytes elsewhere.
+BINARY_UUID = sa.LargeBinary(16).with_variant(sa.Uuid(), "postgresql")
+
+
+def _day(column: str) -> str:
+    # Rollup days are UTC dates; SQLite stores the UTC timestamps as text.
+    if op.get_context().dialect.name == "postgresql":
+        return f"CAST({column} AT TIME ZONE 'UTC' AS DATE)"
+    return f"date({column})"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sales_daily_status_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("status", sa.String(32), primary_key=True),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("total_cents", sa.BigInteger(), nullable=False),
+    )
+    op.create_table(
+        "sales_daily_product_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("product_id", BINARY_UUID, primary_key=True),
+        sa.Column("status", sa.String(32), primary_key=True),
+        sa.Column("product_name", sa.String(255), nullable=False),
+        sa.Column("units", sa.Integer(), nullable=False),
+        sa.Column("revenue_cents", sa.BigInteger(), nullable=False),
+    )
+
+    day = _day("orders.created_at")
+    op.execute(
+        "INSERT INTO sales_daily_status_rollups (day, status, order_count, total_cents) "
+        f"SELECT {day}, orders.status, COUNT(*), SUM(orders.total_cents) "
+        f"FROM orders GROUP BY {day}, orders.status"
+    )
+    op.execute(
+        "INSERT INTO sales_daily_product_rollups "
+        "(day, product_id, status, product_name, units, revenue_cents) "
+        f"SELECT {day}, order_items.product_id, orders.status, "
+        "MAX(order_items.product_name_snapshot), SUM(order_items.quantity), "
+        "SUM(order_items.line_total_cents) "
+        "FROM order_items JOIN orders ON orders.id = order_items.order_id "
+        f"GROUP BY {day}, order_items.product_id, orders.status"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sales_daily_product_rollups")
+    op.drop_table("sales_daily_status_rollups")
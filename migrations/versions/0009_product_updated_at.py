@@ -0,0 +1,68 @@
+"""Track the last write of every product for the catalog version.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0009"
+down_revision: str | None = "0008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Frozen copy of the application's GUID column type as of this revision.
+BINARY_UUID = sa.LargeBinary(16).with_variant(sa.Uuid(), "postgresql")
+
+
+def _sqlite_products_table() -> sa.Table:
+    """`products` as of this revision, once `updated_at` is added.
+
+    Batch mode copies from it instead of reflecting the live table, so the
+    revision also renders offline (`alembic upgrade --sql`).
+    """
+
+    return sa.Table(
+        "products",
+        sa.MetaData(),
+        sa.Column("id", BINARY_UUID, primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("price_cents", sa.Integer(), nullable=False),
+        sa.Column("currency", sa.String(3), nullable=False),
+        sa.Column("stock", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Index("ix_products_is_active_created_at_id", "is_active", "created_at", "id"),
+    )
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE products SET updated_at = created_at")
+    if op.get_context().dialect.name == "sqlite":
+        # SQLite cannot tighten a column in place; batch mode rebuilds the table.
+        with op.batch_alter_table("products", copy_from=_sqlite_products_table()) as batch:
+            batch.alter_column(
+                "updated_at",
+                existing_type=sa.DateTime(timezone=True),
+                nullable=False,
+            )
+    else:
+        op.alter_column("products", "updated_at", nullable=False)
+    op.create_index("ix_products_updated_at", "products", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_updated_at", table_name="products")
+    op.drop_column("products", "updated_at")
@@ -0,0 +1,27 @@
+"""Lease in-progress idempotency claims so abandoned ones can be reclaimed.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0010"
+down_revision: str | None = "0009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "order_idempotency_keys",
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("order_idempotency_keys", "lease_expires_at")
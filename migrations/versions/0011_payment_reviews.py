@@ -0,0 +1,46 @@
+"""Payments approved for orders that can no longer be paid, kept for review.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0011"
+down_revision: str | None = "0010"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The application's GUID column type as of this revision: native uuid on Postgres, 16 bytes elsewhere.
+BINARY_UUID = sa.LargeBinary(16).with_variant(sa.Uuid(), "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "payment_reviews",
+        sa.Column("id", BINARY_UUID, primary_key=True),
+        sa.Column(
+            "payment_id",
+            BINARY_UUID,
+            sa.ForeignKey("payments.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "order_id",
+            BINARY_UUID,
+            sa.ForeignKey("orders.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("reason", sa.String(64), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_payment_reviews_created_at", "payment_reviews", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payment_reviews_created_at", table_name="payment_reviews")
+    op.drop_table("payment_reviews")
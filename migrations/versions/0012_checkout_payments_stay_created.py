@@ -0,0 +1,30 @@
+"""Payments with only a checkout preference go back to `created`.
+
+Creating a preference used to move the payment to `pending`, which the
+business rules reserve for a payment Mercado Pago reports in process. The two
+cannot be told apart in stored rows, so every `pending` payment returns to
+`created`; reconciliation moves the ones really in process back to `pending`.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "0012"
+down_revision: str | None = "0011"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE payments SET status = 'created' WHERE status = 'pending'")
+
+
+def downgrade() -> None:
+    op.execute(
+        "UPDATE payments SET status = 'pending' WHERE status = 'created' AND init_point IS NOT NULL"
+    )
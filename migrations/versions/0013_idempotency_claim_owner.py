@@ -0,0 +1,29 @@
+"""Tie idempotency claims to their owner and to the order they committed.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0013"
+down_revision: str | None = "0012"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The application's GUID column type as of this revision: native uuid on Postgres, 16 bytes elsewhere.
+BINARY_UUID = sa.LargeBinary(16).with_variant(sa.Uuid(), "postgresql")
+
+
+def upgrade() -> None:
+    op.add_column("order_idempotency_keys", sa.Column("claim_token", BINARY_UUID, nullable=True))
+    op.add_column("order_idempotency_keys", sa.Column("order_id", BINARY_UUID, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("order_idempotency_keys", "order_id")
+    op.drop_column("order_idempotency_keys", "claim_token")
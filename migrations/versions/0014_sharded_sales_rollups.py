@@ -0,0 +1,82 @@
+"""Split the daily sales rollups over counter shards.
+
+Every checkout of a day used to upsert the same `(day, 'pending_payment')` row,
+so concurrent checkouts queued on its lock. The rollups are derived data: both
+tables are rebuilt with a `shard` key column and backfilled from the orders into
+shard 0; new writes spread over the shards and readers sum them.
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0014"
+down_revision: str | None = "0013"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The application's GUID column type as of this revision: native uuid on Postgres, 16 bytes elsewhere.
+BINARY_UUID = sa.LargeBinary(16).with_variant(sa.Uuid(), "postgresql")
+
+
+def _day(column: str) -> str:
+    # Rollup days are UTC dates; SQLite stores the UTC timestamps as text.
+    if op.get_context().dialect.name == "postgresql":
+        return f"CAST({column} AT TIME ZONE 'UTC' AS DATE)"
+    return f"date({column})"
+
+
+def _rebuild(sharded: bool) -> None:
+    op.drop_table("sales_daily_product_rollups")
+    op.drop_table("sales_daily_status_rollups")
+
+    shard_columns = [sa.Column("shard", sa.SmallInteger(), primary_key=True)] if sharded else []
+    op.create_table(
+        "sales_daily_status_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("status", sa.String(32), primary_key=True),
+        *shard_columns,
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("total_cents", sa.BigInteger(), nullable=False),
+    )
+    shard_columns = [sa.Column("shard", sa.SmallInteger(), primary_key=True)] if sharded else []
+    op.create_table(
+        "sales_daily_product_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("product_id", BINARY_UUID, primary_key=True),
+        sa.Column("status", sa.String(32), primary_key=True),
+        *shard_columns,
+        sa.Column("product_name", sa.String(255), nullable=False),
+        sa.Column("units", sa.Integer(), nullable=False),
+        sa.Column("revenue_cents", sa.BigInteger(), nullable=False),
+    )
+
+    day = _day("orders.created_at")
+    shard_column, shard_value = (", shard", ", 0") if sharded else ("", "")
+    op.execute(
+        f"INSERT INTO sales_daily_status_rollups (day, status{shard_column}, order_count, total_cents) "
+        f"SELECT {day}, orders.status{shard_value}, COUNT(*), SUM(orders.total_cents) "
+        f"FROM orders GROUP BY {day}, orders.status"
+    )
+    op.execute(
+        "INSERT INTO sales_daily_product_rollups "
+        f"(day, product_id, status{shard_column}, product_name, units, revenue_cents) "
+        f"SELECT {day}, order_items.product_id, orders.status{shard_value}, "
+        "MAX(order_items.product_name_snapshot), SUM(order_items.quantity), "
+        "SUM(order_items.line_total_cents) "
+        "FROM order_items JOIN orders ON orders.id = order_items.order_id "
+        f"GROUP BY {day}, order_items.product_id, orders.status"
+    )
+
+
+def upgrade() -> None:
+    _rebuild(sharded=True)
+
+
+def downgrade() -> None:
+    _rebuild(sharded=False)
@@ -1,6 +1,25 @@
+from collections.abc import Generator
 from pathlib import Path
 import sys
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from app.contexts.store.products.infrastructure.cached_product_repository import (  # noqa: E402
+    get_product_catalog_cache,
+    get_product_detail_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_product_caches() -> Generator[None, None, None]:
+    """Tests reset the schema directly, so cached catalog snapshots must not leak."""
+
+    get_product_catalog_cache().clear()
+    get_product_detail_cache().clear()
+    yield
+    get_product_catalog_cache().clear()
+    get_product_detail_cache().clear()
@@ -0,0 +1,288 @@
+import threading
+from collections.abc import Generator
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.order_item import OrderItem
+from app.contexts.store.orders.domain.payment_gateway import PaymentProviderResponse
+from app.contexts.store.orders.infrastructure.http.router import get_mercadopago_gateway
+from app.contexts.store.orders.infrastructure.mercadopago.circuit_breaking_gateway import (
+    CircuitBreakingPaymentGateway,
+)
+from app.contexts.store.orders.infrastructure.mercadopago.mercadopago_gateway import (
+    MercadoPagoGateway,
+    is_provider_failure,
+)
+from app.main import app
+from app.shared.config.settings import Settings, get_settings
+from app.shared.infrastructure.db.session import get_db
+from app.shared.infrastructure.resilience.circuit_breaker import (
+    BulkheadFullError,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from tests.sqlite_schema import reset_sqlite_schema
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _fail() -> None:
+    raise TimeoutError("provider timed out")
+
+
+def test_breaker_opens_on_failure_rate_and_recovers_through_half_open_probe() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "provider",
+        failure_rate_threshold=0.5,
+        window_size=4,
+        minimum_calls=4,
+        open_seconds=30,
+        clock=clock,
+    )
+
+    assert breaker.call(lambda: "ok") == "ok"
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            breaker.call(_fail)
+
+    stats = breaker.stats()
+    assert stats.state == "open"
+    assert stats.failure_rate == 0.75
+    with pytest.raises(CircuitOpenError) as rejected:
+        breaker.call(lambda: "not called")
+    assert rejected.value.retry_after_seconds == 30
+
+    # After the cool-down one probe goes through; a failed probe reopens the breaker.
+    clock.now = 30
+    assert breaker.stats().state == "half_open"
+    with pytest.raises(TimeoutError):
+        breaker.call(_fail)
+    assert breaker.stats().state == "open"
+
+    clock.now = 60
+    assert breaker.call(lambda: "recovered") == "recovered"
+    stats = breaker.stats()
+    assert (stats.state, stats.window_calls, stats.times_opened) == ("closed", 0, 2)
+    assert stats.rejected_calls == 1
+
+
+def test_breaker_counts_slow_calls_as_failures() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "provider",
+        window_size=2,
+        minimum_calls=2,
+        slow_call_seconds=5,
+        clock=clock,
+    )
+
+    def slow_call() -> str:
+        clock.now += 6
+        return "late"
+
+    assert breaker.call(slow_call) == "late"
+    assert breaker.call(slow_call) == "late"
+    assert breaker.stats().state == "open"
+
+
+def test_breaker_only_records_failures_accepted_by_its_predicate() -> None:
+    breaker = CircuitBreaker(
+        "provider",
+        failure_rate_threshold=1.0,
+        window_size=2,
+        minimum_calls=2,
+        record_failure=lambda exc: isinstance(exc, TimeoutError),
+    )
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            breaker.call(lambda: int("not a number"))
+    stats = breaker.stats()
+    assert (stats.state, stats.failed_calls, stats.successful_calls) == ("closed", 0, 3)
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            breaker.call(_fail)
+    assert breaker.stats().state == "open"
+
+
+def _mercadopago_order() -> Order:
+    return Order(
+        order_number="ORD-20261018120000-ABCDEF12",
+        customer_name="Ana Lopez",
+        customer_phone="5587654321",
+        items=[
+            OrderItem(
+                product_id=uuid4(),
+                quantity=1,
+                product_name_snapshot="Omega 3",
+                unit_price_cents_snapshot=25900,
+            )
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    ("status_code", "opens"),
+    [(400, False), (401, False), (404, False), (429, True), (500, True), (503, True)],
+)
+def test_mercadopago_breaker_counts_only_provider_failures(status_code: int, opens: bool) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status_code, json={"message": "error"})
+
+    breaker = CircuitBreaker(
+        "mercadopago",
+        window_size=2,
+        minimum_calls=2,
+        record_failure=is_provider_failure,
+    )
+    gateway = CircuitBreakingPaymentGateway(
+        MercadoPagoGateway(
+            access_token="TEST-token",
+            base_url="https://mp.test",
+            client=httpx.Client(transport=httpx.MockTransport(handler)),
+        ),
+        breaker,
+    )
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            gateway.create_preference(_mercadopago_order())
+
+    assert (breaker.stats().state == "open") is opens
+
+
+def test_mercadopago_failure_predicate_ignores_request_faults() -> None:
+    request = httpx.Request("POST", "https://mp.test/checkout/preferences")
+
+    assert is_provider_failure(httpx.ConnectError("refused", request=request))
+    assert is_provider_failure(httpx.ReadTimeout("timed out", request=request))
+    assert is_provider_failure(TimeoutError("timed out"))
+    assert not is_provider_failure(ValueError("MP_ACCESS_TOKEN is required for Mercado Pago payments"))
+
+    # A gateway without credentials never reaches the provider, so it cannot open the breaker.
+    breaker = CircuitBreaker(
+        "mercadopago",
+        window_size=2,
+        minimum_calls=2,
+        record_failure=is_provider_failure,
+    )
+    inner = MercadoPagoGateway(access_token=None)
+    gateway = CircuitBreakingPaymentGateway(inner, breaker)
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            gateway.create_preference(_mercadopago_order())
+    assert breaker.stats().state == "closed"
+    inner.close()
+
+
+def test_bulkhead_rejects_calls_beyond_concurrency_limit() -> None:
+    breaker = CircuitBreaker("provider", max_concurrent_calls=1)
+    entered = threading.Event()
+    release = threading.Event()
+
+    def blocking_call() -> str:
+        entered.set()
+        release.wait(5)
+        return "done"
+
+    worker = threading.Thread(target=lambda: breaker.call(blocking_call))
+    worker.start()
+    entered.wait(5)
+    try:
+        assert breaker.stats().in_flight == 1
+        with pytest.raises(BulkheadFullError):
+            breaker.call(lambda: "rejected")
+    finally:
+        release.set()
+        worker.join()
+
+    assert breaker.stats().in_flight == 0
+
+
+class FailingMercadoPagoGateway:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def create_preference(self, order) -> PaymentProviderResponse:  # type: ignore[no-untyped-def]
+        self.calls += 1
+        raise TimeoutError("provider timed out")
+
+
+engine = create_engine(
+    "sqlite+pysqlite://",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+
+
+def override_get_db() -> Generator[Session, None, None]:
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def test_open_breaker_fails_checkout_fast_with_503() -> None:
+    reset_sqlite_schema(engine)
+    provider = FailingMercadoPagoGateway()
+    breaker = CircuitBreaker("mercadopago", window_size=2, minimum_calls=2, open_seconds=30)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_mercadopago_gateway] = lambda: CircuitBreakingPaymentGateway(
+        provider, breaker
+    )
+    client = TestClient(app)
+    product_id = client.post(
+        "/api/v1/products",
+        json={"name": "Omega 3", "price_cents": 25900, "currency": "MXN", "stock": 10},
+    ).json()["id"]
+    payload = {
+        "customer_name": "Ana Lopez",
+        "customer_phone": "5587654321",
+        "payment_method": "mercadopago",
+        "items": [{"product_id": product_id, "quantity": 1}],
+    }
+
+    assert [client.post("/api/v1/orders", json=payload).status_code for _ in range(2)] == [502, 502]
+
+    rejected = client.post("/api/v1/orders", json=payload)
+    assert rejected.status_code == 503
+    assert 1 <= int(rejected.headers["retry-after"]) <= 30
+    assert provider.calls == 2
+
+    app.dependency_overrides.clear()
+
+
+def test_payment_gateway_stats_endpoint_reports_breaker_state() -> None:
+    app.dependency_overrides[get_settings] = lambda: Settings(ADMIN_API_TOKEN="test-admin-token")
+    client = TestClient(app)
+
+    assert client.get("/api/v1/orders/payment-gateway/stats").status_code == 401
+    response = client.get(
+        "/api/v1/orders/payment-gateway/stats",
+        headers={"X-Admin-Token": "test-admin-token"},
+    )
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["name"] == "mercadopago"
+    assert body["state"] in {"closed", "open", "half_open"}
+    assert body["max_concurrent_calls"] >= 1
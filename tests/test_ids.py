@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.contexts.store.orders.application.create_order import _generate_order_number
+from app.contexts.store.orders.domain.payment import Payment
+from app.shared.domain.ids import UUIDv7Generator, new_id, set_id_generator, uuid7_datetime
+
+FIXED_MS = 1_792_281_600_123  # 2026-10-18T00:00:00.123Z
+
+
+def test_uuidv7_ids_carry_version_variant_and_timestamp() -> None:
+    generator = UUIDv7Generator(clock_ms=lambda: FIXED_MS)
+
+    value = generator()
+
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+    assert uuid7_datetime(value) == datetime(2026, 10, 18, 0, 0, 0, 123000, tzinfo=UTC)
+
+
+def test_ids_increase_within_a_millisecond_and_when_the_clock_steps_back() -> None:
+    clock = iter([FIXED_MS] * 500 + [FIXED_MS - 5_000] * 500)
+    generator = UUIDv7Generator(clock_ms=lambda: next(clock))
+
+    ids = [generator() for _ in range(1000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 1000
+    assert {uuid7_datetime(value) for value in ids} == {uuid7_datetime(ids[0])}
+
+
+def test_counter_overflow_moves_to_the_next_millisecond() -> None:
+    generator = UUIDv7Generator(clock_ms=lambda: FIXED_MS, random_bits=lambda bits: (1 << 74) - 2)
+
+    first, second, third = generator(), generator(), generator()
+
+    assert first < second < third
+    assert (third.int >> 80) == FIXED_MS + 1
+
+
+def test_ids_are_unique_across_threads() -> None:
+    generator = UUIDv7Generator()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        batches = list(executor.map(lambda _: [generator() for _ in range(2000)], range(8)))
+
+    ids = [value for batch in batches for value in batch]
+    assert len(set(ids)) == len(ids)
+    assert all(batch == sorted(batch) for batch in batches)
+
+
+def test_entity_defaults_use_the_pluggable_generator() -> None:
+    fixed = UUID("01900000-0000-7000-8000-000000000001")
+    previous = set_id_generator(lambda: fixed)
+    try:
+        assert new_id() == fixed
+        assert Payment(order_id=uuid4(), amount_cents=100).id == fixed
+    finally:
+        set_id_generator(previous)
+
+    assert new_id().version == 7
+
+
+def test_order_numbers_do_not_collide_in_a_burst() -> None:
+    generator = UUIDv7Generator(clock_ms=lambda: FIXED_MS)
+
+    numbers = [_generate_order_number(generator()) for _ in range(10_000)]
+
+    assert len(set(numbers)) == len(numbers)
+    assert numbers[0].startswith("ORD-20261018000000-")
+    assert max(len(number) for number in numbers) <= 40
+
+
+def test_uuid7_datetime_rejects_other_versions() -> None:
+    with pytest.raises(ValueError):
+        uuid7_datetime(uuid4())
@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.order_item import OrderItem
+from app.contexts.store.orders.infrastructure.mercadopago.mercadopago_gateway import (
+    MercadoPagoGateway,
+    get_shared_mercadopago_gateway,
+)
+from app.main import app
+from app.shared.config.settings import get_settings
+
+
+class _TricklingHandler(BaseHTTPRequestHandler):
+    """Answers with a body sent one byte every 0.1s: never idle long enough to hit a read timeout."""
+
+    def do_GET(self) -> None:
+        body = b" " * 20 + json.dumps({"id": 1, "status": "approved", "transaction_amount": 1}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            for byte in body:
+                self.wfile.write(bytes([byte]))
+                self.wfile.flush()
+                time.sleep(0.1)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def trickling_server() -> Generator[str, None, None]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _TricklingHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _order() -> Order:
+    return Order(
+        order_number="ORD-20261018120000-ABCDEF12",
+        customer_name="Ana Lopez",
+        customer_phone="5587654321",
+        items=[
+            OrderItem(
+                product_id=uuid4(),
+                quantity=2,
+                product_name_snapshot="Omega 3",
+                unit_price_cents_snapshot=25900,
+            )
+        ],
+    )
+
+
+def test_gateway_reuses_its_client_for_every_preference() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            201,
+            json={"id": f"pref_{len(requests)}", "init_point": "https://mp.test/init-point"},
+        )
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    gateway = MercadoPagoGateway(
+        access_token="TEST-token",
+        base_url="https://mp.test/",
+        client=client,
+    )
+
+    first = gateway.create_preference(_order())
+    second = gateway.create_preference(_order())
+
+    assert (first.provider_payment_id, second.provider_payment_id) == ("pref_1", "pref_2")
+    assert str(requests[0].url) == "https://mp.test/checkout/preferences"
+    assert requests[0].headers["authorization"] == "Bearer TEST-token"
+    assert json.loads(requests[0].content)["items"][0]["unit_price"] == 259.0
+
+    gateway.close()
+    assert client.is_closed
+
+
+def test_gateway_reads_payment_status_from_the_api() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert str(request.url) == "https://mp.test/v1/payments/555"
+        return httpx.Response(
+            200,
+            json={
+                "id": 555,
+                "status": "approved",
+                "external_reference": "ORD-20261018120000-ABCDEF12",
+                "transaction_amount": 518.1,
+                "currency_id": "MXN",
+            },
+        )
+
+    gateway = MercadoPagoGateway(
+        access_token="TEST-token",
+        base_url="https://mp.test",
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+    payment = gateway.get_payment("555")
+
+    assert payment.provider_payment_id == "555"
+    assert payment.status == "approved"
+    assert payment.external_reference == "ORD-20261018120000-ABCDEF12"
+    assert payment.amount_cents == 51810
+    gateway.close()
+
+
+def test_gateway_cuts_a_slow_but_steady_response_at_the_call_deadline(trickling_server: str) -> None:
+    gateway = MercadoPagoGateway(
+        access_token="TEST-token",
+        base_url=trickling_server,
+        client=httpx.Client(timeout=1.0),
+        call_deadline_seconds=0.5,
+    )
+
+    started = time.monotonic()
+    with pytest.raises(httpx.TimeoutException):
+        gateway.get_payment("1")
+    elapsed = time.monotonic() - started
+    gateway.close()
+
+    assert elapsed < 1.5
+
+
+def test_shared_gateway_is_reused_and_closed_with_the_app(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "payment_webhook_worker_enabled", False)
+    monkeypatch.setattr(get_settings(), "order_expiration_sweeper_enabled", False)
+    with TestClient(app):
+        gateway = get_shared_mercadopago_gateway()
+        assert get_shared_mercadopago_gateway() is gateway
+
+    # Shutdown closed the pool; the next lookup builds a fresh gateway.
+    assert gateway._client.is_closed
+    assert get_shared_mercadopago_gateway() is not gateway
+    get_shared_mercadopago_gateway().close()
+    get_shared_mercadopago_gateway.cache_clear()
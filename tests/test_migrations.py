@@ -0,0 +1,184 @@
+import io
+import sqlite3
+from datetime import date
+from uuid import uuid4
+
+from alembic import command
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.contexts.store.orders.infrastructure.order_models import (
+    DailyOrderStatusRollupModel,
+    DailyProductSalesRollupModel,
+)
+from app.contexts.store.products.infrastructure.sql_product_repository import SQLProductRepository
+from app.shared.infrastructure.db.index_check import MissingIndex, find_missing_indexes
+from tests.sqlite_schema import alembic_config, reset_sqlite_schema
+
+
+def _sqlite_engine():
+    return create_engine(
+        "sqlite+pysqlite:///:memory:",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def test_migrated_schema_has_every_model_index() -> None:
+    engine = _sqlite_engine()
+    reset_sqlite_schema(engine)
+
+    with engine.connect() as connection:
+        assert find_missing_indexes(connection) == []
+
+
+def test_index_check_reports_indexes_dropped_from_the_database() -> None:
+    engine = _sqlite_engine()
+    reset_sqlite_schema(engine)
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_payments_order_id")
+        missing = find_missing_indexes(connection)
+
+    # The Postgres-only full-text index is never expected on SQLite.
+    assert missing == [MissingIndex(table="payments", index="ix_payments_order_id")]
+
+
+def test_migrations_render_offline_for_postgres() -> None:
+    buffer = io.StringIO()
+    config = alembic_config()
+    config.output_buffer = buffer
+    config.set_main_option("sqlalchemy.url", "postgresql+psycopg://user@localhost/ecommerce")
+
+    command.upgrade(config, "head", sql=True)
+
+    sql = buffer.getvalue()
+    assert "CREATE INDEX ix_products_is_active_created_at_id ON products" in sql
+    assert "USING gin (to_tsvector('spanish'::regconfig" in sql
+    assert "CREATE INDEX ix_order_items_order_id ON order_items (order_id)" in sql
+    assert "CREATE INDEX ix_payments_order_id ON payments (order_id)" in sql
+    assert "ALTER TABLE order_items ALTER COLUMN order_id TYPE UUID USING order_id::uuid" in sql
+    assert "products_fts" not in sql
+    assert "CAST(orders.created_at AT TIME ZONE 'UTC' AS DATE)" in sql
+
+
+def test_migrations_render_offline_for_sqlite() -> None:
+    buffer = io.StringIO()
+    config = alembic_config()
+    config.output_buffer = buffer
+    config.set_main_option("sqlalchemy.url", "sqlite:///offline.db")
+
+    command.upgrade(config, "head", sql=True)
+
+    sql = buffer.getvalue()
+    assert "UPDATE products SET id = CASE WHEN typeof(id) = 'text' THEN unhex(replace(id, '-', ''))" in sql
+    assert "CREATE TABLE _alembic_tmp_order_items" in sql
+    assert "updated_at DATETIME NOT NULL" in sql
+    assert "CREATE VIRTUAL TABLE products_fts USING fts5" in sql
+
+    # The script runs as-is on SQLite 3.41+, where unhex() is built in.
+    connection = sqlite3.connect(":memory:")
+    if sqlite3.sqlite_version_info < (3, 41):
+        connection.create_function("unhex", 1, bytes.fromhex, deterministic=True)
+    connection.executescript(sql)
+    head = ScriptDirectory.from_config(config).get_current_head()
+    assert connection.execute("SELECT version_num FROM alembic_version").fetchone() == (head,)
+    connection.close()
+
+
+def test_binary_uuid_migration_converts_existing_text_keys() -> None:
+    engine = _sqlite_engine()
+    product_id = uuid4()
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "0004")
+        connection.execute(
+            text(
+                "INSERT INTO products (id, name, price_cents, currency, stock, is_active) "
+                "VALUES (:id, 'Vitamina C', 1000, 'MXN', 3, 1)"
+            ),
+            {"id": str(product_id)},
+        )
+        connection.execute(
+            text("INSERT INTO products_fts (product_id, name, description) VALUES (:id, 'Vitamina C', '')"),
+            {"id": str(product_id)},
+        )
+        command.upgrade(config, "head")
+
+    with Session(engine) as session:
+        repository = SQLProductRepository(session)
+        product = repository.get_by_id(product_id)
+        found = repository.search_active("vitamina", limit=5)
+
+    assert product is not None and product.stock == 3
+    assert [item.id for item in found.items] == [product_id]
+
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.downgrade(config, "0004")
+        stored = connection.execute(text("SELECT id FROM products")).scalar_one()
+
+    assert stored == str(product_id)
+
+
+def test_sales_rollup_migration_backfills_existing_orders() -> None:
+    engine = _sqlite_engine()
+    product_id = uuid4()
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "0007")
+        for index, (status, created_at, quantity) in enumerate(
+            [
+                ("paid", "2026-10-01 09:00:00.000000", 2),
+                ("paid", "2026-10-01 23:30:00.000000", 1),
+                ("pending_payment", "2026-10-02 08:00:00.000000", 3),
+            ]
+        ):
+            order_id = uuid4()
+            connection.execute(
+                text(
+                    "INSERT INTO orders (id, order_number, customer_name, customer_phone, status, "
+                    "total_cents, created_at) "
+                    "VALUES (:id, :number, 'Ana Lopez', '5587654321', :status, :total, :created_at)"
+                ),
+                {
+                    "id": order_id.bytes,
+                    "number": f"ORD-{index}",
+                    "status": status,
+                    "total": quantity * 1000,
+                    "created_at": created_at,
+                },
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO order_items (id, order_id, product_id, quantity, product_name_snapshot, "
+                    "unit_price_cents_snapshot, line_total_cents, created_at) "
+                    "VALUES (:id, :order_id, :product_id, :quantity, 'Omega 3', 1000, :total, :created_at)"
+                ),
+                {
+                    "id": uuid4().bytes,
+                    "order_id": order_id.bytes,
+                    "product_id": product_id.bytes,
+                    "quantity": quantity,
+                    "total": quantity * 1000,
+                    "created_at": created_at,
+                },
+            )
+        command.upgrade(config, "head")
+
+    with Session(engine) as session:
+        statuses = session.execute(select(DailyOrderStatusRollupModel)).scalars().all()
+        products = session.execute(select(DailyProductSalesRollupModel)).scalars().all()
+        assert {(row.day, row.status, row.order_count, row.total_cents) for row in statuses} == {
+            (date(2026, 10, 1), "paid", 2, 3000),
+            (date(2026, 10, 2), "pending_payment", 1, 3000),
+        }
+        assert {(row.day, row.product_id, row.status, row.units) for row in products} == {
+            (date(2026, 10, 1), product_id, "paid", 3),
+            (date(2026, 10, 2), product_id, "pending_payment", 3),
+        }
@@ -0,0 +1,215 @@
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import Engine, create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.contexts.store.orders.application.apply_provider_payment import ApplyProviderPaymentUseCase
+from app.contexts.store.orders.application.create_order import (
+    CreateOrderCommand,
+    CreateOrderItemInput,
+    CreateOrderResult,
+    CreateOrderUseCase,
+)
+from app.contexts.store.orders.application.expire_orders import ExpireOrdersUseCase
+from app.contexts.store.orders.domain.order import Order, OrderStatus
+from app.contexts.store.orders.domain.order_item import OrderItem
+from app.contexts.store.orders.domain.payment_gateway import PaymentProviderResponse, ProviderPayment
+from app.contexts.store.orders.infrastructure.order_expiration_sweeper import OrderExpirationSweeper
+from app.contexts.store.orders.infrastructure.order_models import OrderModel, PaymentModel
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.contexts.store.products.domain.product import Product
+from app.contexts.store.products.infrastructure.product_model import ProductModel
+from app.contexts.store.products.infrastructure.sql_product_repository import SQLProductRepository
+from tests.sqlite_schema import reset_sqlite_schema
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=UTC)
+
+
+class _CheckoutGateway:
+    def create_preference(self, order: Order) -> PaymentProviderResponse:
+        return PaymentProviderResponse(
+            provider_payment_id=f"pref-{order.order_number}",
+            init_point=f"https://mp.test/checkout/{order.order_number}",
+        )
+
+    def get_payment(self, provider_payment_id: str) -> ProviderPayment:
+        raise AssertionError("the provider is not queried in these tests")
+
+
+def _file_engine(tmp_path: Path) -> Engine:
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'expiration.db'}",
+        future=True,
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    reset_sqlite_schema(engine)
+    return engine
+
+
+def _seed_product(session_factory: sessionmaker[Session], name: str, stock: int) -> UUID:
+    with session_factory() as session:
+        return SQLProductRepository(session).save(
+            Product(name=name, description=None, price_cents=9900, stock=stock)
+        ).id
+
+
+def _place_order(
+    session_factory: sessionmaker[Session],
+    order_number: str,
+    created_at: datetime,
+    quantities: dict[UUID, int],
+    status: OrderStatus = "pending_payment",
+) -> None:
+    with session_factory() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        assert repository.reserve_stock(quantities)
+        repository.add_order(
+            Order(
+                order_number=order_number,
+                customer_name="Ana Lopez",
+                customer_phone="5587654321",
+                status=status,
+                created_at=created_at,
+                items=[
+                    OrderItem(
+                        product_id=product_id,
+                        quantity=quantity,
+                        product_name_snapshot="Producto",
+                        unit_price_cents_snapshot=9900,
+                    )
+                    for product_id, quantity in quantities.items()
+                ],
+            )
+        )
+        repository.commit()
+
+
+def _order_statuses(session_factory: sessionmaker[Session]) -> dict[str, str]:
+    with session_factory() as session:
+        rows = session.execute(select(OrderModel.order_number, OrderModel.status)).all()
+    return {order_number: status for order_number, status in rows}
+
+
+def _stock(session_factory: sessionmaker[Session], product_id: UUID) -> int:
+    with session_factory() as session:
+        return session.execute(
+            select(ProductModel.stock).where(ProductModel.id == product_id)
+        ).scalar_one()
+
+
+def test_stale_unpaid_orders_expire_in_batches_and_release_their_stock(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    omega = _seed_product(session_factory, "Omega 3", stock=20)
+    magnesio = _seed_product(session_factory, "Magnesio", stock=20)
+
+    for index in range(5):
+        _place_order(
+            session_factory,
+            f"ORD-STALE-{index}",
+            NOW - timedelta(days=2, minutes=index),
+            {omega: 1, magnesio: 2},
+        )
+    _place_order(session_factory, "ORD-PAID", NOW - timedelta(days=3), {omega: 4}, status="paid")
+    _place_order(session_factory, "ORD-FRESH", NOW - timedelta(hours=1), {magnesio: 3})
+    assert (_stock(session_factory, omega), _stock(session_factory, magnesio)) == (11, 7)
+
+    with session_factory() as session:
+        result = ExpireOrdersUseCase(
+            SQLOrderRepository(session),
+            batch_size=2,
+            clock=lambda: NOW,
+        ).execute(max_age=timedelta(days=1))
+
+    assert (result.expired, result.batches) == (5, 3)
+    statuses = _order_statuses(session_factory)
+    assert all(statuses[f"ORD-STALE-{index}"] == "expired" for index in range(5))
+    assert statuses["ORD-PAID"] == "paid"
+    assert statuses["ORD-FRESH"] == "pending_payment"
+    # Only the expired orders gave their units back.
+    assert (_stock(session_factory, omega), _stock(session_factory, magnesio)) == (16, 17)
+
+    with session_factory() as session:
+        again = ExpireOrdersUseCase(SQLOrderRepository(session), clock=lambda: NOW).execute(
+            max_age=timedelta(days=1)
+        )
+    assert (again.expired, again.batches) == (0, 0)
+    assert (_stock(session_factory, omega), _stock(session_factory, magnesio)) == (16, 17)
+
+    engine.dispose()
+
+
+def test_abandoned_checkout_expires_but_a_payment_in_process_holds_its_order(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    product_id = _seed_product(session_factory, "Omega 3", stock=5)
+
+    def checkout() -> CreateOrderResult:
+        with session_factory() as session:
+            use_case = CreateOrderUseCase(SQLOrderRepository(session), payment_gateway=_CheckoutGateway())
+            return use_case.execute(
+                CreateOrderCommand(
+                    customer_name="Ana Lopez",
+                    customer_phone="5587654321",
+                    items=[CreateOrderItemInput(product_id=product_id, quantity=1)],
+                    payment_method="mercadopago",
+                )
+            )
+
+    abandoned = checkout()
+    in_process = checkout()
+    # Only the second buyer started paying: Mercado Pago reports the payment in process.
+    with session_factory() as session:
+        ApplyProviderPaymentUseCase(SQLOrderRepository(session), _CheckoutGateway()).apply(
+            ProviderPayment(
+                "77",
+                "in_process",
+                in_process.order.order_number,
+                in_process.order.total_cents,
+                "MXN",
+            )
+        )
+    assert _stock(session_factory, product_id) == 3
+
+    with session_factory() as session:
+        result = ExpireOrdersUseCase(
+            SQLOrderRepository(session),
+            clock=lambda: datetime.now(UTC) + timedelta(days=2),
+        ).execute(max_age=timedelta(days=1))
+        payment_statuses = dict(session.execute(select(PaymentModel.order_id, PaymentModel.status)).all())
+
+    assert result.expired == 1
+    statuses = _order_statuses(session_factory)
+    assert statuses[abandoned.order.order_number] == "expired"
+    assert statuses[in_process.order.order_number] == "pending_payment"
+    assert payment_statuses == {abandoned.order.id: "created", in_process.order.id: "pending"}
+    assert _stock(session_factory, product_id) == 4
+    engine.dispose()
+
+
+def test_sweeper_expires_orders_in_the_background(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    product_id = _seed_product(session_factory, "Omega 3", stock=5)
+    _place_order(session_factory, "ORD-STALE", datetime.now(UTC) - timedelta(hours=2), {product_id: 2})
+
+    sweeper = OrderExpirationSweeper(
+        session_factory,
+        max_age=timedelta(hours=1),
+        interval_seconds=60.0,
+    )
+    sweeper.start()
+    try:
+        deadline = time.monotonic() + 5
+        while _order_statuses(session_factory)["ORD-STALE"] != "expired" and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        sweeper.stop()
+
+    assert _order_statuses(session_factory)["ORD-STALE"] == "expired"
+    assert _stock(session_factory, product_id) == 5
+    engine.dispose()
@@ -0,0 +1,203 @@
+import csv
+import io
+import json
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.contexts.store.orders.application.export_order_lines import ORDER_LINE_EXPORT_COLUMNS
+from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.order_item import OrderItem
+from app.contexts.store.orders.domain.order_repository import OrderListFilter
+from app.contexts.store.orders.domain.payment import Payment
+from app.contexts.store.orders.infrastructure.cli import export_order_lines
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.main import app
+from app.shared.config.settings import Settings, get_settings
+from app.shared.infrastructure.db.session import get_db
+from tests.sqlite_schema import reset_sqlite_schema
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-admin-token"}
+
+engine = create_engine(
+    "sqlite+pysqlite://",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+
+
+def override_get_db() -> Generator[Session, None, None]:
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _seed_orders(count: int, lines_per_order: int = 3) -> datetime:
+    """Insert `count` orders one minute apart; odd orders have no payment yet."""
+
+    base = datetime(2026, 9, 1, 12, 0, tzinfo=UTC)
+    with TestingSessionLocal() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        for index in range(count):
+            order = Order(
+                order_number=f"ORD-{index:04d}",
+                customer_name=f"Cliente, {index}",
+                customer_phone="5511111111" if index % 2 == 0 else "5522222222",
+                status="paid" if index % 2 == 0 else "pending_payment",
+                created_at=base + timedelta(minutes=index),
+                items=[
+                    OrderItem(
+                        product_id=uuid4(),
+                        quantity=line + 1,
+                        product_name_snapshot=f'Producto "{line}"',
+                        unit_price_cents_snapshot=1500,
+                    )
+                    for line in range(lines_per_order)
+                ],
+            )
+            repository.add_order(order)
+            if index % 2 == 0:
+                repository.add_payment(
+                    Payment(
+                        order_id=order.id,
+                        amount_cents=order.total_cents,
+                        status="approved",
+                        external_payment_id=f"mp-{index}",
+                    )
+                )
+        repository.commit()
+    return base
+
+
+def _admin_client(chunk_size: int = 1000) -> TestClient:
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_settings] = lambda: Settings(
+        ADMIN_API_TOKEN="test-admin-token",
+        ORDER_EXPORT_CHUNK_SIZE=chunk_size,
+    )
+    return TestClient(app)
+
+
+def test_export_requires_admin_token() -> None:
+    reset_sqlite_schema(engine)
+    client = _admin_client()
+
+    assert client.get("/api/v1/orders/export").status_code == 401
+
+    app.dependency_overrides.clear()
+
+
+def test_export_streams_csv_with_header_and_every_line_oldest_first() -> None:
+    reset_sqlite_schema(engine)
+    _seed_orders(5)
+    client = _admin_client(chunk_size=4)
+
+    response = client.get("/api/v1/orders/export", headers=ADMIN_HEADERS)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "order-lines.csv" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert tuple(rows[0]) == ORDER_LINE_EXPORT_COLUMNS
+    assert len(rows) == 15
+    assert [row["order_number"] for row in rows[::3]] == [f"ORD-{i:04d}" for i in range(5)]
+    assert rows[0]["customer_name"] == "Cliente, 0"
+    first_order = {row["product_name"]: row for row in rows[:3]}
+    assert first_order['Producto "1"']["line_total_cents"] == "3000"
+    assert rows[0]["payment_status"] == "approved"
+    assert rows[0]["external_payment_id"] == "mp-0"
+    assert rows[3]["payment_status"] == ""
+    assert datetime.fromisoformat(rows[0]["order_created_at"]) == datetime(2026, 9, 1, 12, 0, tzinfo=UTC)
+
+    app.dependency_overrides.clear()
+
+
+def test_export_streams_filtered_ndjson() -> None:
+    reset_sqlite_schema(engine)
+    base = _seed_orders(6, lines_per_order=2)
+    client = _admin_client(chunk_size=1)
+
+    response = client.get(
+        "/api/v1/orders/export",
+        params={
+            "format": "ndjson",
+            "status": "paid",
+            "created_from": (base + timedelta(minutes=1)).isoformat(),
+        },
+        headers=ADMIN_HEADERS,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["order_number"] for line in lines] == ["ORD-0002", "ORD-0002", "ORD-0004", "ORD-0004"]
+    assert {line["order_status"] for line in lines} == {"paid"}
+    assert lines[0]["payment_amount_cents"] == lines[0]["order_total_cents"]
+
+    app.dependency_overrides.clear()
+
+
+def test_iter_order_lines_yields_chunks_of_chunk_size() -> None:
+    reset_sqlite_schema(engine)
+    _seed_orders(3)
+
+    with TestingSessionLocal() as session:
+        chunks = list(SQLOrderRepository(session).iter_order_lines(OrderListFilter(), chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2, 2, 1]
+
+
+def test_iter_order_lines_uses_only_the_latest_payment_of_each_order() -> None:
+    reset_sqlite_schema(engine)
+    _seed_orders(1, lines_per_order=2)
+    with TestingSessionLocal() as session:
+        order_id = SQLOrderRepository(session).list_orders(OrderListFilter(), limit=1).items[0].order.id
+    with TestingSessionLocal() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        repository.add_payment(
+            Payment(
+                order_id=order_id,
+                amount_cents=4500,
+                status="refunded",
+                external_payment_id="mp-retry",
+                created_at=datetime.now(UTC) + timedelta(minutes=1),
+            )
+        )
+        repository.commit()
+
+        lines = [line for chunk in repository.iter_order_lines(OrderListFilter()) for line in chunk]
+
+    assert len(lines) == 2
+    assert {(line.payment_status, line.external_payment_id) for line in lines} == {
+        ("refunded", "mp-retry")
+    }
+
+
+def test_cli_export_writes_csv_to_output() -> None:
+    reset_sqlite_schema(engine)
+    _seed_orders(2)
+    output = io.BytesIO()
+
+    with TestingSessionLocal() as session:
+        export_order_lines(
+            session,
+            output,
+            "csv",
+            OrderListFilter(customer_phone="5522222222"),
+            chunk_size=10,
+        )
+
+    rows = list(csv.DictReader(io.StringIO(output.getvalue().decode("utf-8"))))
+    assert {row["order_number"] for row in rows} == {"ORD-0001"}
+    assert len(rows) == 3
@@ -0,0 +1,349 @@
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.contexts.store.orders.application.create_order import (
+    CreateOrderCommand,
+    CreateOrderItemInput,
+    CreateOrderUseCase,
+    IdempotencyClaimLostError,
+)
+from app.contexts.store.orders.application.idempotent_create_order import (
+    IdempotencyKeyInProgressError,
+    IdempotentCreateOrderUseCase,
+    request_fingerprint,
+)
+from app.contexts.store.orders.domain.idempotency_store import IdempotencyClaim, OrderReceipt
+from app.contexts.store.orders.domain.payment import Payment
+from app.contexts.store.orders.domain.payment_gateway import PaymentProviderResponse
+from app.contexts.store.orders.infrastructure.http.router import get_mercadopago_gateway
+from app.contexts.store.orders.infrastructure.sql_idempotency_store import SQLIdempotencyStore
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.contexts.store.products.domain.product import Product
+from app.contexts.store.products.infrastructure.sql_product_repository import SQLProductRepository
+from app.main import app
+from app.shared.infrastructure.db.session import get_db
+from tests.sqlite_schema import reset_sqlite_schema
+
+
+class CountingMercadoPagoGateway:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def create_preference(self, order) -> PaymentProviderResponse:  # type: ignore[no-untyped-def]
+        self.calls += 1
+        return PaymentProviderResponse(
+            provider_payment_id=f"pref_{self.calls}",
+            init_point=f"https://mp.test/init-point/{self.calls}",
+            sandbox_init_point=None,
+        )
+
+
+class FailingMercadoPagoGateway:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def create_preference(self, order) -> PaymentProviderResponse:  # type: ignore[no-untyped-def]
+        self.calls += 1
+        raise RuntimeError("Mercado Pago timed out")
+
+
+engine = create_engine(
+    "sqlite+pysqlite://",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+
+
+def override_get_db() -> Generator[Session, None, None]:
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _order_payload(product_id: str, quantity: int = 1) -> dict[str, object]:
+    return {
+        "customer_name": "Ana Lopez",
+        "customer_phone": "5587654321",
+        "payment_method": "mercadopago",
+        "items": [{"product_id": product_id, "quantity": quantity}],
+    }
+
+
+def _command_for(product_id: str, quantity: int = 1) -> CreateOrderCommand:
+    return CreateOrderCommand(
+        customer_name="Ana Lopez",
+        customer_phone="5587654321",
+        items=[CreateOrderItemInput(product_id=UUID(product_id), quantity=quantity)],
+        payment_method="mercadopago",
+    )
+
+
+def _create_product(client: TestClient, stock: int = 10) -> str:
+    response = client.post(
+        "/api/v1/products",
+        json={"name": "Vitamina C", "price_cents": 9900, "currency": "MXN", "stock": stock},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_retried_order_with_same_idempotency_key_is_created_once() -> None:
+    reset_sqlite_schema(engine)
+    gateway = CountingMercadoPagoGateway()
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_mercadopago_gateway] = lambda: gateway
+    client = TestClient(app)
+    product_id = _create_product(client)
+    headers = {"Idempotency-Key": "checkout-7f3a"}
+
+    first = client.post("/api/v1/orders", json=_order_payload(product_id), headers=headers)
+    retry = client.post("/api/v1/orders", json=_order_payload(product_id), headers=headers)
+
+    assert first.status_code == 201
+    assert retry.status_code == 201
+    assert retry.json() == first.json()
+    assert "idempotent-replayed" not in first.headers
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert gateway.calls == 1
+
+    with TestingSessionLocal() as session:
+        assert session.execute(text("SELECT COUNT(*) FROM orders")).scalar_one() == 1
+        assert session.execute(text("SELECT stock FROM products")).scalar_one() == 9
+
+    app.dependency_overrides.clear()
+
+
+def test_idempotency_key_reused_for_another_request_is_rejected() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_mercadopago_gateway] = lambda: CountingMercadoPagoGateway()
+    client = TestClient(app)
+    product_id = _create_product(client)
+    headers = {"Idempotency-Key": "checkout-reused"}
+
+    assert client.post("/api/v1/orders", json=_order_payload(product_id), headers=headers).status_code == 201
+    mismatch = client.post("/api/v1/orders", json=_order_payload(product_id, 2), headers=headers)
+
+    assert mismatch.status_code == 422
+
+    app.dependency_overrides.clear()
+
+
+def test_in_flight_idempotency_key_returns_conflict_and_failures_release_it() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_mercadopago_gateway] = lambda: CountingMercadoPagoGateway()
+    client = TestClient(app)
+    product_id = _create_product(client, stock=1)
+    now = datetime.now(UTC)
+
+    with TestingSessionLocal() as session:
+        assert SQLIdempotencyStore(session).claim(
+            IdempotencyClaim("checkout-busy", uuid4()),
+            request_fingerprint(_command_for(product_id)),
+            now,
+            now + timedelta(minutes=5),
+            now + timedelta(minutes=5),
+        )
+
+    busy = client.post(
+        "/api/v1/orders",
+        json=_order_payload(product_id),
+        headers={"Idempotency-Key": "checkout-busy"},
+    )
+    assert busy.status_code == 409
+
+    # A request that fails frees its key, so the retry runs again instead of conflicting.
+    headers = {"Idempotency-Key": "checkout-short"}
+    assert client.post("/api/v1/orders", json=_order_payload(product_id, 5), headers=headers).status_code == 409
+    assert client.post("/api/v1/orders", json=_order_payload(product_id, 5), headers=headers).status_code == 409
+    with TestingSessionLocal() as session:
+        assert SQLIdempotencyStore(session).get("checkout-short") is None
+
+    app.dependency_overrides.clear()
+
+
+def test_retry_after_gateway_failure_replays_the_committed_order() -> None:
+    reset_sqlite_schema(engine)
+    gateway = FailingMercadoPagoGateway()
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_mercadopago_gateway] = lambda: gateway
+    client = TestClient(app)
+    product_id = _create_product(client)
+    headers = {"Idempotency-Key": "checkout-gateway-down"}
+
+    failed = client.post("/api/v1/orders", json=_order_payload(product_id, 2), headers=headers)
+    retry = client.post("/api/v1/orders", json=_order_payload(product_id, 2), headers=headers)
+
+    assert failed.status_code == 502
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json()["status"] == "pending_payment"
+    assert retry.json()["payment_url"] is None
+    assert gateway.calls == 1
+
+    with TestingSessionLocal() as session:
+        assert session.execute(text("SELECT COUNT(*) FROM orders")).scalar_one() == 1
+        assert session.execute(text("SELECT stock FROM products")).scalar_one() == 8
+        order_number = session.execute(text("SELECT order_number FROM orders")).scalar_one()
+    assert retry.json()["order_number"] == order_number
+
+    app.dependency_overrides.clear()
+
+
+class _PaymentWriteFailsRepository(SQLOrderRepository):
+    def attach_payment_preference(self, payment: Payment) -> bool:
+        raise RuntimeError("connection lost")
+
+
+def test_request_that_died_after_its_order_committed_is_replayed_not_ordered_again() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    product_id = _create_product(TestClient(app))
+    app.dependency_overrides.clear()
+    command = _command_for(product_id)
+    now = datetime.now(UTC)
+
+    def submit(repository_class: type[SQLOrderRepository], at: datetime) -> OrderReceipt:
+        with TestingSessionLocal() as session:
+            return IdempotentCreateOrderUseCase(
+                SQLIdempotencyStore(session),
+                CreateOrderUseCase(repository_class(session), payment_gateway=CountingMercadoPagoGateway()),
+                clock=lambda: at,
+            ).execute("checkout-crash", command).receipt
+
+    # The order commits, then writing the payment URL fails and the request dies.
+    with pytest.raises(RuntimeError):
+        submit(_PaymentWriteFailsRepository, now)
+    with pytest.raises(IdempotencyKeyInProgressError):
+        submit(SQLOrderRepository, now + timedelta(seconds=30))
+
+    # Once the lease lapses the claim is not taken over: the committed order is replayed.
+    replayed = submit(SQLOrderRepository, now + timedelta(minutes=5))
+
+    with TestingSessionLocal() as session:
+        order_number = session.execute(text("SELECT order_number FROM orders")).scalar_one()
+        assert session.execute(text("SELECT COUNT(*) FROM orders")).scalar_one() == 1
+        assert session.execute(text("SELECT stock FROM products")).scalar_one() == 9
+    assert (replayed.order_number, replayed.payment_url) == (order_number, None)
+
+
+def test_order_of_a_taken_over_claim_is_rolled_back() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    product_id = _create_product(TestClient(app))
+    app.dependency_overrides.clear()
+    command = _command_for(product_id)
+    now = datetime.now(UTC)
+    stale = IdempotencyClaim("checkout-slow", uuid4())
+
+    with TestingSessionLocal() as session:
+        store = SQLIdempotencyStore(session)
+        assert _claim(store, stale.key, request_fingerprint(command), now - timedelta(minutes=5), stale.token)
+        assert _claim(store, stale.key, request_fingerprint(command), now)
+
+    with TestingSessionLocal() as session, pytest.raises(IdempotencyClaimLostError):
+        CreateOrderUseCase(SQLOrderRepository(session), payment_gateway=CountingMercadoPagoGateway()).execute(
+            command, idempotency_claim=stale
+        )
+
+    with TestingSessionLocal() as session:
+        assert session.execute(text("SELECT COUNT(*) FROM orders")).scalar_one() == 0
+        assert session.execute(text("SELECT stock FROM products")).scalar_one() == 10
+
+
+def _claim(
+    store: SQLIdempotencyStore,
+    key: str,
+    fingerprint: str,
+    at: datetime,
+    token: UUID | None = None,
+) -> bool:
+    claim = IdempotencyClaim(key, token or uuid4())
+    return store.claim(claim, fingerprint, at, at + timedelta(days=1), at + timedelta(minutes=2))
+
+
+def test_expired_idempotency_keys_are_purged_and_can_be_claimed_again() -> None:
+    reset_sqlite_schema(engine)
+    now = datetime.now(UTC)
+
+    with TestingSessionLocal() as session:
+        store = SQLIdempotencyStore(session)
+        assert _claim(store, "stale", "a" * 64, now - timedelta(days=2))
+        fresh_token = uuid4()
+        assert _claim(store, "fresh", "b" * 64, now, fresh_token)
+        assert not _claim(store, "fresh", "b" * 64, now)
+
+        # An expired key is taken over by a new claim without waiting for the purge.
+        assert _claim(store, "stale", "c" * 64, now)
+        record = store.get("stale")
+        assert record is not None and record.request_fingerprint == "c" * 64
+
+        # So is a claim whose lease lapsed without completing, well before its TTL; the stale
+        # request can no longer complete the key its successor holds.
+        stale_token, successor_token = uuid4(), uuid4()
+        receipt = OrderReceipt(order_number="ORD-1", status="pending_payment", total_cents=1)
+        assert _claim(store, "abandoned", "e" * 64, now - timedelta(minutes=5), stale_token)
+        assert _claim(store, "abandoned", "e" * 64, now, successor_token)
+        assert not store.complete(IdempotencyClaim("abandoned", stale_token), receipt)
+        assert store.complete(IdempotencyClaim("abandoned", successor_token), receipt)
+        assert store.complete(IdempotencyClaim("fresh", fresh_token), receipt)
+        assert not _claim(store, "fresh", "b" * 64, now + timedelta(hours=1))
+
+        assert _claim(store, "old", "d" * 64, now - timedelta(days=2, hours=-1))
+        assert store.purge_expired(now) == 1
+        assert store.get("old") is None
+        assert store.get("fresh") is not None
+
+
+def test_concurrent_duplicates_create_a_single_order(tmp_path: Path) -> None:
+    file_engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'orders.db'}",
+        future=True,
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    reset_sqlite_schema(file_engine)
+    SessionFactory = sessionmaker(bind=file_engine, class_=Session, autoflush=False, autocommit=False)
+    gateway = CountingMercadoPagoGateway()
+
+    with SessionFactory() as session:
+        product = SQLProductRepository(session).save(
+            Product(name="Proteina", description=None, price_cents=59900, stock=50)
+        )
+    command = _command_for(str(product.id))
+
+    def submit(_: int) -> str:
+        with SessionFactory() as session:
+            use_case = IdempotentCreateOrderUseCase(
+                SQLIdempotencyStore(session),
+                CreateOrderUseCase(SQLOrderRepository(session), payment_gateway=gateway),
+            )
+            try:
+                return use_case.execute("checkout-race", command).receipt.order_number
+            except IdempotencyKeyInProgressError:
+                return "in_progress"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = list(executor.map(submit, range(16)))
+
+    with SessionFactory() as session:
+        order_count = session.execute(text("SELECT COUNT(*) FROM orders")).scalar_one()
+
+    order_numbers = {outcome for outcome in outcomes if outcome != "in_progress"}
+    assert order_count == 1
+    assert gateway.calls == 1
+    assert len(order_numbers) == 1
+    file_engine.dispose()
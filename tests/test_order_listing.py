@@ -0,0 +1,152 @@
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.order_item import OrderItem
+from app.contexts.store.orders.domain.payment import Payment
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.main import app
+from app.shared.config.settings import Settings, get_settings
+from app.shared.infrastructure.db.session import get_db
+from tests.sqlite_schema import reset_sqlite_schema
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-admin-token"}
+
+engine = create_engine(
+    "sqlite+pysqlite://",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+
+
+def override_get_db() -> Generator[Session, None, None]:
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _seed_orders(count: int) -> datetime:
+    """Insert `count` orders one minute apart, each with two items and a payment."""
+
+    base = datetime(2026, 9, 1, 12, 0, tzinfo=UTC)
+    with TestingSessionLocal() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        for index in range(count):
+            order = Order(
+                order_number=f"ORD-{index:04d}",
+                customer_name=f"Cliente {index}",
+                customer_phone="5511111111" if index % 2 == 0 else "5522222222",
+                status="paid" if index % 3 == 0 else "pending_payment",
+                created_at=base + timedelta(minutes=index),
+                items=[
+                    OrderItem(
+                        product_id=uuid4(),
+                        quantity=index % 4 + 1,
+                        product_name_snapshot=f"Producto {line}",
+                        unit_price_cents_snapshot=1000,
+                    )
+                    for line in range(2)
+                ],
+            )
+            repository.add_order(order)
+            repository.add_payment(
+                Payment(order_id=order.id, amount_cents=order.total_cents, status="created")
+            )
+        repository.commit()
+    return base
+
+
+def _admin_client() -> TestClient:
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_settings] = lambda: Settings(ADMIN_API_TOKEN="test-admin-token")
+    return TestClient(app)
+
+
+def test_list_orders_requires_admin_token() -> None:
+    reset_sqlite_schema(engine)
+    client = _admin_client()
+
+    assert client.get("/api/v1/orders").status_code == 401
+    assert client.get("/api/v1/orders", headers={"X-Admin-Token": "wrong"}).status_code == 401
+
+    app.dependency_overrides[get_settings] = lambda: Settings(ADMIN_API_TOKEN=None)
+    assert client.get("/api/v1/orders", headers=ADMIN_HEADERS).status_code == 403
+
+    app.dependency_overrides.clear()
+
+
+def test_list_orders_pages_with_items_and_payment_in_three_queries() -> None:
+    reset_sqlite_schema(engine)
+    _seed_orders(7)
+    client = _admin_client()
+    statements: list[str] = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        first = client.get("/api/v1/orders", params={"limit": 3}, headers=ADMIN_HEADERS)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert first.status_code == 200
+    assert len(statements) == 3
+    body = first.json()
+    assert [order["order_number"] for order in body["items"]] == ["ORD-0006", "ORD-0005", "ORD-0004"]
+    assert len(body["items"][0]["items"]) == 2
+    assert body["items"][0]["payment"]["amount_cents"] == body["items"][0]["total_cents"]
+
+    seen = [order["order_number"] for order in body["items"]]
+    cursor = body["next_cursor"]
+    while cursor is not None:
+        page = client.get(
+            "/api/v1/orders",
+            params={"limit": 3, "cursor": cursor},
+            headers=ADMIN_HEADERS,
+        ).json()
+        seen.extend(order["order_number"] for order in page["items"])
+        cursor = page["next_cursor"]
+
+    assert seen == [f"ORD-{index:04d}" for index in range(6, -1, -1)]
+
+    app.dependency_overrides.clear()
+
+
+def test_list_orders_filters_by_status_phone_and_date_range() -> None:
+    reset_sqlite_schema(engine)
+    base = _seed_orders(12)
+    client = _admin_client()
+
+    def order_numbers(**params: str) -> list[str]:
+        response = client.get("/api/v1/orders", params=params, headers=ADMIN_HEADERS)
+        assert response.status_code == 200
+        return [order["order_number"] for order in response.json()["items"]]
+
+    assert order_numbers(status="paid") == ["ORD-0009", "ORD-0006", "ORD-0003", "ORD-0000"]
+    assert order_numbers(status="paid", customer_phone="5511111111") == ["ORD-0006", "ORD-0000"]
+    assert order_numbers(
+        created_from=(base + timedelta(minutes=2)).isoformat(),
+        created_to=(base + timedelta(minutes=5)).isoformat(),
+    ) == ["ORD-0004", "ORD-0003", "ORD-0002"]
+
+    invalid_range = client.get(
+        "/api/v1/orders",
+        params={"created_from": base.isoformat(), "created_to": base.isoformat()},
+        headers=ADMIN_HEADERS,
+    )
+    assert invalid_range.status_code == 422
+    assert client.get("/api/v1/orders", params={"cursor": "@@"}, headers=ADMIN_HEADERS).status_code == 400
+
+    app.dependency_overrides.clear()
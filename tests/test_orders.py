@@ -1,13 +1,30 @@
 from collections.abc import Generator
-from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+from uuid import UUID, uuid4
 
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, select, text
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.contexts.store.orders.application.create_order import (
+    CreateOrderCommand,
+    CreateOrderItemInput,
+    CreateOrderUseCase,
+    InsufficientStockError,
+)
 from app.contexts.store.orders.domain.payment_gateway import PaymentProviderResponse
 from app.contexts.store.orders.infrastructure.http.router import get_mercadopago_gateway
+from app.contexts.store.orders.infrastructure.order_expiration_sweeper import OrderExpirationSweeper
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.contexts.store.products.infrastructure.cached_product_repository import (
+    get_product_cache_invalidation,
+)
+from app.contexts.store.products.domain.product import Product
+from app.contexts.store.products.infrastructure.product_model import ProductModel
+from app.contexts.store.products.infrastructure.sql_product_repository import SQLProductRepository
 from app.main import app
 from app.shared.infrastructure.db.session import get_db
 from tests.sqlite_schema import reset_sqlite_schema
@@ -192,3 +209,225 @@ def test_create_order_with_cash_does_not_return_payment_url() -> None:
     assert body["payment_url"] is None
 
     app.dependency_overrides.clear()
+
+
+def test_create_order_reserves_stock_and_rejects_short_lines() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_mercadopago_gateway] = lambda: FakeMercadoPagoGateway()
+    client = TestClient(app)
+
+    in_stock_id = client.post(
+        "/api/v1/products",
+        json={"name": "Magnesio", "price_cents": 12900, "currency": "MXN", "stock": 5},
+    ).json()["id"]
+    scarce_id = client.post(
+        "/api/v1/products",
+        json={"name": "Colageno", "price_cents": 39900, "currency": "MXN", "stock": 1},
+    ).json()["id"]
+
+    ok_response = client.post(
+        "/api/v1/orders",
+        json={
+            "customer_name": "Juan Perez",
+            "customer_phone": "5512345678",
+            "items": [
+                {"product_id": in_stock_id, "quantity": 2},
+                {"product_id": in_stock_id, "quantity": 1},
+            ],
+        },
+    )
+    assert ok_response.status_code == 201
+
+    short_response = client.post(
+        "/api/v1/orders",
+        json={
+            "customer_name": "Ana Lopez",
+            "customer_phone": "5587654321",
+            "items": [
+                {"product_id": in_stock_id, "quantity": 1},
+                {"product_id": scarce_id, "quantity": 2},
+            ],
+        },
+    )
+    assert short_response.status_code == 409
+
+    with TestingSessionLocal() as session:
+        stock = {
+            str(product_id): value
+            for product_id, value in session.execute(select(ProductModel.id, ProductModel.stock))
+        }
+        order_count = session.execute(text("SELECT COUNT(*) FROM orders")).scalar_one()
+
+    # The rejected order rolled back the line that did fit.
+    assert stock == {in_stock_id: 2, scarce_id: 1}
+    assert order_count == 1
+
+    app.dependency_overrides.clear()
+
+
+def test_concurrent_orders_never_oversell(tmp_path: Path) -> None:
+    file_engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'orders.db'}",
+        future=True,
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    reset_sqlite_schema(file_engine)
+    SessionFactory = sessionmaker(bind=file_engine, class_=Session, autoflush=False, autocommit=False)
+
+    with SessionFactory() as session:
+        product = SQLProductRepository(session).save(
+            Product(name="Edicion limitada", description=None, price_cents=9900, stock=10)
+        )
+
+    def buy(product_id: UUID) -> bool:
+        with SessionFactory() as session:
+            use_case = CreateOrderUseCase(
+                SQLOrderRepository(session),
+                payment_gateway=FakeMercadoPagoGateway(),
+            )
+            try:
+                use_case.execute(
+                    CreateOrderCommand(
+                        customer_name="Comprador",
+                        customer_phone="5500000000",
+                        items=[CreateOrderItemInput(product_id=product_id, quantity=1)],
+                        payment_method="cash",
+                    )
+                )
+            except InsufficientStockError:
+                return False
+            return True
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = list(executor.map(buy, [product.id] * 40))
+
+    with SessionFactory() as session:
+        stored = SQLProductRepository(session).get_by_id(product.id)
+        order_count = session.execute(text("SELECT COUNT(*) FROM orders")).scalar_one()
+
+    assert outcomes.count(True) == 10
+    assert stored is not None and stored.stock == 0
+    assert order_count == 10
+    file_engine.dispose()
+
+
+def test_order_persistence_statement_count_does_not_grow_with_cart_size() -> None:
+    reset_sqlite_schema(engine)
+    statements: list[str] = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    with TestingSessionLocal() as session:
+        product_repository = SQLProductRepository(session)
+        product_ids = [
+            product_repository.save(
+                Product(name=f"Producto {index}", description=None, price_cents=1000, stock=50)
+            ).id
+            for index in range(12)
+        ]
+
+    def create_order(item_count: int) -> int:
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            with TestingSessionLocal() as session:
+                CreateOrderUseCase(
+                    SQLOrderRepository(session),
+                    payment_gateway=FakeMercadoPagoGateway(),
+                ).execute(
+                    CreateOrderCommand(
+                        customer_name="Juan Perez",
+                        customer_phone="5512345678",
+                        items=[
+                            CreateOrderItemInput(product_id=product_id, quantity=1)
+                            for product_id in product_ids[:item_count]
+                        ],
+                        payment_method="cash",
+                    )
+                )
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+        return len(statements)
+
+    single_item = create_order(1)
+    inserts = [statement for statement in statements if statement.startswith("INSERT")]
+    assert len(inserts) == 5
+
+    # Product lookup, stock reservation, order, items, the two sales rollup upserts and payment.
+    assert single_item == 7
+    assert create_order(12) == single_item
+
+
+def test_checkout_and_expiration_drop_cached_product_stock() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+    product_id = client.post(
+        "/api/v1/products",
+        json={"name": "Omega 3", "price_cents": 25900, "currency": "MXN", "stock": 10},
+    ).json()["id"]
+    # Warm both caches with the pre-order stock.
+    assert client.get(f"/api/v1/products/{product_id}").json()["stock"] == 10
+    assert client.get("/api/v1/products").json()[0]["stock"] == 10
+
+    order = client.post(
+        "/api/v1/orders",
+        json={
+            "customer_name": "Juan Perez",
+            "customer_phone": "5512345678",
+            "payment_method": "cash",
+            "items": [{"product_id": product_id, "quantity": 4}],
+        },
+    )
+    assert order.status_code == 201
+    assert client.get(f"/api/v1/products/{product_id}").json()["stock"] == 6
+    assert client.get("/api/v1/products").json()[0]["stock"] == 6
+
+    sweeper = OrderExpirationSweeper(
+        TestingSessionLocal,
+        max_age=timedelta(seconds=-60),
+        product_cache=get_product_cache_invalidation(),
+    )
+    assert sweeper.sweep().expired == 1
+    assert client.get(f"/api/v1/products/{product_id}").json()["stock"] == 10
+    assert client.get("/api/v1/products").json()[0]["stock"] == 10
+
+    app.dependency_overrides.clear()
+
+
+def test_reserve_stock_trusts_returned_ids_not_rowcount() -> None:
+    reset_sqlite_schema(engine)
+    with TestingSessionLocal() as session:
+        products = SQLProductRepository(session)
+        omega = products.save(Product(name="Omega 3", price_cents=25900, stock=3)).id
+        zinc = products.save(Product(name="Zinc", price_cents=9900, stock=1)).id
+        hidden = products.save(
+            Product(name="Oculto", price_cents=9900, stock=9, is_active=False)
+        ).id
+
+    statements: list[str] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        outcomes = []
+        carts = [{omega: 2, zinc: 2}, {omega: 1, hidden: 1}, {omega: 1, uuid4(): 1}, {omega: 3, zinc: 1}]
+        for quantities in carts:
+            with TestingSessionLocal() as session:
+                repository = SQLOrderRepository(session)
+                repository.begin()
+                outcomes.append(repository.reserve_stock(quantities))
+                repository.rollback()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert outcomes == [False, False, False, True]
+    # One UPDATE ... RETURNING per cart, whatever its size.
+    assert len(statements) == 4
+    assert all(
+        statement.startswith("UPDATE products") and "RETURNING" in statement for statement in statements
+    )
@@ -0,0 +1,231 @@
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.contexts.store.orders.domain.payment_gateway import (
+    PaymentGatewayUnavailableError,
+    PaymentProviderResponse,
+)
+from app.contexts.store.orders.infrastructure.http.router import get_mercadopago_gateway
+from app.contexts.store.orders.domain.payment_outbox import PaymentOutboxMessage
+from app.contexts.store.orders.infrastructure.payment_outbox_worker import PaymentOutboxWorker
+from app.contexts.store.orders.infrastructure.sql_payment_outbox import SQLPaymentOutbox
+from app.main import app
+from app.shared.config.settings import Settings, get_settings
+from app.shared.infrastructure.db.session import get_db
+from tests.sqlite_schema import reset_sqlite_schema
+
+
+class FlakyMercadoPagoGateway:
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def create_preference(self, order) -> PaymentProviderResponse:  # type: ignore[no-untyped-def]
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise TimeoutError("provider timed out")
+        return PaymentProviderResponse(
+            provider_payment_id=f"pref_{order.order_number}",
+            init_point=f"https://mp.test/checkout/{order.order_number}",
+            sandbox_init_point=None,
+        )
+
+
+def _file_engine(tmp_path: Path) -> Engine:
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'outbox.db'}",
+        future=True,
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    reset_sqlite_schema(engine)
+    return engine
+
+
+def _client_in_outbox_mode(session_factory: sessionmaker[Session]) -> TestClient:
+    def override_get_db() -> Generator[Session, None, None]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_settings] = lambda: Settings(PAYMENT_PREFERENCE_MODE="outbox")
+    app.dependency_overrides[get_mercadopago_gateway] = lambda: FlakyMercadoPagoGateway()
+    return TestClient(app)
+
+
+def _place_mercadopago_order(client: TestClient) -> str:
+    product_id = client.post(
+        "/api/v1/products",
+        json={"name": "Creatina", "price_cents": 45900, "currency": "MXN", "stock": 10},
+    ).json()["id"]
+    response = client.post(
+        "/api/v1/orders",
+        json={
+            "customer_name": "Ana Lopez",
+            "customer_phone": "5587654321",
+            "payment_method": "mercadopago",
+            "items": [{"product_id": product_id, "quantity": 1}],
+        },
+    )
+    assert response.status_code == 201
+    assert response.json()["payment_url"] is None
+    return response.json()["order_number"]
+
+
+def test_outbox_mode_returns_immediately_and_worker_fills_payment_url(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    client = _client_in_outbox_mode(session_factory)
+
+    order_number = _place_mercadopago_order(client)
+
+    pending = client.get(f"/api/v1/orders/{order_number}/payment")
+    assert pending.status_code == 200
+    assert pending.json()["status"] == "created"
+    assert pending.json()["payment_url"] is None
+
+    gateway = FlakyMercadoPagoGateway()
+    worker = PaymentOutboxWorker(session_factory, gateway, concurrency=2)
+    try:
+        assert worker.drain() == 1
+        assert worker.drain() == 0
+    finally:
+        worker.stop()
+
+    ready = client.get(f"/api/v1/orders/{order_number}/payment")
+    assert ready.json()["status"] == "created"
+    assert ready.json()["payment_url"] == f"https://mp.test/checkout/{order_number}"
+    assert gateway.calls == 1
+    assert client.get("/api/v1/orders/ORD-UNKNOWN/payment").status_code == 404
+
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def test_outbox_worker_retries_with_backoff_then_parks_failures(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    client = _client_in_outbox_mode(session_factory)
+    order_number = _place_mercadopago_order(client)
+    app.dependency_overrides.clear()
+
+    now = datetime.now(UTC)
+    clock = {"now": now}
+    gateway = FlakyMercadoPagoGateway(failures=1)
+    worker = PaymentOutboxWorker(
+        session_factory,
+        gateway,
+        max_attempts=2,
+        clock=lambda: clock["now"],
+    )
+    try:
+        assert worker.drain() == 1
+        # The failed message is not due again until its backoff has elapsed.
+        assert worker.drain() == 0
+        clock["now"] = now + timedelta(minutes=10)
+        assert worker.drain() == 1
+    finally:
+        worker.stop()
+
+    with session_factory() as session:
+        status, attempts, init_point = session.execute(
+            text(
+                "SELECT o.status, o.attempts, p.init_point FROM payment_outbox o "
+                "JOIN payments p ON p.id = o.payment_id"
+            )
+        ).one()
+    assert (status, attempts) == ("sent", 2)
+    assert init_point == f"https://mp.test/checkout/{order_number}"
+
+    # A gateway that never answers exhausts the attempts and parks the message.
+    reset_sqlite_schema(engine)
+    client = _client_in_outbox_mode(session_factory)
+    _place_mercadopago_order(client)
+    app.dependency_overrides.clear()
+
+    worker = PaymentOutboxWorker(session_factory, FlakyMercadoPagoGateway(failures=10), max_attempts=1)
+    try:
+        assert worker.drain() == 1
+    finally:
+        worker.stop()
+
+    with session_factory() as session:
+        status, last_error = session.execute(
+            text("SELECT status, last_error FROM payment_outbox")
+        ).one()
+    assert status == "failed"
+    assert last_error == "TimeoutError: provider timed out"
+    engine.dispose()
+
+
+class UnavailableMercadoPagoGateway:
+    def create_preference(self, order) -> PaymentProviderResponse:  # type: ignore[no-untyped-def]
+        raise PaymentGatewayUnavailableError("circuit mercadopago is open", retry_after_seconds=20)
+
+
+def test_outbox_worker_waits_for_open_breaker_without_spending_attempts(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    _place_mercadopago_order(_client_in_outbox_mode(session_factory))
+    app.dependency_overrides.clear()
+
+    now = datetime.now(UTC)
+    worker = PaymentOutboxWorker(
+        session_factory,
+        UnavailableMercadoPagoGateway(),
+        max_attempts=1,
+        clock=lambda: now,
+    )
+    try:
+        assert worker.drain() == 1
+    finally:
+        worker.stop()
+
+    with session_factory() as session:
+        status, attempts, available_at = session.execute(
+            text("SELECT status, attempts, available_at FROM payment_outbox")
+        ).one()
+    assert (status, attempts) == ("pending", 0)
+    retry_at = datetime.fromisoformat(str(available_at)).replace(tzinfo=UTC)
+    assert retry_at == now + timedelta(seconds=20)
+    engine.dispose()
+
+
+def test_claim_due_hands_a_message_to_one_worker_when_claims_race(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    _place_mercadopago_order(_client_in_outbox_mode(session_factory))
+    app.dependency_overrides.clear()
+
+    now = datetime.now(UTC)
+    lease_until = now + timedelta(minutes=1)
+    rival_claims: list[PaymentOutboxMessage] = []
+    raced = False
+
+    def rival_claims_first(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        # Both workers saw the message as due; the rival leases it between our SELECT and UPDATE.
+        nonlocal raced
+        if statement.startswith("UPDATE payment_outbox") and not raced:
+            raced = True
+            with session_factory() as rival:
+                rival_claims.extend(SQLPaymentOutbox(rival).claim_due(now, 10, lease_until))
+
+    event.listen(engine, "before_cursor_execute", rival_claims_first)
+    try:
+        with session_factory() as session:
+            claimed = SQLPaymentOutbox(session).claim_due(now, 10, lease_until)
+    finally:
+        event.remove(engine, "before_cursor_execute", rival_claims_first)
+
+    assert claimed == []
+    assert [message.attempts for message in rival_claims] == [1]
+    with session_factory() as session:
+        assert session.execute(text("SELECT attempts FROM payment_outbox")).scalar_one() == 1
+    engine.dispose()
@@ -0,0 +1,270 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.contexts.store.orders.application.reconcile_payments import ReconcilePaymentsUseCase
+from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.order_item import OrderItem
+from app.contexts.store.orders.domain.payment import Payment
+from app.contexts.store.orders.domain.payment_gateway import ProviderPayment
+from app.contexts.store.orders.infrastructure.mercadopago.payment_lookup import (
+    MercadoPagoPaymentLookup,
+)
+from app.contexts.store.orders.infrastructure.order_models import (
+    OrderModel,
+    PaymentModel,
+    PaymentReviewModel,
+)
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from tests.sqlite_schema import reset_sqlite_schema
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=UTC)
+
+
+class _StandInProvider:
+    """Local stand-in for `/v1/payments/search` that records how many calls overlap."""
+
+    def __init__(self, results: dict[str, list[dict[str, object]] | int], latency_seconds: float) -> None:
+        self.results = results
+        self.latency_seconds = latency_seconds
+        self.requests: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def handler(self) -> type[BaseHTTPRequestHandler]:
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:  # noqa: N802
+                url = urlparse(self.path)
+                reference = parse_qs(url.query)["external_reference"][0]
+                with provider._lock:
+                    provider.requests.append(reference)
+                    provider.in_flight += 1
+                    provider.max_in_flight = max(provider.max_in_flight, provider.in_flight)
+                try:
+                    time.sleep(provider.latency_seconds)
+                    result = provider.results.get(reference, [])
+                    status = result if isinstance(result, int) else 200
+                    body = json.dumps({"results": [] if isinstance(result, int) else result}).encode()
+                finally:
+                    with provider._lock:
+                        provider.in_flight -= 1
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                return
+
+        return Handler
+
+
+@pytest.fixture
+def session_factory() -> Iterator[sessionmaker[Session]]:
+    engine = create_engine(
+        "sqlite+pysqlite://",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    reset_sqlite_schema(engine)
+    yield sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    engine.dispose()
+
+
+def _provider_payment(payment_id: int, status: str, reference: str, amount: float) -> dict[str, object]:
+    return {
+        "id": payment_id,
+        "status": status,
+        "external_reference": reference,
+        "transaction_amount": amount,
+        "currency_id": "MXN",
+    }
+
+
+def _seed(
+    session_factory: sessionmaker[Session],
+    order_number: str,
+    created_at: datetime,
+    status: str = "pending",
+) -> None:
+    with session_factory() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        order = Order(
+            order_number=order_number,
+            customer_name="Ana Lopez",
+            customer_phone="5587654321",
+            created_at=created_at,
+            items=[
+                OrderItem(
+                    product_id=uuid4(),
+                    quantity=1,
+                    product_name_snapshot="Omega 3",
+                    unit_price_cents_snapshot=25900,
+                )
+            ],
+        )
+        repository.add_order(order)
+        repository.add_payment(
+            Payment(order_id=order.id, amount_cents=25900, status=status, created_at=created_at)
+        )
+        repository.commit()
+
+
+def _statuses(session_factory: sessionmaker[Session]) -> dict[str, tuple[str, str]]:
+    with session_factory() as session:
+        rows = session.execute(
+            select(OrderModel.order_number, OrderModel.status, PaymentModel.status).join(
+                PaymentModel, PaymentModel.order_id == OrderModel.id
+            )
+        ).all()
+    return {order_number: (order_status, payment_status) for order_number, order_status, payment_status in rows}
+
+
+def test_reconciliation_pages_payments_and_settles_them_with_bounded_concurrency(
+    session_factory: sessionmaker[Session],
+) -> None:
+    results: dict[str, list[dict[str, object]] | int] = {}
+    for index in range(12):
+        reference = f"ORD-APPROVED-{index:02d}"
+        _seed(session_factory, reference, NOW - timedelta(hours=2, minutes=index))
+        # A rejected attempt followed by the approved one: the approved payment wins.
+        results[reference] = [
+            _provider_payment(1000 + index, "rejected", reference, 259),
+            _provider_payment(2000 + index, "approved", reference, 259),
+        ]
+    _seed(session_factory, "ORD-REJECTED", NOW - timedelta(hours=1), status="created")
+    results["ORD-REJECTED"] = [_provider_payment(31, "rejected", "ORD-REJECTED", 259)]
+    _seed(session_factory, "ORD-WAITING", NOW - timedelta(hours=1))
+    results["ORD-WAITING"] = [_provider_payment(32, "in_process", "ORD-WAITING", 259)]
+    _seed(session_factory, "ORD-WRONG-AMOUNT", NOW - timedelta(hours=1))
+    results["ORD-WRONG-AMOUNT"] = [_provider_payment(33, "approved", "ORD-WRONG-AMOUNT", 1.0)]
+    _seed(session_factory, "ORD-ABANDONED", NOW - timedelta(hours=1))
+    _seed(session_factory, "ORD-PROVIDER-ERROR", NOW - timedelta(hours=1))
+    results["ORD-PROVIDER-ERROR"] = 500
+    _seed(session_factory, "ORD-SETTLED", NOW - timedelta(hours=1), status="approved")
+    _seed(session_factory, "ORD-FRESH", NOW - timedelta(minutes=1))
+
+    provider = _StandInProvider(results, latency_seconds=0.02)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), provider.handler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    async def run():  # type: ignore[no-untyped-def]
+        lookup = MercadoPagoPaymentLookup(
+            access_token="TEST",
+            base_url=f"http://127.0.0.1:{server.server_address[1]}",
+            client=httpx.AsyncClient(timeout=5.0),
+        )
+        try:
+            with session_factory() as session:
+                return await ReconcilePaymentsUseCase(
+                    SQLOrderRepository(session),
+                    lookup,
+                    concurrency=3,
+                    page_size=5,
+                    clock=lambda: NOW,
+                ).execute(min_age=timedelta(minutes=15))
+        finally:
+            await lookup.aclose()
+
+    try:
+        stats = asyncio.run(run())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert (stats.scanned, stats.pages) == (17, 4)
+    assert stats.updated == 13
+    assert stats.updated_by_status == {"approved": 12, "rejected": 1}
+    assert (stats.unchanged, stats.not_found, stats.mismatched, stats.errors) == (1, 1, 1, 1)
+    assert stats.orders_paid == 12
+    assert stats.payments_per_second > 0
+
+    assert sorted(provider.requests) == sorted(set(provider.requests))
+    assert "ORD-FRESH" not in provider.requests and "ORD-SETTLED" not in provider.requests
+    assert 1 < provider.max_in_flight <= 3
+
+    statuses = _statuses(session_factory)
+    assert all(statuses[f"ORD-APPROVED-{index:02d}"] == ("paid", "approved") for index in range(12))
+    assert statuses["ORD-REJECTED"] == ("pending_payment", "rejected")
+    assert statuses["ORD-WAITING"] == ("pending_payment", "pending")
+    assert statuses["ORD-WRONG-AMOUNT"] == ("pending_payment", "pending")
+    assert statuses["ORD-FRESH"] == ("pending_payment", "pending")
+
+
+def test_reconciliation_does_not_overwrite_a_payment_settled_during_the_lookup(
+    session_factory: sessionmaker[Session],
+) -> None:
+    _seed(session_factory, "ORD-RACE", NOW - timedelta(hours=1))
+
+    class WebhookWinsLookup:
+        async def find_by_external_reference(self, external_reference: str) -> ProviderPayment:
+            # A webhook approves the payment while the reconciliation waits on the provider.
+            with session_factory() as session:
+                session.execute(update(PaymentModel).values(status="approved"))
+                session.commit()
+            return ProviderPayment("41", "rejected", external_reference, 25900, "MXN")
+
+    with session_factory() as session:
+        stats = asyncio.run(
+            ReconcilePaymentsUseCase(
+                SQLOrderRepository(session),
+                WebhookWinsLookup(),
+                clock=lambda: NOW,
+            ).execute(min_age=timedelta(0))
+        )
+
+    assert (stats.scanned, stats.updated, stats.unchanged) == (1, 0, 1)
+    assert _statuses(session_factory)["ORD-RACE"] == ("pending_payment", "approved")
+
+
+def test_reconciliation_records_an_approval_for_an_expired_order_for_review(
+    session_factory: sessionmaker[Session],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    _seed(session_factory, "ORD-LATE", NOW - timedelta(hours=1))
+    # The order expired and released its stock before the provider approved the payment.
+    with session_factory() as session:
+        session.execute(update(OrderModel).values(status="expired"))
+        session.commit()
+
+    class LateApprovalLookup:
+        async def find_by_external_reference(self, external_reference: str) -> ProviderPayment:
+            return ProviderPayment("51", "approved", external_reference, 25900, "MXN")
+
+    with caplog.at_level(logging.ERROR), session_factory() as session:
+        stats = asyncio.run(
+            ReconcilePaymentsUseCase(
+                SQLOrderRepository(session),
+                LateApprovalLookup(),
+                clock=lambda: NOW,
+            ).execute(min_age=timedelta(0))
+        )
+
+    assert (stats.updated, stats.orders_paid, stats.orders_not_payable) == (1, 0, 1)
+    assert _statuses(session_factory)["ORD-LATE"] == ("expired", "approved")
+    with session_factory() as session:
+        reviews = session.scalars(select(PaymentReviewModel)).all()
+    assert [review.reason for review in reviews] == ["approved_for_closed_order"]
+    assert "ORD-LATE" in caplog.text and "recorded for review" in caplog.text
@@ -0,0 +1,291 @@
+import logging
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine, event, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.order_item import OrderItem
+from app.contexts.store.orders.domain.payment import Payment
+from app.contexts.store.orders.domain.payment_gateway import (
+    PaymentGatewayUnavailableError,
+    ProviderPayment,
+)
+from app.contexts.store.orders.domain.state_machine import ORDER_STATE_MACHINE
+from app.contexts.store.orders.domain.webhook_inbox import WebhookEvent
+from app.contexts.store.orders.infrastructure.order_models import (
+    OrderModel,
+    PaymentModel,
+    PaymentReviewModel,
+    PaymentWebhookEventModel,
+)
+from app.contexts.store.orders.infrastructure.payment_webhook_worker import PaymentWebhookWorker
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.contexts.store.orders.infrastructure.sql_webhook_inbox import SQLWebhookInbox
+from app.main import app
+from app.shared.infrastructure.db.session import get_db
+from tests.sqlite_schema import reset_sqlite_schema
+
+WEBHOOK_URL = "/api/v1/webhooks/mercadopago"
+
+
+class FakeProviderGateway:
+    def __init__(self, payments: dict[str, ProviderPayment], error: Exception | None = None) -> None:
+        self.payments = payments
+        self.error = error
+        self.calls: list[str] = []
+
+    def create_preference(self, order):  # type: ignore[no-untyped-def]
+        raise AssertionError("not used by webhooks")
+
+    def get_payment(self, provider_payment_id: str) -> ProviderPayment:
+        self.calls.append(provider_payment_id)
+        if self.error is not None:
+            raise self.error
+        return self.payments[provider_payment_id]
+
+
+def _file_engine(tmp_path: Path) -> Engine:
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'webhooks.db'}",
+        future=True,
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    reset_sqlite_schema(engine)
+    return engine
+
+
+def _client(session_factory: sessionmaker[Session]) -> TestClient:
+    def override_get_db() -> Generator[Session, None, None]:
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+def _seed_order(session_factory: sessionmaker[Session], order_number: str, amount_cents: int) -> None:
+    with session_factory() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        order = Order(
+            order_number=order_number,
+            customer_name="Ana Lopez",
+            customer_phone="5587654321",
+            items=[
+                OrderItem(
+                    product_id=uuid4(),
+                    quantity=1,
+                    product_name_snapshot="Omega 3",
+                    unit_price_cents_snapshot=amount_cents,
+                )
+            ],
+        )
+        repository.add_order(order)
+        repository.add_payment(Payment(order_id=order.id, amount_cents=amount_cents, status="pending"))
+        repository.commit()
+
+
+def _statuses(session_factory: sessionmaker[Session], order_number: str) -> tuple[str, str]:
+    with session_factory() as session:
+        row = session.execute(
+            select(OrderModel.status, PaymentModel.status)
+            .join(PaymentModel, PaymentModel.order_id == OrderModel.id)
+            .where(OrderModel.order_number == order_number)
+        ).one()
+    return row[0], row[1]
+
+
+def _event(session_factory: sessionmaker[Session], resource_id: str) -> PaymentWebhookEventModel:
+    with session_factory() as session:
+        return session.execute(
+            select(PaymentWebhookEventModel).where(PaymentWebhookEventModel.resource_id == resource_id)
+        ).scalar_one()
+
+
+def test_webhook_is_recorded_once_and_acknowledged_without_calling_the_provider(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    client = _client(session_factory)
+    notification = {"type": "payment", "action": "payment.updated", "data": {"id": "555"}}
+
+    first = client.post(WEBHOOK_URL, json=notification)
+    retried = client.post(WEBHOOK_URL, json=notification)
+    legacy = client.post(WEBHOOK_URL, params={"topic": "payment", "id": "555"})
+    other_topic = client.post(WEBHOOK_URL, json={"type": "merchant_order", "data": {"id": 9}})
+    missing_id = client.post(WEBHOOK_URL, json={"type": "payment"})
+    bad_id = client.post(WEBHOOK_URL, json={"type": "payment", "data": {"id": "../555"}})
+
+    assert first.status_code == 200 and first.json() == {"status": "recorded"}
+    assert retried.json() == {"status": "duplicate"}
+    assert legacy.json() == {"status": "duplicate"}
+    assert other_topic.json() == {"status": "ignored"}
+    assert missing_id.status_code == 400
+    assert bad_id.status_code == 400
+    with session_factory() as session:
+        events = session.execute(select(PaymentWebhookEventModel)).scalars().all()
+    assert [(event.topic, event.resource_id, event.status) for event in events] == [
+        ("payment", "555", "pending")
+    ]
+
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def test_worker_verifies_events_in_a_batch_and_settled_events_can_be_queued_again(
+    tmp_path: Path,
+) -> None:
+    engine = _file_engine(tmp_path)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    client = _client(session_factory)
+    _seed_order(session_factory, "ORD-APPROVED", 51800)
+    _seed_order(session_factory, "ORD-REJECTED", 25900)
+    gateway = FakeProviderGateway(
+        {
+            "555": ProviderPayment("555", "approved", "ORD-APPROVED", 51800, "MXN"),
+            "777": ProviderPayment("777", "rejected", "ORD-REJECTED", 25900, "mxn"),
+        }
+    )
+    for resource_id in ("555", "777"):
+        client.post(WEBHOOK_URL, json={"type": "payment", "data": {"id": resource_id}})
+
+    worker = PaymentWebhookWorker(session_factory, gateway, concurrency=2, batch_size=10)
+    try:
+        assert worker.drain() == 2
+        assert worker.drain() == 0
+    finally:
+        worker.stop()
+
+    assert sorted(gateway.calls) == ["555", "777"]
+    assert _statuses(session_factory, "ORD-APPROVED") == ("paid", "approved")
+    assert _statuses(session_factory, "ORD-REJECTED") == ("pending_payment", "rejected")
+    assert _event(session_factory, "555").status == "processed"
+
+    # A later notification for the same payment is verified again.
+    again = client.post(WEBHOOK_URL, json={"type": "payment", "data": {"id": "555"}})
+    assert again.json() == {"status": "recorded"}
+    assert _event(session_factory, "555").status == "pending"
+
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def test_worker_parks_mismatches_and_retries_provider_failures(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    client = _client(session_factory)
+    _seed_order(session_factory, "ORD-1", 51800)
+    client.post(WEBHOOK_URL, json={"type": "payment", "data": {"id": "555"}})
+    now = datetime.now(UTC)
+
+    mismatch = FakeProviderGateway({"555": ProviderPayment("555", "approved", "ORD-1", 100, "MXN")})
+    worker = PaymentWebhookWorker(session_factory, mismatch, clock=lambda: now)
+    assert worker.drain() == 1
+    worker.stop()
+
+    event = _event(session_factory, "555")
+    assert event.status == "failed"
+    assert "amount does not match" in (event.last_error or "")
+    assert _statuses(session_factory, "ORD-1") == ("pending_payment", "pending")
+
+    client.post(WEBHOOK_URL, json={"type": "payment", "data": {"id": "555"}})
+    now = datetime.now(UTC) + timedelta(seconds=1)
+    timeout = FakeProviderGateway({}, error=TimeoutError("provider timed out"))
+    worker = PaymentWebhookWorker(session_factory, timeout, clock=lambda: now)
+    assert worker.drain_once() == 1
+    event = _event(session_factory, "555")
+    assert (event.status, event.attempts) == ("pending", 1)
+
+    unavailable = FakeProviderGateway({}, error=PaymentGatewayUnavailableError("circuit open", 30.0))
+    later = now + timedelta(minutes=5)
+    worker = PaymentWebhookWorker(session_factory, unavailable, clock=lambda: later)
+    assert worker.drain_once() == 1
+    worker.stop()
+    event = _event(session_factory, "555")
+    # The breaker rejected the call before reaching the provider: no attempt is spent.
+    assert (event.status, event.attempts) == ("pending", 1)
+
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def test_claim_due_hands_an_event_to_one_worker_when_claims_race(tmp_path: Path) -> None:
+    engine = _file_engine(tmp_path)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    now = datetime.now(UTC)
+    lease_until = now + timedelta(minutes=1)
+    with session_factory() as session:
+        assert SQLWebhookInbox(session).record("payment", "777", now)
+
+    rival_claims: list[WebhookEvent] = []
+    raced = False
+
+    def rival_claims_first(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+        # The rival worker leases the event between this worker's SELECT and UPDATE.
+        nonlocal raced
+        if statement.startswith("UPDATE payment_webhook_events") and not raced:
+            raced = True
+            with session_factory() as rival:
+                rival_claims.extend(SQLWebhookInbox(rival).claim_due(now, 10, lease_until))
+
+    event.listen(engine, "before_cursor_execute", rival_claims_first)
+    try:
+        with session_factory() as session:
+            claimed = SQLWebhookInbox(session).claim_due(now, 10, lease_until)
+    finally:
+        event.remove(engine, "before_cursor_execute", rival_claims_first)
+
+    assert claimed == []
+    assert [(claim.resource_id, claim.attempts) for claim in rival_claims] == [("777", 1)]
+    assert _event(session_factory, "777").attempts == 1
+    engine.dispose()
+
+
+def test_approval_for_an_expired_order_is_recorded_for_review(
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    engine = _file_engine(tmp_path)
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    client = _client(session_factory)
+    _seed_order(session_factory, "ORD-LATE", 51800)
+    with session_factory() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        order_id = session.execute(
+            select(OrderModel.id).where(OrderModel.order_number == "ORD-LATE")
+        ).scalar_one()
+        assert repository.transition_order(
+            ORDER_STATE_MACHINE.transition(order_id, "pending_payment", "expired")
+        )
+        repository.commit()
+
+    client.post(WEBHOOK_URL, json={"type": "payment", "data": {"id": "555"}})
+    gateway = FakeProviderGateway({"555": ProviderPayment("555", "approved", "ORD-LATE", 51800, "MXN")})
+    worker = PaymentWebhookWorker(session_factory, gateway)
+    with caplog.at_level(logging.ERROR):
+        try:
+            assert worker.drain() == 1
+        finally:
+            worker.stop()
+
+    # The buyer was charged for an order whose stock is gone: it is flagged, not silently dropped.
+    assert _statuses(session_factory, "ORD-LATE") == ("expired", "approved")
+    assert _event(session_factory, "555").status == "processed"
+    with session_factory() as session:
+        reviews = session.execute(select(PaymentReviewModel)).scalars().all()
+    assert [(review.order_id, review.reason) for review in reviews] == [
+        (order_id, "approved_for_closed_order")
+    ]
+    assert "ORD-LATE can no longer be paid" in caplog.text
+
+    app.dependency_overrides.clear()
+    engine.dispose()
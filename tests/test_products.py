@@ -1,12 +1,50 @@
-from collections.abc import Generator
+import asyncio
+import json
+from collections.abc import AsyncIterator, Generator
+from dataclasses import replace
+from types import SimpleNamespace
+from typing import cast
 
+import pytest
 from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.contexts.store.products.application.create_product import CreateProductCommand
+from app.contexts.store.products.application.import_products import (
+    ImportProductRow,
+    ImportProductsUseCase,
+)
+from app.contexts.store.products.domain.product import Product
+from app.contexts.store.products.domain.product_repository import (
+    ProductBatchRejectedError,
+    ProductRepository,
+    ProductSummary,
+    ProductView,
+)
+from app.contexts.store.products.infrastructure.cached_product_repository import (
+    CachedProductRepository,
+    CatalogCache,
+    get_product_catalog_cache,
+    get_product_detail_cache,
+)
+from app.contexts.store.products.infrastructure.http.product_import_parser import (
+    RawImportRow,
+    iter_ndjson_rows,
+)
+from app.contexts.store.products.infrastructure.http.router import ProductResponse
+from app.contexts.store.products.infrastructure.sql_product_repository import (
+    SQLProductRepository,
+)
 from app.main import app
+from app.shared.config.settings import Settings, get_settings
+from app.shared.infrastructure.cache.ttl_cache import TTLCache
 from app.shared.infrastructure.db.session import get_db
+from app.shared.infrastructure.http.responses import FastJSONResponse
 from tests.sqlite_schema import reset_sqlite_schema
 
 engine = create_engine(
@@ -26,6 +64,13 @@ def override_get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+ADMIN_HEADERS = {"X-Admin-Token": "test-admin-token"}
+
+
+def _admin_settings() -> Settings:
+    return Settings(ADMIN_API_TOKEN="test-admin-token")
+
+
 def test_create_product_returns_created() -> None:
     reset_sqlite_schema(engine)
     app.dependency_overrides[get_db] = override_get_db
@@ -86,3 +131,548 @@ def test_list_products_returns_only_active() -> None:
     assert products[0]["is_active"] is True
 
     app.dependency_overrides.clear()
+
+
+def test_list_products_paginates_with_cursor() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    for index in range(5):
+        payload = {
+            "name": f"Producto {index}",
+            "description": None,
+            "price_cents": 1000 + index,
+            "currency": "MXN",
+            "stock": 1,
+            "is_active": index != 2,
+        }
+        assert client.post("/api/v1/products", json=payload).status_code == 201
+
+    first_page = client.get("/api/v1/products", params={"limit": 3})
+    assert first_page.status_code == 200
+    first_body = first_page.json()
+    assert [item["name"] for item in first_body["items"]] == [
+        "Producto 4",
+        "Producto 3",
+        "Producto 1",
+    ]
+    assert first_body["next_cursor"] is not None
+
+    second_page = client.get(
+        "/api/v1/products",
+        params={"limit": 3, "cursor": first_body["next_cursor"]},
+    )
+    assert second_page.status_code == 200
+    second_body = second_page.json()
+    assert [item["name"] for item in second_body["items"]] == ["Producto 0"]
+    assert second_body["next_cursor"] is None
+
+    app.dependency_overrides.clear()
+
+
+def test_list_products_rejects_invalid_cursor() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    response = client.get("/api/v1/products", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+    app.dependency_overrides.clear()
+
+
+def test_list_products_is_served_from_cache_until_a_product_is_saved() -> None:
+    reset_sqlite_schema(engine)
+    cache = TTLCache(max_entries=16, ttl_seconds=60)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_product_catalog_cache] = lambda: cache
+    app.dependency_overrides[get_settings] = _admin_settings
+    client = TestClient(app)
+
+    payload = {
+        "name": "Colageno",
+        "description": None,
+        "price_cents": 29900,
+        "currency": "MXN",
+        "stock": 3,
+        "is_active": True,
+    }
+    assert client.post("/api/v1/products", json=payload).status_code == 201
+
+    assert len(client.get("/api/v1/products").json()) == 1
+    assert len(client.get("/api/v1/products").json()) == 1
+
+    assert client.get("/api/v1/products/cache/stats").status_code == 401
+    stats = client.get("/api/v1/products/cache/stats", headers=ADMIN_HEADERS).json()["catalog"]
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["hit_ratio"] == 0.5
+
+    assert client.post("/api/v1/products", json={**payload, "name": "Biotina"}).status_code == 201
+    assert len(client.get("/api/v1/products").json()) == 2
+
+    app.dependency_overrides.clear()
+
+
+def test_list_products_answers_not_modified_for_matching_etag() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    payload = {
+        "name": "Curcuma",
+        "description": None,
+        "price_cents": 15900,
+        "currency": "MXN",
+        "stock": 8,
+        "is_active": True,
+    }
+    assert client.post("/api/v1/products", json=payload).status_code == 201
+
+    first = client.get("/api/v1/products")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert "max-age" in first.headers["cache-control"]
+
+    not_modified = client.get("/api/v1/products", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    paged = client.get("/api/v1/products", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert paged.status_code == 200
+
+    assert client.post("/api/v1/products", json={**payload, "name": "Jengibre"}).status_code == 201
+    changed = client.get("/api/v1/products", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert len(changed.json()) == 2
+
+    app.dependency_overrides.clear()
+
+
+def test_bulk_import_ndjson_inserts_valid_rows_and_reports_errors() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    body = "\n".join(
+        [
+            '{"name": "Espirulina", "price_cents": 12900, "stock": 4}',
+            '{"name": "Chia", "price_cents": 0, "stock": 4}',
+            "not json",
+            '{"name": "Moringa", "price_cents": 8900, "stock": 2, "is_active": false}',
+            '{"name": "Maca", "price_cents": 9900, "stock": 7, "currency": "mxn"}',
+        ]
+    )
+
+    response = client.post(
+        "/api/v1/products:bulk",
+        params={"batch_size": 2},
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 3
+    assert result["failed"] == 2
+    assert [error["line"] for error in result["errors"]] == [2, 3]
+
+    listed = client.get("/api/v1/products").json()
+    assert sorted(product["name"] for product in listed) == ["Espirulina", "Maca"]
+
+    app.dependency_overrides.clear()
+
+
+def test_ndjson_rows_are_read_across_arbitrary_chunk_boundaries() -> None:
+    body = '{"name": "Jengibre"}\r\n\n{"name": "Té verde"}\nnot json\n{"name": "Ñame"}'.encode()
+
+    async def read_in_three_byte_chunks() -> list[RawImportRow]:
+        async def chunks() -> AsyncIterator[bytes]:
+            for start in range(0, len(body), 3):
+                yield body[start : start + 3]
+
+        return [row async for row in iter_ndjson_rows(chunks())]
+
+    rows = asyncio.run(read_in_three_byte_chunks())
+
+    assert [(row.line, row.values, row.error) for row in rows] == [
+        (1, {"name": "Jengibre"}, None),
+        (3, {"name": "Té verde"}, None),
+        (4, None, "line is not valid JSON"),
+        (5, {"name": "Ñame"}, None),
+    ]
+
+
+def test_bulk_import_csv_supports_quoted_multiline_fields() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    body = (
+        "name,description,price_cents,stock,is_active\n"
+        'Propoleo,"Extracto\nsin alcohol",11900,6,true\n'
+        "Jalea,,,3,true\n"
+    )
+
+    response = client.post(
+        "/api/v1/products:bulk",
+        content=body,
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["imported"] == 1
+    assert result["errors"][0]["line"] == 4
+
+    listed = client.get("/api/v1/products").json()
+    assert listed[0]["description"] == "Extracto\nsin alcohol"
+
+    app.dependency_overrides.clear()
+
+
+def test_bulk_import_rejects_unsupported_media_type() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    response = client.post("/api/v1/products:bulk", json=[{"name": "x"}])
+
+    assert response.status_code == 415
+
+    app.dependency_overrides.clear()
+
+
+def test_search_products_ranks_name_matches_and_paginates() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    base_payload = {"price_cents": 9900, "currency": "MXN", "stock": 5, "is_active": True}
+    products = [
+        {"name": "Té verde", "description": "Con vitamina C añadida"},
+        {"name": "Vitamina C", "description": "Ácido ascórbico"},
+        {"name": "Vitamína E", "description": None},
+        {"name": "Magnesio", "description": "Sin vitaminas"},
+        {"name": "Vitamina D oculta", "description": None, "is_active": False},
+    ]
+    for product in products:
+        response = client.post("/api/v1/products", json={**base_payload, **product})
+        assert response.status_code == 201
+
+    first = client.get("/api/v1/products/search", params={"q": "vitamina", "limit": 2})
+    assert first.status_code == 200
+    first_body = first.json()
+    assert {item["name"] for item in first_body["items"]} == {"Vitamina C", "Vitamína E"}
+    assert first_body["next_cursor"] is not None
+
+    second = client.get(
+        "/api/v1/products/search",
+        params={"q": "vitamina", "limit": 2, "cursor": first_body["next_cursor"]},
+    )
+    second_body = second.json()
+    assert {item["name"] for item in second_body["items"]} == {"Té verde", "Magnesio"}
+    assert second_body["next_cursor"] is None
+
+    no_match = client.get("/api/v1/products/search", params={"q": "colageno"})
+    assert no_match.json() == {"items": [], "next_cursor": None}
+
+    app.dependency_overrides.clear()
+
+
+def test_search_products_indexes_bulk_imported_rows() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/v1/products:bulk",
+        content='{"name": "Aceite de coco", "price_cents": 15900, "stock": 3}\n',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.json()["imported"] == 1
+
+    found = client.get("/api/v1/products/search", params={"q": "coco"})
+    assert [item["name"] for item in found.json()["items"]] == ["Aceite de coco"]
+
+    app.dependency_overrides.clear()
+
+
+def test_list_products_summary_view_omits_description() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    payload = {
+        "name": "Ashwagandha",
+        "description": "Raiz adaptogena",
+        "price_cents": 21900,
+        "currency": "MXN",
+        "stock": 9,
+        "is_active": True,
+    }
+    assert client.post("/api/v1/products", json=payload).status_code == 201
+
+    full = client.get("/api/v1/products").json()
+    assert full[0]["description"] == "Raiz adaptogena"
+
+    summary = client.get("/api/v1/products", params={"view": "summary"})
+    assert summary.status_code == 200
+    assert "description" not in summary.json()[0]
+    assert summary.json()[0]["name"] == "Ashwagandha"
+
+    summary_page = client.get("/api/v1/products", params={"view": "summary", "limit": 1})
+    assert "description" not in summary_page.json()["items"][0]
+
+    app.dependency_overrides.clear()
+
+
+def test_export_products_streams_ndjson_and_json_array() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+
+    for name in ("Linaza", "Avena", "Oculto"):
+        payload = {
+            "name": name,
+            "description": None,
+            "price_cents": 4900,
+            "currency": "MXN",
+            "stock": 10,
+            "is_active": name != "Oculto",
+        }
+        assert client.post("/api/v1/products", json=payload).status_code == 201
+
+    ndjson = client.get("/api/v1/products/export")
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [line["name"] for line in lines] == ["Avena", "Linaza"]
+
+    array = client.get("/api/v1/products/export", params={"format": "json", "view": "summary"})
+    assert array.status_code == 200
+    body = array.json()
+    assert [item["name"] for item in body] == ["Avena", "Linaza"]
+    assert "description" not in body[0]
+
+    app.dependency_overrides.clear()
+
+
+def test_iter_active_yields_bounded_chunks() -> None:
+    reset_sqlite_schema(engine)
+    session = TestingSessionLocal()
+    repository = SQLProductRepository(session)
+    repository.save_many(
+        [Product(name=f"Producto {index}", price_cents=1000, stock=1) for index in range(5)]
+    )
+
+    chunks = list(repository.iter_active("summary", chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    session.close()
+
+
+def test_get_product_by_id_is_served_from_detail_cache() -> None:
+    reset_sqlite_schema(engine)
+    detail_cache = TTLCache(max_entries=16, ttl_seconds=60)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_product_detail_cache] = lambda: detail_cache
+    app.dependency_overrides[get_settings] = _admin_settings
+    client = TestClient(app)
+
+    payload = {
+        "name": "Cardo mariano",
+        "description": "Extracto",
+        "price_cents": 17900,
+        "currency": "MXN",
+        "stock": 4,
+        "is_active": True,
+    }
+    product_id = client.post("/api/v1/products", json=payload).json()["id"]
+    hidden_id = client.post("/api/v1/products", json={**payload, "is_active": False}).json()["id"]
+
+    first = client.get(f"/api/v1/products/{product_id}")
+    assert first.status_code == 200
+    assert first.json()["name"] == "Cardo mariano"
+    assert client.get(f"/api/v1/products/{hidden_id}").status_code == 404
+
+    reset_sqlite_schema(engine)
+    cached = client.get(f"/api/v1/products/{product_id}")
+    assert cached.status_code == 200
+    assert cached.json() == first.json()
+
+    stats = client.get("/api/v1/products/cache/stats", headers=ADMIN_HEADERS).json()["product_detail"]
+    assert stats["hits"] == 1
+    assert stats["size"] == 2
+
+    assert client.get("/api/v1/products/not-a-uuid").status_code == 422
+
+    app.dependency_overrides.clear()
+
+
+def test_detail_cache_entries_are_not_shared_with_callers() -> None:
+    reset_sqlite_schema(engine)
+    session = TestingSessionLocal()
+    product = SQLProductRepository(session).save(Product(name="Zinc", price_cents=9900, stock=6))
+    repository = CachedProductRepository(
+        SQLProductRepository(session),
+        TTLCache(max_entries=16, ttl_seconds=60),
+        TTLCache(max_entries=16, ttl_seconds=60),
+    )
+
+    loaded = repository.get_by_id(product.id)
+    assert loaded is not None
+    loaded.stock = 0
+    cached = repository.get_by_id(product.id)
+    assert cached is not None
+    cached.price_cents = 1
+
+    again = repository.get_by_id(product.id)
+    assert again is not None
+    assert (again.stock, again.price_cents) == (6, 9900)
+    session.close()
+
+
+class _WriteDuringReadRepository(SQLProductRepository):
+    """Simulates a product write that lands while a catalog listing is being loaded."""
+
+    def __init__(self, session: Session, cache: CatalogCache) -> None:
+        super().__init__(session)
+        self._cache = cache
+        self.listings = 0
+
+    def list_active(self, view: ProductView = "full") -> list[ProductSummary]:
+        listings = super().list_active(view)
+        self.listings += 1
+        self._cache.clear()
+        return listings
+
+
+def test_catalog_listing_loaded_across_an_invalidation_is_not_cached() -> None:
+    reset_sqlite_schema(engine)
+    session = TestingSessionLocal()
+    SQLProductRepository(session).save(Product(name="Magnesio", price_cents=12900, stock=5))
+    cache: CatalogCache = TTLCache(max_entries=16, ttl_seconds=60)
+    inner = _WriteDuringReadRepository(session, cache)
+
+    assert len(CachedProductRepository(inner, cache, TTLCache(16, 60)).list_active()) == 1
+    assert len(CachedProductRepository(inner, cache, TTLCache(16, 60)).list_active()) == 1
+
+    assert inner.listings == 2
+    assert cache.stats().size == 0
+    session.close()
+
+
+def test_catalog_etag_changes_after_product_and_stock_writes() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_product_catalog_cache] = lambda: TTLCache(max_entries=0, ttl_seconds=0)
+    client = TestClient(app)
+    with TestingSessionLocal() as session:
+        product = SQLProductRepository(session).save(
+            Product(name="Espirulina", price_cents=21900, stock=10)
+        )
+
+    first = client.get("/api/v1/products").headers["etag"]
+    assert client.get("/api/v1/products", headers={"If-None-Match": first}).status_code == 304
+
+    with TestingSessionLocal() as session:
+        SQLProductRepository(session).save(replace(product, price_cents=19900))
+    repriced = client.get("/api/v1/products", headers={"If-None-Match": first})
+    assert repriced.status_code == 200
+    assert repriced.json()[0]["price_cents"] == 19900
+    second = repriced.headers["etag"]
+
+    with TestingSessionLocal() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        assert repository.reserve_stock({product.id: 3})
+        repository.commit()
+    reserved = client.get("/api/v1/products", headers={"If-None-Match": second})
+    assert reserved.status_code == 200
+    assert reserved.json()[0]["stock"] == 7
+
+    app.dependency_overrides.clear()
+
+
+class _FailingProductRepository:
+    def __init__(self, error: Exception) -> None:
+        self._error = error
+
+    def save_many(self, products: list[Product]) -> None:
+        raise self._error
+
+
+def test_import_reports_rejected_batches_and_propagates_storage_failures() -> None:
+    reset_sqlite_schema(engine)
+    session = TestingSessionLocal()
+    repository = SQLProductRepository(session)
+    existing = repository.save(Product(name="Chlorella", price_cents=9900, stock=1))
+    with pytest.raises(ProductBatchRejectedError):
+        repository.save_many([Product(id=existing.id, name="Duplicada", price_cents=100, stock=1)])
+    session.close()
+
+    rows = [
+        ImportProductRow(line=line, command=CreateProductCommand(name="Maca", price_cents=100, stock=1))
+        for line in (1, 2)
+    ]
+    rejected = ImportProductsUseCase(
+        cast(ProductRepository, _FailingProductRepository(ProductBatchRejectedError("duplicate key")))
+    ).import_batch(rows)
+    assert (rejected.imported, [error.line for error in rejected.errors]) == (0, [1, 2])
+
+    broken = ImportProductsUseCase(
+        cast(ProductRepository, _FailingProductRepository(OperationalError("SELECT 1", {}, Exception())))
+    )
+    with pytest.raises(OperationalError):
+        broken.import_batch(rows)
+
+
+def test_product_reads_are_encoded_against_their_response_schemas() -> None:
+    reset_sqlite_schema(engine)
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+    payload = {
+        "name": "Ashwagandha",
+        "description": "Raiz en polvo",
+        "price_cents": 23900,
+        "currency": "MXN",
+        "stock": 5,
+        "is_active": True,
+    }
+    product_id = client.post("/api/v1/products", json=payload).json()["id"]
+    full_keys = set(payload) | {"id", "created_at"}
+
+    listed = client.get("/api/v1/products")
+    paged = client.get("/api/v1/products", params={"limit": 1, "view": "summary"})
+    detail = client.get(f"/api/v1/products/{product_id}")
+    found = client.get("/api/v1/products/search", params={"q": "ashwagandha"})
+
+    for response in (listed, paged, detail, found):
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+    assert [set(item) for item in listed.json()] == [full_keys]
+    assert set(paged.json()) == {"items", "next_cursor"}
+    assert [set(item) for item in paged.json()["items"]] == [full_keys - {"description"}]
+    assert set(detail.json()) == full_keys
+    assert detail.json()["id"] == product_id
+    assert [set(item) for item in found.json()["items"]] == [full_keys]
+    assert found.json()["items"][0] == detail.json()
+
+    app.dependency_overrides.clear()
+
+
+def test_fast_json_response_drops_fields_the_schema_does_not_declare() -> None:
+    product = Product(name="Zinc", price_cents=9900, stock=6)
+    leaky = SimpleNamespace(**{name: getattr(product, name) for name in product.__slots__}, cost_cents=1)
+
+    body = json.loads(
+        FastJSONResponse([leaky], schema=TypeAdapter(list[ProductResponse])).body
+    )
+
+    assert set(body[0]) == set(ProductResponse.model_fields)
+    assert body[0]["id"] == str(product.id)
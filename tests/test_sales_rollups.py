@@ -0,0 +1,209 @@
+from collections.abc import Generator
+from datetime import UTC, date, datetime, timedelta
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.contexts.store.orders.domain.order import Order, OrderStatus
+from app.contexts.store.orders.domain.order_item import OrderItem
+from app.contexts.store.orders.domain.state_machine import ORDER_STATE_MACHINE
+from app.contexts.store.orders.infrastructure.order_models import DailyOrderStatusRollupModel
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from app.contexts.store.orders.infrastructure.sql_sales_rollups import (
+    UnsupportedSalesRollupsDatabaseError,
+    ensure_sales_rollups_supported,
+    rollup_shard,
+)
+from app.main import app
+from app.shared.config.settings import Settings, get_settings
+from app.shared.infrastructure.db.session import get_db
+from tests.sqlite_schema import reset_sqlite_schema
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-admin-token"}
+OMEGA = UUID("00000000-0000-7000-8000-000000000001")
+MAGNESIO = UUID("00000000-0000-7000-8000-000000000002")
+DAY = datetime(2026, 10, 1, 15, 0, tzinfo=UTC)
+
+engine = create_engine(
+    "sqlite+pysqlite://",
+    future=True,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+
+
+def override_get_db() -> Generator[Session, None, None]:
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _admin_client() -> TestClient:
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_settings] = lambda: Settings(ADMIN_API_TOKEN="test-admin-token")
+    return TestClient(app)
+
+
+def _add_order(
+    created_at: datetime,
+    quantities: dict[UUID, int],
+    status: OrderStatus = "pending_payment",
+) -> UUID:
+    order = Order(
+        order_number=f"ORD-{uuid4().hex[:8]}",
+        customer_name="Ana Lopez",
+        customer_phone="5587654321",
+        status=status,
+        created_at=created_at,
+        items=[
+            OrderItem(
+                product_id=product_id,
+                quantity=quantity,
+                product_name_snapshot="Omega 3" if product_id == OMEGA else "Magnesio",
+                unit_price_cents_snapshot=1000 if product_id == OMEGA else 500,
+            )
+            for product_id, quantity in quantities.items()
+        ],
+    )
+    with TestingSessionLocal() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        repository.add_order(order)
+        repository.commit()
+    return order.id
+
+
+def _status_rollups() -> dict[tuple[date, str], tuple[int, int]]:
+    totals: dict[tuple[date, str], tuple[int, int]] = {}
+    with TestingSessionLocal() as session:
+        for row in session.execute(select(DailyOrderStatusRollupModel)).scalars():
+            order_count, total_cents = totals.get((row.day, row.status), (0, 0))
+            totals[(row.day, row.status)] = (order_count + row.order_count, total_cents + row.total_cents)
+    return totals
+
+
+def test_order_writes_keep_the_daily_rollups_in_step() -> None:
+    reset_sqlite_schema(engine)
+    first = _add_order(DAY, {OMEGA: 2, MAGNESIO: 1})
+    second = _add_order(DAY + timedelta(hours=1), {OMEGA: 1})
+    _add_order(DAY + timedelta(days=1), {MAGNESIO: 4}, status="paid")
+    stale = _add_order(DAY - timedelta(days=3), {OMEGA: 5})
+
+    assert _status_rollups() == {
+        (date(2026, 9, 28), "pending_payment"): (1, 5000),
+        (date(2026, 10, 1), "pending_payment"): (2, 3500),
+        (date(2026, 10, 2), "paid"): (1, 2000),
+    }
+
+    with TestingSessionLocal() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        moved = repository.transition_orders(
+            [
+                ORDER_STATE_MACHINE.transition(first, "pending_payment", "paid"),
+                ORDER_STATE_MACHINE.transition(second, "pending_payment", "cancelled"),
+            ]
+        )
+        # Stale compare-and-set: the order is already paid, so the rollups must not move.
+        assert not repository.transition_order(
+            ORDER_STATE_MACHINE.transition(first, "pending_payment", "cancelled")
+        )
+        expired = repository.expire_orders(DAY - timedelta(days=1), limit=10)
+        repository.commit()
+
+    assert moved == {first, second} and expired == [stale]
+    assert _status_rollups() == {
+        (date(2026, 9, 28), "pending_payment"): (0, 0),
+        (date(2026, 9, 28), "expired"): (1, 5000),
+        (date(2026, 10, 1), "pending_payment"): (0, 0),
+        (date(2026, 10, 1), "paid"): (1, 2500),
+        (date(2026, 10, 1), "cancelled"): (1, 1000),
+        (date(2026, 10, 2), "paid"): (1, 2000),
+    }
+
+
+def test_checkouts_of_one_day_spread_over_rollup_shards() -> None:
+    reset_sqlite_schema(engine)
+    order_ids = [_add_order(DAY, {OMEGA: 1}) for _ in range(32)]
+
+    with TestingSessionLocal() as session:
+        shards = set(session.execute(select(DailyOrderStatusRollupModel.shard)).scalars())
+    assert shards == {rollup_shard(order_id) for order_id in order_ids}
+    assert len(shards) > 1
+    assert _status_rollups() == {(date(2026, 10, 1), "pending_payment"): (32, 32000)}
+
+    with pytest.raises(UnsupportedSalesRollupsDatabaseError):
+        ensure_sales_rollups_supported("mysql")
+
+
+def test_sales_report_reads_only_the_rollups() -> None:
+    reset_sqlite_schema(engine)
+    paid = _add_order(DAY, {OMEGA: 2, MAGNESIO: 1})
+    _add_order(DAY, {OMEGA: 3})
+    _add_order(DAY + timedelta(days=1), {MAGNESIO: 4}, status="picked_up")
+    _add_order(DAY + timedelta(days=40), {OMEGA: 9}, status="paid")
+    with TestingSessionLocal() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        repository.transition_order(ORDER_STATE_MACHINE.transition(paid, "pending_payment", "paid"))
+        repository.commit()
+
+    client = _admin_client()
+    statements: list[str] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.get(
+            "/api/v1/orders/reports/sales",
+            params={"from": "2026-10-01", "to": "2026-10-31"},
+            headers=ADMIN_HEADERS,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["from"], body["to"]) == ("2026-10-01", "2026-10-31")
+    assert body["statuses"] == ["paid", "ready_for_pickup", "picked_up"]
+    assert body["daily"] == [
+        {"day": "2026-10-01", "status": "paid", "order_count": 1, "total_cents": 2500},
+        {"day": "2026-10-01", "status": "pending_payment", "order_count": 1, "total_cents": 3000},
+        {"day": "2026-10-02", "status": "picked_up", "order_count": 1, "total_cents": 2000},
+    ]
+    assert body["products"] == [
+        {"product_id": str(MAGNESIO), "product_name": "Magnesio", "units": 5, "revenue_cents": 2500},
+        {"product_id": str(OMEGA), "product_name": "Omega 3", "units": 2, "revenue_cents": 2000},
+    ]
+    assert statements and all("sales_daily_" in statement for statement in statements)
+
+    pending = client.get(
+        "/api/v1/orders/reports/sales",
+        params={"from": "2026-10-01", "to": "2026-10-01", "status": "pending_payment"},
+        headers=ADMIN_HEADERS,
+    ).json()
+    assert pending["products"] == [
+        {"product_id": str(OMEGA), "product_name": "Omega 3", "units": 3, "revenue_cents": 3000},
+    ]
+
+    inverted = client.get(
+        "/api/v1/orders/reports/sales",
+        params={"from": "2026-10-02", "to": "2026-10-01"},
+        headers=ADMIN_HEADERS,
+    )
+    assert inverted.status_code == 422
+    assert client.get(
+        "/api/v1/orders/reports/sales",
+        params={"from": "2026-10-01", "to": "2026-10-31"},
+    ).status_code == 401
+
+    app.dependency_overrides.clear()
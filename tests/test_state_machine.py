@@ -0,0 +1,162 @@
+from collections.abc import Iterator
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.contexts.store.orders.domain.order import Order
+from app.contexts.store.orders.domain.order_item import OrderItem
+from app.contexts.store.orders.domain.payment import Payment, PaymentStatus
+from app.contexts.store.orders.domain.state_machine import (
+    ORDER_STATE_MACHINE,
+    PAYMENT_STATE_MACHINE,
+    InvalidStatusTransitionError,
+)
+from app.contexts.store.orders.infrastructure.order_models import OrderModel, PaymentModel
+from app.contexts.store.orders.infrastructure.sql_order_repository import SQLOrderRepository
+from tests.sqlite_schema import reset_sqlite_schema
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    engine = create_engine(
+        "sqlite+pysqlite://",
+        future=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    reset_sqlite_schema(engine)
+    yield engine
+    engine.dispose()
+
+
+def _seed_payments(
+    session_factory: sessionmaker[Session],
+    count: int,
+    status: PaymentStatus = "pending",
+) -> list[Payment]:
+    payments: list[Payment] = []
+    with session_factory() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        for index in range(count):
+            order = Order(
+                order_number=f"ORD-{index}",
+                customer_name="Ana Lopez",
+                customer_phone="5587654321",
+                items=[
+                    OrderItem(
+                        product_id=uuid4(),
+                        quantity=1,
+                        product_name_snapshot="Omega 3",
+                        unit_price_cents_snapshot=25900,
+                    )
+                ],
+            )
+            payment = Payment(order_id=order.id, amount_cents=25900, status=status)
+            repository.add_order(order)
+            repository.add_payment(payment)
+            payments.append(payment)
+        repository.commit()
+    return payments
+
+
+def _payment_statuses(session_factory: sessionmaker[Session]) -> dict[UUID, str]:
+    with session_factory() as session:
+        rows = session.execute(select(PaymentModel.id, PaymentModel.status)).all()
+    return {payment_id: status for payment_id, status in rows}
+
+
+def _capture_statements(engine: Engine) -> list[str]:
+    statements: list[str] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    return statements
+
+
+def test_transition_tables_follow_the_business_rules() -> None:
+    assert ORDER_STATE_MACHINE.can_transition("pending_payment", "expired")
+    assert ORDER_STATE_MACHINE.can_transition("paid", "ready_for_pickup")
+    assert ORDER_STATE_MACHINE.can_transition("ready_for_pickup", "picked_up")
+    assert not ORDER_STATE_MACHINE.can_transition("paid", "picked_up")
+    assert not ORDER_STATE_MACHINE.can_transition("expired", "paid")
+    assert PAYMENT_STATE_MACHINE.can_transition("created", "approved")
+    assert not PAYMENT_STATE_MACHINE.can_transition("rejected", "approved")
+
+    order_id = uuid4()
+    transition = ORDER_STATE_MACHINE.transition(order_id, "pending_payment", "paid")
+    assert (transition.id, transition.expected, transition.target) == (order_id, "pending_payment", "paid")
+    with pytest.raises(InvalidStatusTransitionError):
+        PAYMENT_STATE_MACHINE.transition(uuid4(), "approved", "pending")
+
+
+def test_transitions_are_persisted_as_compare_and_set(engine: Engine) -> None:
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    first, second, third, fourth = _seed_payments(session_factory, 4)
+    with session_factory() as session:
+        # Another writer already settled the third payment.
+        session.get_one(PaymentModel, third.id).status = "rejected"
+        session.commit()
+
+    statements = _capture_statements(engine)
+    with session_factory() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        moved = repository.transition_payments(
+            [
+                PAYMENT_STATE_MACHINE.transition(payment.id, "pending", "approved")
+                for payment in (first, second, third)
+            ]
+            + [PAYMENT_STATE_MACHINE.transition(fourth.id, "pending", "cancelled")]
+        )
+        stale = repository.transition_payment(
+            PAYMENT_STATE_MACHINE.transition(first.id, "pending", "rejected")
+        )
+        paid = repository.transition_order(
+            ORDER_STATE_MACHINE.transition(first.order_id, "pending_payment", "paid")
+        )
+        repository.commit()
+
+    assert moved == {first.id, second.id, fourth.id}
+    assert stale is False and paid is True
+    updates = [statement for statement in statements if statement.startswith("UPDATE")]
+    # One statement per kind of move; the only read is the moved order's lines for the rollups.
+    selects = [statement for statement in statements if statement.startswith("SELECT")]
+    assert len(updates) == 4
+    assert len(selects) == 1 and "FROM order_items" in selects[0]
+    assert _payment_statuses(session_factory) == {
+        first.id: "approved",
+        second.id: "approved",
+        third.id: "rejected",
+        fourth.id: "cancelled",
+    }
+    with session_factory() as session:
+        assert session.get_one(OrderModel, first.order_id).status == "paid"
+
+
+def test_attach_payment_preference_writes_only_once_while_the_payment_is_created(engine: Engine) -> None:
+    session_factory = sessionmaker(bind=engine, class_=Session, autoflush=False, autocommit=False)
+    (payment,) = _seed_payments(session_factory, 1, status="created")
+    payment.attach_preference("pref-1", "https://mp.test/init-point")
+    statements = _capture_statements(engine)
+    with session_factory() as session:
+        repository = SQLOrderRepository(session)
+        repository.begin()
+        applied = repository.attach_payment_preference(payment)
+        replayed = repository.attach_payment_preference(payment)
+        repository.commit()
+
+    assert applied is True and replayed is False
+    assert [statement.split()[0] for statement in statements] == ["UPDATE", "UPDATE"]
+    with session_factory() as session:
+        stored = session.get_one(PaymentModel, payment.id)
+    assert (stored.status, stored.init_point) == ("created", "https://mp.test/init-point")
+
+    with pytest.raises(InvalidStatusTransitionError):
+        payment.attach_preference("pref-2", "https://mp.test/other")